@@ -0,0 +1,150 @@
+"""add exercise catalog
+
+Records reference exercises by integer ID instead of repeating the name string.
+Existing names are deduplicated per user into the new exercise table, and the
+daily rollup is rebuilt keyed by exercise_id. The name stays on workoutrecord as
+a denormalized display column, but is no longer indexed.
+
+Revision ID: 3cdebfc69388
+Revises: 3dee03bc2a54
+Create Date: 2026-10-16 23:19:41.935467
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3cdebfc69388'
+down_revision: Union[str, None] = '3dee03bc2a54'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# SQLite の batch モードはテーブルを作り直すため、全文検索 (FTS5) のトリガーも作り直す
+SQLITE_FTS_TRIGGERS = {
+    'workoutrecord_fts_ai': (
+        'AFTER INSERT ON workoutrecord BEGIN '
+        'INSERT INTO workoutrecord_fts(rowid, exercise, notes) VALUES (new.id, new.exercise, new.notes); END'
+    ),
+    'workoutrecord_fts_ad': (
+        'AFTER DELETE ON workoutrecord BEGIN '
+        "INSERT INTO workoutrecord_fts(workoutrecord_fts, rowid, exercise, notes) "
+        "VALUES ('delete', old.id, old.exercise, old.notes); END"
+    ),
+    'workoutrecord_fts_au': (
+        'AFTER UPDATE OF exercise, notes ON workoutrecord BEGIN '
+        "INSERT INTO workoutrecord_fts(workoutrecord_fts, rowid, exercise, notes) "
+        "VALUES ('delete', old.id, old.exercise, old.notes); "
+        'INSERT INTO workoutrecord_fts(rowid, exercise, notes) VALUES (new.id, new.exercise, new.notes); END'
+    ),
+}
+
+EST_1RM = 'MAX(CASE WHEN reps = 1 THEN weight WHEN reps > 1 THEN weight * (1 + reps / 30.0) END)'
+
+
+def _recreate_sqlite_fts_triggers() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for name, definition in SQLITE_FTS_TRIGGERS.items():
+        op.execute(f'DROP TRIGGER IF EXISTS {name}')
+        op.execute(f'CREATE TRIGGER {name} {definition}')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'exercise',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'name', name='uq_exercise_user_id_name'),
+    )
+    op.create_index(
+        'uq_exercise_global_name',
+        'exercise',
+        ['name'],
+        unique=True,
+        postgresql_where=sa.text('user_id IS NULL'),
+        sqlite_where=sa.text('user_id IS NULL'),
+    )
+
+    # 既存の種目名をユーザーごとに重複を除いて登録し、記録から ID で参照する
+    op.add_column('workoutrecord', sa.Column('exercise_id', sa.Integer(), nullable=True))
+    op.execute('INSERT INTO exercise (user_id, name) SELECT DISTINCT user_id, exercise FROM workoutrecord')
+    op.execute(
+        """
+        UPDATE workoutrecord SET exercise_id = (
+            SELECT exercise.id FROM exercise
+            WHERE exercise.user_id = workoutrecord.user_id AND exercise.name = workoutrecord.exercise
+        )
+        """
+    )
+    with op.batch_alter_table('workoutrecord') as batch_op:
+        batch_op.alter_column('exercise_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key('fk_workoutrecord_exercise_id_exercise', 'exercise', ['exercise_id'], ['id'])
+        batch_op.drop_index('ix_workoutrecord_exercise')
+        batch_op.create_index(
+            'ix_workoutrecord_user_id_exercise_id_exercise_date', ['user_id', 'exercise_id', 'exercise_date']
+        )
+    _recreate_sqlite_fts_triggers()
+
+    # 集計テーブルのキーを種目名から種目ID に変更して作り直す
+    op.drop_table('workout_daily_rollup')
+    op.create_table(
+        'workout_daily_rollup',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('exercise_id', sa.Integer(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('volume', sa.Float(), nullable=False),
+        sa.Column('max_weight', sa.Float(), nullable=False),
+        sa.Column('est_1rm', sa.Float(), nullable=True),
+        sa.Column('sets', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['exercise_id'], ['exercise.id']),
+        sa.PrimaryKeyConstraint('user_id', 'exercise_id', 'date'),
+    )
+    op.execute(
+        f"""
+        INSERT INTO workout_daily_rollup (user_id, exercise_id, date, volume, max_weight, est_1rm, sets)
+        SELECT user_id, exercise_id, exercise_date, SUM(weight * reps * set_reps), MAX(weight), {EST_1RM}, SUM(set_reps)
+        FROM workoutrecord
+        GROUP BY user_id, exercise_id, exercise_date
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('workout_daily_rollup')
+    op.create_table(
+        'workout_daily_rollup',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('exercise', sa.String(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('volume', sa.Float(), nullable=False),
+        sa.Column('max_weight', sa.Float(), nullable=False),
+        sa.Column('est_1rm', sa.Float(), nullable=True),
+        sa.Column('sets', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('user_id', 'exercise', 'date'),
+    )
+    op.execute(
+        f"""
+        INSERT INTO workout_daily_rollup (user_id, exercise, date, volume, max_weight, est_1rm, sets)
+        SELECT user_id, exercise, exercise_date, SUM(weight * reps * set_reps), MAX(weight), {EST_1RM}, SUM(set_reps)
+        FROM workoutrecord
+        GROUP BY user_id, exercise, exercise_date
+        """
+    )
+
+    with op.batch_alter_table('workoutrecord') as batch_op:
+        batch_op.drop_index('ix_workoutrecord_user_id_exercise_id_exercise_date')
+        batch_op.create_index('ix_workoutrecord_exercise', ['exercise'])
+        batch_op.drop_constraint('fk_workoutrecord_exercise_id_exercise', type_='foreignkey')
+        batch_op.drop_column('exercise_id')
+    _recreate_sqlite_fts_triggers()
+
+    op.drop_index('uq_exercise_global_name', table_name='exercise')
+    op.drop_table('exercise')
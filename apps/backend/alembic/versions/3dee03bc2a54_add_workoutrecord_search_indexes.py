@@ -0,0 +1,83 @@
+"""add workoutrecord search indexes
+
+Full-text search over exercise names and notes for GET /api/v1/records/search.
+PostgreSQL: tsvector GIN index plus a pg_trgm GIN index on the same document.
+SQLite: FTS5 external-content table kept in sync by triggers.
+
+Revision ID: 3dee03bc2a54
+Revises: e125bd2e9a59
+Create Date: 2026-10-16 23:13:18.909900
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3dee03bc2a54'
+down_revision: Union[str, None] = 'e125bd2e9a59'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+DOCUMENT = "(coalesce(exercise, '') || ' ' || coalesce(notes, ''))"
+
+SQLITE_TRIGGERS = {
+    'workoutrecord_fts_ai': (
+        'AFTER INSERT ON workoutrecord BEGIN '
+        'INSERT INTO workoutrecord_fts(rowid, exercise, notes) VALUES (new.id, new.exercise, new.notes); END'
+    ),
+    'workoutrecord_fts_ad': (
+        'AFTER DELETE ON workoutrecord BEGIN '
+        "INSERT INTO workoutrecord_fts(workoutrecord_fts, rowid, exercise, notes) "
+        "VALUES ('delete', old.id, old.exercise, old.notes); END"
+    ),
+    'workoutrecord_fts_au': (
+        'AFTER UPDATE OF exercise, notes ON workoutrecord BEGIN '
+        "INSERT INTO workoutrecord_fts(workoutrecord_fts, rowid, exercise, notes) "
+        "VALUES ('delete', old.id, old.exercise, old.notes); "
+        'INSERT INTO workoutrecord_fts(rowid, exercise, notes) VALUES (new.id, new.exercise, new.notes); END'
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect_name = op.get_bind().dialect.name
+    if dialect_name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.create_index(
+            'ix_workoutrecord_search_tsv',
+            'workoutrecord',
+            [sa.text(f"to_tsvector('simple', {DOCUMENT})")],
+            postgresql_using='gin',
+        )
+        op.create_index(
+            'ix_workoutrecord_search_trgm',
+            'workoutrecord',
+            [sa.text(f'{DOCUMENT} gin_trgm_ops')],
+            postgresql_using='gin',
+        )
+    elif dialect_name == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE workoutrecord_fts USING fts5(exercise, notes, content='workoutrecord', "
+            "content_rowid='id', tokenize='unicode61', prefix='2 3')"
+        )
+        for name, definition in SQLITE_TRIGGERS.items():
+            op.execute(f'CREATE TRIGGER {name} {definition}')
+        # 既存の記録から索引を作成する
+        op.execute("INSERT INTO workoutrecord_fts(workoutrecord_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect_name = op.get_bind().dialect.name
+    if dialect_name == 'postgresql':
+        op.drop_index('ix_workoutrecord_search_trgm', table_name='workoutrecord')
+        op.drop_index('ix_workoutrecord_search_tsv', table_name='workoutrecord')
+    elif dialect_name == 'sqlite':
+        for name in SQLITE_TRIGGERS:
+            op.execute(f'DROP TRIGGER IF EXISTS {name}')
+        op.execute('DROP TABLE IF EXISTS workoutrecord_fts')
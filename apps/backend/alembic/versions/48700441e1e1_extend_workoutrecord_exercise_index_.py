@@ -0,0 +1,42 @@
+"""extend workoutrecord exercise index with id
+
+Append id to the (user_id, exercise_id, exercise_date) index so that record lists
+filtered by exercise and date range can be read in (exercise_date, id) order
+straight from the index.
+
+Revision ID: 48700441e1e1
+Revises: cd35d845be83
+Create Date: 2026-10-16 23:29:12.794149
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '48700441e1e1'
+down_revision: Union[str, None] = 'cd35d845be83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_workoutrecord_user_id_exercise_id_exercise_date_id',
+        'workoutrecord',
+        ['user_id', 'exercise_id', 'exercise_date', 'id'],
+    )
+    op.drop_index('ix_workoutrecord_user_id_exercise_id_exercise_date', table_name='workoutrecord')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        'ix_workoutrecord_user_id_exercise_id_exercise_date',
+        'workoutrecord',
+        ['user_id', 'exercise_id', 'exercise_date'],
+    )
+    op.drop_index('ix_workoutrecord_user_id_exercise_id_exercise_date_id', table_name='workoutrecord')
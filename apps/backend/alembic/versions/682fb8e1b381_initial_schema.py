@@ -0,0 +1,60 @@
+"""initial schema
+
+Baseline of the tables that were previously created via SQLModel.metadata.create_all.
+
+Revision ID: 682fb8e1b381
+Revises: 
+Create Date: 2026-10-16 22:24:37.961134
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '682fb8e1b381'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'user',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('username', sa.String(), nullable=True),
+        sa.Column('hashed_password', sa.String(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('is_superuser', sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_user_email'), 'user', ['email'], unique=True)
+    op.create_index(op.f('ix_user_username'), 'user', ['username'], unique=True)
+    op.create_table(
+        'workoutrecord',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('exercise_date', sa.Date(), nullable=False),
+        sa.Column('exercise', sa.String(), nullable=False),
+        sa.Column('weight', sa.Float(), nullable=False),
+        sa.Column('reps', sa.Integer(), nullable=False),
+        sa.Column('set_reps', sa.Integer(), nullable=False),
+        sa.Column('notes', sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_workoutrecord_exercise'), 'workoutrecord', ['exercise'], unique=False)
+    op.create_index(op.f('ix_workoutrecord_user_id'), 'workoutrecord', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_workoutrecord_user_id'), table_name='workoutrecord')
+    op.drop_index(op.f('ix_workoutrecord_exercise'), table_name='workoutrecord')
+    op.drop_table('workoutrecord')
+    op.drop_index(op.f('ix_user_username'), table_name='user')
+    op.drop_index(op.f('ix_user_email'), table_name='user')
+    op.drop_table('user')
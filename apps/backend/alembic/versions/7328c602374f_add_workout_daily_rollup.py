@@ -0,0 +1,56 @@
+"""add workout daily rollup
+
+Per-user, per-exercise, per-day aggregates maintained incrementally by record_service.
+
+Revision ID: 7328c602374f
+Revises: 95650c067a0c
+Create Date: 2026-10-16 22:39:50.269462
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7328c602374f'
+down_revision: Union[str, None] = '95650c067a0c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'workout_daily_rollup',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('exercise', sa.String(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('volume', sa.Float(), nullable=False),
+        sa.Column('max_weight', sa.Float(), nullable=False),
+        sa.Column('est_1rm', sa.Float(), nullable=True),
+        sa.Column('sets', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('user_id', 'exercise', 'date'),
+    )
+    # 既存の記録から集計行をバックフィルする (src.scripts.rebuild_rollup と同じ集計)
+    op.execute(
+        """
+        INSERT INTO workout_daily_rollup (user_id, exercise, date, volume, max_weight, est_1rm, sets)
+        SELECT
+            user_id,
+            exercise,
+            exercise_date,
+            SUM(weight * reps * set_reps),
+            MAX(weight),
+            MAX(CASE WHEN reps = 1 THEN weight WHEN reps > 1 THEN weight * (1 + reps / 30.0) END),
+            SUM(set_reps)
+        FROM workoutrecord
+        GROUP BY user_id, exercise, exercise_date
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('workout_daily_rollup')
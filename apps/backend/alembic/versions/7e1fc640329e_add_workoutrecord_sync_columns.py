@@ -0,0 +1,79 @@
+"""add workoutrecord sync columns
+
+Add updated_at and the soft-delete column deleted_at to workoutrecord for the
+delta sync endpoint, with a (user_id, updated_at, id) index. Existing records
+get the migration time as updated_at. Downgrading purges soft-deleted records.
+
+Revision ID: 7e1fc640329e
+Revises: dec5ea97d368
+Create Date: 2026-10-16 23:39:34.141414
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e1fc640329e'
+down_revision: Union[str, None] = 'dec5ea97d368'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# SQLite の batch モードはテーブルを作り直すため、全文検索 (FTS5) のトリガーも作り直す
+SQLITE_FTS_TRIGGERS = {
+    'workoutrecord_fts_ai': (
+        'AFTER INSERT ON workoutrecord BEGIN '
+        'INSERT INTO workoutrecord_fts(rowid, exercise, notes) VALUES (new.id, new.exercise, new.notes); END'
+    ),
+    'workoutrecord_fts_ad': (
+        'AFTER DELETE ON workoutrecord BEGIN '
+        "INSERT INTO workoutrecord_fts(workoutrecord_fts, rowid, exercise, notes) "
+        "VALUES ('delete', old.id, old.exercise, old.notes); END"
+    ),
+    'workoutrecord_fts_au': (
+        'AFTER UPDATE OF exercise, notes ON workoutrecord BEGIN '
+        "INSERT INTO workoutrecord_fts(workoutrecord_fts, rowid, exercise, notes) "
+        "VALUES ('delete', old.id, old.exercise, old.notes); "
+        'INSERT INTO workoutrecord_fts(rowid, exercise, notes) VALUES (new.id, new.exercise, new.notes); END'
+    ),
+}
+
+# アプリケーションが保存するのと同じ形式 (UTC、タイムゾーンなし) の現在日時
+CURRENT_UTC_TIMESTAMP = {
+    'postgresql': "(now() AT TIME ZONE 'utc')",
+    # SQLAlchemy は SQLite の日時をマイクロ秒付きの文字列で保存し、文字列として比較される
+    'sqlite': "(strftime('%Y-%m-%d %H:%M:%S', 'now') || '.000000')",
+}
+
+
+def _recreate_sqlite_fts_triggers() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for name, definition in SQLITE_FTS_TRIGGERS.items():
+        op.execute(f'DROP TRIGGER IF EXISTS {name}')
+        op.execute(f'CREATE TRIGGER {name} {definition}')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('workoutrecord', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.add_column('workoutrecord', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.execute(f'UPDATE workoutrecord SET updated_at = {CURRENT_UTC_TIMESTAMP[op.get_bind().dialect.name]}')
+    with op.batch_alter_table('workoutrecord') as batch_op:
+        batch_op.alter_column('updated_at', existing_type=sa.DateTime(), nullable=False)
+        batch_op.create_index('ix_workoutrecord_user_id_updated_at_id', ['user_id', 'updated_at', 'id'])
+    _recreate_sqlite_fts_triggers()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # 論理削除を表せなくなるため、削除済みの記録は物理削除する
+    op.execute('DELETE FROM workoutrecord WHERE deleted_at IS NOT NULL')
+    with op.batch_alter_table('workoutrecord') as batch_op:
+        batch_op.drop_index('ix_workoutrecord_user_id_updated_at_id')
+        batch_op.drop_column('deleted_at')
+        batch_op.drop_column('updated_at')
+    _recreate_sqlite_fts_triggers()
@@ -0,0 +1,35 @@
+"""add workoutrecord keyset index
+
+Supports keyset pagination of GET /api/v1/records ordered by (exercise_date, id).
+
+Revision ID: 95650c067a0c
+Revises: 682fb8e1b381
+Create Date: 2026-10-16 22:24:39.105553
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '95650c067a0c'
+down_revision: Union[str, None] = '682fb8e1b381'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_workoutrecord_user_id_exercise_date_id',
+        'workoutrecord',
+        ['user_id', 'exercise_date', 'id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_workoutrecord_user_id_exercise_date_id', table_name='workoutrecord')
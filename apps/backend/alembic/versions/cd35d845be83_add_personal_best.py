@@ -0,0 +1,78 @@
+"""add personal best
+
+Per-user, per-exercise personal bests maintained incrementally by record_service,
+backfilled here from existing records and the daily rollup.
+
+Revision ID: cd35d845be83
+Revises: 3cdebfc69388
+Create Date: 2026-10-16 23:25:06.572597
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cd35d845be83'
+down_revision: Union[str, None] = '3cdebfc69388'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+EST_1RM = 'CASE WHEN reps = 1 THEN weight WHEN reps > 1 THEN weight * (1 + reps / 30.0) END'
+
+# 種類ごとに、(値の降順, 日付, ID) で最初の行を自己ベストとしてバックフィルする
+BACKFILL = {
+    'max_weight': """
+        SELECT user_id, exercise_id, 0.0 AS weight, weight AS value, id AS record_id, exercise_date AS achieved_on,
+            ROW_NUMBER() OVER (PARTITION BY user_id, exercise_id ORDER BY weight DESC, exercise_date, id) AS best_rank
+        FROM workoutrecord
+    """,
+    'est_1rm': f"""
+        SELECT user_id, exercise_id, 0.0 AS weight, {EST_1RM} AS value, id AS record_id, exercise_date AS achieved_on,
+            ROW_NUMBER() OVER (PARTITION BY user_id, exercise_id ORDER BY {EST_1RM} DESC, exercise_date, id) AS best_rank
+        FROM workoutrecord WHERE reps > 0
+    """,
+    'reps_at_weight': """
+        SELECT user_id, exercise_id, weight, reps AS value, id AS record_id, exercise_date AS achieved_on,
+            ROW_NUMBER() OVER (PARTITION BY user_id, exercise_id, weight ORDER BY reps DESC, exercise_date, id) AS best_rank
+        FROM workoutrecord WHERE reps > 0
+    """,
+    'session_volume': """
+        SELECT user_id, exercise_id, 0.0 AS weight, volume AS value, NULL AS record_id, date AS achieved_on,
+            ROW_NUMBER() OVER (PARTITION BY user_id, exercise_id ORDER BY volume DESC, date) AS best_rank
+        FROM workout_daily_rollup
+    """,
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'personal_best',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('exercise_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('weight', sa.Float(), nullable=False),
+        sa.Column('value', sa.Float(), nullable=False),
+        sa.Column('record_id', sa.Integer(), nullable=True),
+        sa.Column('achieved_on', sa.Date(), nullable=False),
+        sa.ForeignKeyConstraint(['exercise_id'], ['exercise.id']),
+        sa.PrimaryKeyConstraint('user_id', 'exercise_id', 'kind', 'weight'),
+    )
+    for kind, ranked in BACKFILL.items():
+        op.execute(
+            f"""
+            INSERT INTO personal_best (user_id, exercise_id, kind, weight, value, record_id, achieved_on)
+            SELECT user_id, exercise_id, '{kind}', weight, value, record_id, achieved_on
+            FROM ({ranked}) AS ranked
+            WHERE best_rank = 1
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('personal_best')
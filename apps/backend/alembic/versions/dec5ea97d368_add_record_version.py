@@ -0,0 +1,37 @@
+"""add record version
+
+Per-user change counter for workout records, used for ETag / If-None-Match on
+record reads. Users without a row are treated as version 0, so no backfill is needed.
+
+Revision ID: dec5ea97d368
+Revises: 48700441e1e1
+Create Date: 2026-10-16 23:32:44.087340
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'dec5ea97d368'
+down_revision: Union[str, None] = '48700441e1e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'record_version',
+        sa.Column('user_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('record_version')
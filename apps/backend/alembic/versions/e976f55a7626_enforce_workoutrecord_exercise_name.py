@@ -0,0 +1,103 @@
+"""enforce workoutrecord exercise name
+
+workoutrecord.exercise is a denormalized copy of exercise.name kept for the
+full-text search indexes. Records whose copy drifted from the catalog are
+repaired first. Then a composite foreign key (exercise_id, exercise) ->
+exercise(id, name) with ON UPDATE CASCADE keeps the copy in sync, backed by a
+unique index on exercise(id, name). SQLite does not enforce foreign keys, so
+triggers perform the same check and cascade there.
+
+Revision ID: e976f55a7626
+Revises: 7e1fc640329e
+Create Date: 2026-10-17 00:22:44.835406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e976f55a7626'
+down_revision: Union[str, None] = '7e1fc640329e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# SQLite の batch モードはテーブルを作り直すため、全文検索 (FTS5) のトリガーも作り直す
+SQLITE_FTS_TRIGGERS = {
+    'workoutrecord_fts_ai': (
+        'AFTER INSERT ON workoutrecord BEGIN '
+        'INSERT INTO workoutrecord_fts(rowid, exercise, notes) VALUES (new.id, new.exercise, new.notes); END'
+    ),
+    'workoutrecord_fts_ad': (
+        'AFTER DELETE ON workoutrecord BEGIN '
+        "INSERT INTO workoutrecord_fts(workoutrecord_fts, rowid, exercise, notes) "
+        "VALUES ('delete', old.id, old.exercise, old.notes); END"
+    ),
+    'workoutrecord_fts_au': (
+        'AFTER UPDATE OF exercise, notes ON workoutrecord BEGIN '
+        "INSERT INTO workoutrecord_fts(workoutrecord_fts, rowid, exercise, notes) "
+        "VALUES ('delete', old.id, old.exercise, old.notes); "
+        'INSERT INTO workoutrecord_fts(rowid, exercise, notes) VALUES (new.id, new.exercise, new.notes); END'
+    ),
+}
+
+# SQLite は外部キーを検査しないため、複合外部キーと同じ検査と ON UPDATE CASCADE をトリガーで行う
+SQLITE_EXERCISE_NAME_TRIGGERS = {
+    'workoutrecord_exercise_name_bi': (
+        'BEFORE INSERT ON workoutrecord '
+        'WHEN new.exercise IS NOT (SELECT name FROM exercise WHERE id = new.exercise_id) BEGIN '
+        "SELECT RAISE(ABORT, 'workoutrecord.exercise does not match the name of exercise_id'); END"
+    ),
+    'workoutrecord_exercise_name_bu': (
+        'BEFORE UPDATE OF exercise, exercise_id ON workoutrecord '
+        'WHEN new.exercise IS NOT (SELECT name FROM exercise WHERE id = new.exercise_id) BEGIN '
+        "SELECT RAISE(ABORT, 'workoutrecord.exercise does not match the name of exercise_id'); END"
+    ),
+    'exercise_name_au': (
+        'AFTER UPDATE OF name ON exercise BEGIN '
+        'UPDATE workoutrecord SET exercise = new.name WHERE exercise_id = new.id; END'
+    ),
+}
+
+
+def _recreate_sqlite_triggers(triggers: dict[str, str]) -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for name, definition in triggers.items():
+        op.execute(f'DROP TRIGGER IF EXISTS {name}')
+        op.execute(f'CREATE TRIGGER {name} {definition}')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # カタログと食い違っている種目名のコピーを、種目ID の種目名に合わせる
+    op.execute(
+        'UPDATE workoutrecord SET exercise = '
+        '(SELECT name FROM exercise WHERE exercise.id = workoutrecord.exercise_id) '
+        'WHERE EXISTS (SELECT 1 FROM exercise WHERE exercise.id = workoutrecord.exercise_id '
+        'AND exercise.name <> workoutrecord.exercise)'
+    )
+    op.create_index('uq_exercise_id_name', 'exercise', ['id', 'name'], unique=True)
+    with op.batch_alter_table('workoutrecord') as batch_op:
+        batch_op.create_foreign_key(
+            'fk_workoutrecord_exercise_id_name',
+            'exercise',
+            ['exercise_id', 'exercise'],
+            ['id', 'name'],
+            onupdate='CASCADE',
+        )
+    _recreate_sqlite_triggers({**SQLITE_FTS_TRIGGERS, **SQLITE_EXERCISE_NAME_TRIGGERS})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'sqlite':
+        for name in SQLITE_EXERCISE_NAME_TRIGGERS:
+            op.execute(f'DROP TRIGGER IF EXISTS {name}')
+    with op.batch_alter_table('workoutrecord') as batch_op:
+        batch_op.drop_constraint('fk_workoutrecord_exercise_id_name', type_='foreignkey')
+    op.drop_index('uq_exercise_id_name', table_name='exercise')
+    _recreate_sqlite_triggers(SQLITE_FTS_TRIGGERS)
@@ -0,0 +1,193 @@
+"""drop workoutrecord exercise name copy
+
+Drop the denormalized workoutrecord.exercise column together with the
+composite foreign key (exercise_id, exercise) -> exercise(id, name), the
+unique index on exercise(id, name) and the SQLite triggers that kept the copy
+in sync. Exercise names are read through a join with exercise instead.
+
+Full-text search moves to the joined document:
+PostgreSQL: separate tsvector / pg_trgm GIN indexes on workoutrecord.notes and
+exercise.name narrow the candidates before the joined document is matched.
+SQLite: the FTS5 table now uses a view joining workoutrecord and exercise as
+its external content, kept in sync by triggers on both tables.
+
+Revision ID: f870872ddf2d
+Revises: e976f55a7626
+Create Date: 2026-10-17 01:01:06.734983
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f870872ddf2d'
+down_revision: Union[str, None] = 'e976f55a7626'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+OLD_DOCUMENT = "(coalesce(exercise, '') || ' ' || coalesce(notes, ''))"
+NOTES = "coalesce(notes, '')"
+
+FTS_OPTIONS = "content_rowid='id', tokenize='unicode61', prefix='2 3'"
+
+# 種目名のコピーを参照する全文検索 (FTS5) のトリガーと、コピーをカタログと一致させるトリガー (削除前の状態)
+OLD_SQLITE_TRIGGERS = {
+    'workoutrecord_fts_ai': (
+        'AFTER INSERT ON workoutrecord BEGIN '
+        'INSERT INTO workoutrecord_fts(rowid, exercise, notes) VALUES (new.id, new.exercise, new.notes); END'
+    ),
+    'workoutrecord_fts_ad': (
+        'AFTER DELETE ON workoutrecord BEGIN '
+        "INSERT INTO workoutrecord_fts(workoutrecord_fts, rowid, exercise, notes) "
+        "VALUES ('delete', old.id, old.exercise, old.notes); END"
+    ),
+    'workoutrecord_fts_au': (
+        'AFTER UPDATE OF exercise, notes ON workoutrecord BEGIN '
+        "INSERT INTO workoutrecord_fts(workoutrecord_fts, rowid, exercise, notes) "
+        "VALUES ('delete', old.id, old.exercise, old.notes); "
+        'INSERT INTO workoutrecord_fts(rowid, exercise, notes) VALUES (new.id, new.exercise, new.notes); END'
+    ),
+    'workoutrecord_exercise_name_bi': (
+        'BEFORE INSERT ON workoutrecord '
+        'WHEN new.exercise IS NOT (SELECT name FROM exercise WHERE id = new.exercise_id) BEGIN '
+        "SELECT RAISE(ABORT, 'workoutrecord.exercise does not match the name of exercise_id'); END"
+    ),
+    'workoutrecord_exercise_name_bu': (
+        'BEFORE UPDATE OF exercise, exercise_id ON workoutrecord '
+        'WHEN new.exercise IS NOT (SELECT name FROM exercise WHERE id = new.exercise_id) BEGIN '
+        "SELECT RAISE(ABORT, 'workoutrecord.exercise does not match the name of exercise_id'); END"
+    ),
+    'exercise_name_au': (
+        'AFTER UPDATE OF name ON exercise BEGIN '
+        'UPDATE workoutrecord SET exercise = new.name WHERE exercise_id = new.id; END'
+    ),
+}
+
+# 記録と種目名を結合したビューを外部コンテンツとする全文検索 (FTS5) のトリガー
+NEW_SQLITE_TRIGGERS = {
+    'workoutrecord_fts_ai': (
+        'AFTER INSERT ON workoutrecord BEGIN '
+        'INSERT INTO workoutrecord_fts(rowid, exercise, notes) '
+        'SELECT new.id, name, new.notes FROM exercise WHERE id = new.exercise_id; END'
+    ),
+    'workoutrecord_fts_ad': (
+        'AFTER DELETE ON workoutrecord BEGIN '
+        'INSERT INTO workoutrecord_fts(workoutrecord_fts, rowid, exercise, notes) '
+        "SELECT 'delete', old.id, name, old.notes FROM exercise WHERE id = old.exercise_id; END"
+    ),
+    'workoutrecord_fts_au': (
+        'AFTER UPDATE OF exercise_id, notes ON workoutrecord BEGIN '
+        'INSERT INTO workoutrecord_fts(workoutrecord_fts, rowid, exercise, notes) '
+        "SELECT 'delete', old.id, name, old.notes FROM exercise WHERE id = old.exercise_id; "
+        'INSERT INTO workoutrecord_fts(rowid, exercise, notes) '
+        'SELECT new.id, name, new.notes FROM exercise WHERE id = new.exercise_id; END'
+    ),
+    'exercise_fts_au': (
+        'AFTER UPDATE OF name ON exercise BEGIN '
+        'INSERT INTO workoutrecord_fts(workoutrecord_fts, rowid, exercise, notes) '
+        "SELECT 'delete', id, old.name, notes FROM workoutrecord WHERE exercise_id = old.id; "
+        'INSERT INTO workoutrecord_fts(rowid, exercise, notes) '
+        'SELECT id, new.name, notes FROM workoutrecord WHERE exercise_id = new.id; END'
+    ),
+}
+
+
+def _drop_sqlite_search(triggers: dict[str, str]) -> None:
+    for name in triggers:
+        op.execute(f'DROP TRIGGER IF EXISTS {name}')
+    op.execute('DROP TABLE IF EXISTS workoutrecord_fts')
+
+
+def _create_sqlite_search(content: str, triggers: dict[str, str]) -> None:
+    op.execute(f"CREATE VIRTUAL TABLE workoutrecord_fts USING fts5(exercise, notes, content='{content}', {FTS_OPTIONS})")
+    for name, definition in triggers.items():
+        op.execute(f'CREATE TRIGGER {name} {definition}')
+    # 既存の記録から索引を作り直す
+    op.execute("INSERT INTO workoutrecord_fts(workoutrecord_fts) VALUES ('rebuild')")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect_name = op.get_bind().dialect.name
+    if dialect_name == 'postgresql':
+        op.drop_index('ix_workoutrecord_search_trgm', table_name='workoutrecord')
+        op.drop_index('ix_workoutrecord_search_tsv', table_name='workoutrecord')
+    elif dialect_name == 'sqlite':
+        _drop_sqlite_search(OLD_SQLITE_TRIGGERS)
+
+    with op.batch_alter_table('workoutrecord') as batch_op:
+        batch_op.drop_constraint('fk_workoutrecord_exercise_id_name', type_='foreignkey')
+        batch_op.drop_column('exercise')
+    op.drop_index('uq_exercise_id_name', table_name='exercise')
+
+    if dialect_name == 'postgresql':
+        op.create_index(
+            'ix_workoutrecord_notes_tsv',
+            'workoutrecord',
+            [sa.text(f"to_tsvector('simple', {NOTES})")],
+            postgresql_using='gin',
+        )
+        op.create_index(
+            'ix_workoutrecord_notes_trgm', 'workoutrecord', [sa.text(f'({NOTES}) gin_trgm_ops')], postgresql_using='gin'
+        )
+        op.create_index(
+            'ix_exercise_name_tsv', 'exercise', [sa.text("to_tsvector('simple', name)")], postgresql_using='gin'
+        )
+        op.create_index('ix_exercise_name_trgm', 'exercise', [sa.text('name gin_trgm_ops')], postgresql_using='gin')
+    elif dialect_name == 'sqlite':
+        # batch モードはテーブルを作り直すため、ビューはテーブルの変更の後に作成する
+        op.execute(
+            'CREATE VIEW workoutrecord_search AS '
+            'SELECT workoutrecord.id AS id, exercise.name AS exercise, workoutrecord.notes AS notes '
+            'FROM workoutrecord JOIN exercise ON exercise.id = workoutrecord.exercise_id'
+        )
+        _create_sqlite_search('workoutrecord_search', NEW_SQLITE_TRIGGERS)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect_name = op.get_bind().dialect.name
+    if dialect_name == 'postgresql':
+        op.drop_index('ix_exercise_name_trgm', table_name='exercise')
+        op.drop_index('ix_exercise_name_tsv', table_name='exercise')
+        op.drop_index('ix_workoutrecord_notes_trgm', table_name='workoutrecord')
+        op.drop_index('ix_workoutrecord_notes_tsv', table_name='workoutrecord')
+    elif dialect_name == 'sqlite':
+        _drop_sqlite_search(NEW_SQLITE_TRIGGERS)
+        op.execute('DROP VIEW IF EXISTS workoutrecord_search')
+
+    # 種目名のコピーを種目ID の種目名から復元する
+    op.add_column('workoutrecord', sa.Column('exercise', sa.String(), nullable=True))
+    op.execute(
+        'UPDATE workoutrecord SET exercise = (SELECT name FROM exercise WHERE exercise.id = workoutrecord.exercise_id)'
+    )
+    op.create_index('uq_exercise_id_name', 'exercise', ['id', 'name'], unique=True)
+    with op.batch_alter_table('workoutrecord') as batch_op:
+        batch_op.alter_column('exercise', existing_type=sa.String(), nullable=False)
+        batch_op.create_foreign_key(
+            'fk_workoutrecord_exercise_id_name',
+            'exercise',
+            ['exercise_id', 'exercise'],
+            ['id', 'name'],
+            onupdate='CASCADE',
+        )
+
+    if dialect_name == 'postgresql':
+        op.create_index(
+            'ix_workoutrecord_search_tsv',
+            'workoutrecord',
+            [sa.text(f"to_tsvector('simple', {OLD_DOCUMENT})")],
+            postgresql_using='gin',
+        )
+        op.create_index(
+            'ix_workoutrecord_search_trgm',
+            'workoutrecord',
+            [sa.text(f'{OLD_DOCUMENT} gin_trgm_ops')],
+            postgresql_using='gin',
+        )
+    elif dialect_name == 'sqlite':
+        _create_sqlite_search('workoutrecord', OLD_SQLITE_TRIGGERS)
@@ -0,0 +1,86 @@
+"""
+アクセストークンの検証コストを比較するベンチマーク。
+
+- verify:          毎回 jwt.decode で署名・クレームを検証する (キャッシュなし)
+- cached:          検証済みトークンのキャッシュから返す
+- user_cache:      cached + ユーザーキャッシュからスナップショットを取得する (get_current_active_user の通常経路)
+- embedded_claims: cached + トークンに埋め込んだクレームからスナップショットを作る (読み取り専用の経路)
+
+使い方 (apps/backend で実行):
+    uv run python -m benchmarks.bench_token_decode --iterations 20000
+"""
+
+import argparse
+import asyncio
+import os
+import timeit
+from datetime import timedelta
+
+# 設定の読み込みに必要な環境変数 (ベンチマークはDBに接続しない)
+os.environ.setdefault('CI', '1')
+os.environ.setdefault('SECRET_KEY', 'benchmark-secret-key')
+
+from src.core import security  # noqa: E402
+from src.schemas.user import CurrentUser  # noqa: E402
+from src.services import user_service  # noqa: E402
+
+EMAIL = 'bench@example.com'
+
+
+def run(iterations: int) -> dict[str, float]:
+    """各経路の 1 回あたりの所要時間 (マイクロ秒) を返す"""
+    token = security.create_access_token(
+        {'sub': EMAIL, 'uid': 1, 'username': 'bench', 'active': True, 'su': False},
+        expires_delta=timedelta(minutes=30),
+    )
+    snapshot = CurrentUser(id=1, email=EMAIL, username='bench', is_active=True, is_superuser=False)
+    asyncio.run(user_service.user_cache.set(EMAIL, snapshot))
+
+    def verify():
+        security.token_cache.clear()
+        security.decode_access_token_claims(token)
+
+    def cached():
+        security.decode_access_token_claims(token)
+
+    def user_cache():
+        claims = security.decode_access_token_claims(token)
+        # 既定のバックエンド (memory) の get は await せずに完了するため、イベントループを介さずに進める
+        coro = user_service.user_cache.get(claims.sub)  # type: ignore[arg-type]
+        try:
+            coro.send(None)
+        except StopIteration:
+            pass
+
+    def embedded_claims():
+        claims = security.decode_access_token_claims(token)
+        CurrentUser(
+            id=claims.uid,  # type: ignore[arg-type]
+            email=claims.sub,  # type: ignore[arg-type]
+            username=claims.username,
+            is_active=claims.active,  # type: ignore[arg-type]
+            is_superuser=bool(claims.su),
+        )
+
+    results = {}
+    for name, func in (
+        ('verify', verify),
+        ('cached', cached),
+        ('user_cache', user_cache),
+        ('embedded_claims', embedded_claims),
+    ):
+        func()  # ウォームアップ
+        seconds = min(timeit.repeat(func, number=iterations, repeat=3))
+        results[name] = seconds / iterations * 1_000_000
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare access token verification paths.')
+    parser.add_argument('--iterations', type=int, default=10000, help='Calls per measurement')
+    args = parser.parse_args()
+
+    results = run(args.iterations)
+    baseline = results['verify']
+    for name, micros in results.items():
+        print(f'{name:<16} {micros:8.2f} us/call  ({baseline / micros:6.1f}x vs verify)')
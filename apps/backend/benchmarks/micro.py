@@ -0,0 +1,314 @@
+"""
+サービス層のホットパスのマイクロベンチマーク。
+
+各ベンチマークを rounds 回 × iterations 回呼び出し、1 回あたりの所要時間 (マイクロ秒) の
+最小値・中央値・平均・標準偏差を計測する。結果は JSON のベースラインとして保存でき、
+compare コマンドでベースラインと比較して、中央値が閾値以上遅くなったものを回帰として報告する。
+ベースラインは同じマシンで取得したもの同士で比較すること。
+
+使い方 (apps/backend で実行):
+    uv run python -m benchmarks.micro run                          # 計測して表示
+    uv run python -m benchmarks.micro run --save-baseline          # benchmarks/baselines/micro.json に保存
+    uv run python -m benchmarks.micro run --output current.json    # 任意のファイルに保存
+    uv run python -m benchmarks.micro compare                      # 計測してベースラインと比較
+    uv run python -m benchmarks.micro compare --current current.json --threshold 0.2
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+DEFAULT_BASELINE = Path(__file__).parent / 'baselines' / 'micro.json'
+DEFAULT_THRESHOLD = 0.10
+
+BenchmarkFunc = Callable[['BenchmarkContext'], Awaitable[None]]
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    name: str
+    func: BenchmarkFunc
+    iterations: int
+    rounds: int = 5
+
+
+BENCHMARKS: dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, iterations: int, rounds: int = 5) -> Callable[[BenchmarkFunc], BenchmarkFunc]:
+    """ベンチマークを登録するデコレーター"""
+
+    def decorator(func: BenchmarkFunc) -> BenchmarkFunc:
+        if name in BENCHMARKS:
+            raise ValueError(f'Benchmark {name} is already registered')
+        BENCHMARKS[name] = Benchmark(name=name, func=func, iterations=iterations, rounds=rounds)
+        return func
+
+    return decorator
+
+
+class BenchmarkContext:
+    """ベンチマーク用のDB・データ・トークンを用意する"""
+
+    SEEDED_RECORDS = 1000
+
+    def __init__(self):
+        self.session_maker: Any = None
+        self.engine: Any = None
+        self.user_id = 0
+        self.records: list[Any] = []
+        self.token = ''
+        self.hashed_password = ''
+        self.counter = 0
+
+    async def setup(self) -> None:
+        from src.core import security
+        from src.core.config import settings
+        from src.core.database import create_db_and_tables, create_engine, create_session_maker, unit_test_profile
+        from src.schemas.record import RecordCreate
+        from src.schemas.user import UserCreate
+        from src.services import record_service, user_service
+
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f'sqlite+aiosqlite:///{self._tmpdir.name}/micro.db', unit_test_profile(settings))
+        self.session_maker = create_session_maker(self.engine)
+        await create_db_and_tables(self.engine)
+
+        async with self.session_maker() as db:
+            user = await user_service.create_user(
+                db=db, user_in=UserCreate(email='micro@example.com', password='micro-password')
+            )
+            self.user_id = user.id
+            records = [
+                RecordCreate(
+                    exercise_date=datetime.date(2024, 1, 1) + datetime.timedelta(days=index % 365),
+                    exercise='Squat',
+                    weight=100.0 + index % 50,
+                    reps=5,
+                    set_reps=3,
+                )
+                for index in range(self.SEEDED_RECORDS)
+            ]
+            await record_service.create_records_bulk(db, records, user_id=self.user_id)
+            self.records = await record_service.get_records(db, user_id=self.user_id, limit=self.SEEDED_RECORDS)
+
+        self.token = security.create_access_token({'sub': 'micro@example.com'})
+        self.hashed_password = security.hash_password('micro-password')
+
+    async def teardown(self) -> None:
+        await self.engine.dispose()
+        self._tmpdir.cleanup()
+
+
+def _register_benchmarks() -> None:
+    """src を読み込むのは環境変数を設定した後にするため、登録は関数内で行う"""
+    from pydantic import TypeAdapter
+
+    from src.core import security
+    from src.schemas.record import RecordRead, record_rows_adapter
+    from src.schemas.user import UserCreate
+    from src.services import record_service, user_service
+
+    record_list_adapter = TypeAdapter(list[RecordRead])
+
+    for page_size, iterations in ((10, 200), (100, 100), (1000, 20)):
+
+        async def get_records(ctx: BenchmarkContext, page_size: int = page_size) -> None:
+            async with ctx.session_maker() as db:
+                await record_service.get_records(db, user_id=ctx.user_id, limit=page_size)
+
+        benchmark(f'record_service.get_records[limit={page_size}]', iterations=iterations)(get_records)
+
+        async def get_record_rows_json(ctx: BenchmarkContext, page_size: int = page_size) -> None:
+            async with ctx.session_maker() as db:
+                rows = await record_service.get_record_rows(db, user_id=ctx.user_id, limit=page_size)
+            record_rows_adapter.dump_json(rows)
+
+        benchmark(f'record_service.get_record_rows+json[limit={page_size}]', iterations=iterations)(
+            get_record_rows_json
+        )
+
+    for row_count, iterations in ((100, 200), (1000, 20)):
+
+        async def serialize_records(ctx: BenchmarkContext, row_count: int = row_count) -> None:
+            rows = [RecordRead.model_validate(record) for record in ctx.records[:row_count]]
+            record_list_adapter.dump_json(rows)
+
+        benchmark(f'RecordRead serialization[rows={row_count}]', iterations=iterations)(serialize_records)
+
+    @benchmark('security.create_access_token', iterations=2000)
+    async def create_access_token(ctx: BenchmarkContext) -> None:
+        security.create_access_token({'sub': 'micro@example.com'})
+
+    @benchmark('security.decode_access_token[uncached]', iterations=2000)
+    async def decode_access_token_uncached(ctx: BenchmarkContext) -> None:
+        security.token_cache.clear()
+        security.decode_access_token(ctx.token)
+
+    @benchmark('security.decode_access_token[cached]', iterations=20000)
+    async def decode_access_token_cached(ctx: BenchmarkContext) -> None:
+        security.decode_access_token(ctx.token)
+
+    @benchmark('security.verify_password', iterations=2, rounds=3)
+    async def verify_password(ctx: BenchmarkContext) -> None:
+        security.verify_password('micro-password', ctx.hashed_password)
+
+    @benchmark('user_service.create_user', iterations=2, rounds=3)
+    async def create_user(ctx: BenchmarkContext) -> None:
+        ctx.counter += 1
+        async with ctx.session_maker() as db:
+            await user_service.create_user(
+                db=db, user_in=UserCreate(email=f'micro-{ctx.counter}@example.com', password='micro-password')
+            )
+
+
+async def _measure(ctx: BenchmarkContext, bench: Benchmark) -> dict[str, Any]:
+    await bench.func(ctx)  # ウォームアップ
+    per_call: list[float] = []
+    for _ in range(bench.rounds):
+        started_at = time.perf_counter()
+        for _ in range(bench.iterations):
+            await bench.func(ctx)
+        per_call.append((time.perf_counter() - started_at) / bench.iterations * 1_000_000)
+    return {
+        'iterations': bench.iterations,
+        'rounds': bench.rounds,
+        'min_us': round(min(per_call), 3),
+        'median_us': round(statistics.median(per_call), 3),
+        'mean_us': round(statistics.fmean(per_call), 3),
+        'stddev_us': round(statistics.stdev(per_call), 3) if len(per_call) > 1 else 0.0,
+    }
+
+
+async def run_benchmarks(name_filter: Optional[str] = None) -> dict[str, Any]:
+    """登録されたベンチマークを実行し、結果の辞書を返す"""
+    if not BENCHMARKS:
+        _register_benchmarks()
+    ctx = BenchmarkContext()
+    await ctx.setup()
+    results: dict[str, Any] = {}
+    try:
+        for name, bench in BENCHMARKS.items():
+            if name_filter and name_filter not in name:
+                continue
+            results[name] = await _measure(ctx, bench)
+            print(f'{name:<48} {results[name]["median_us"]:>12.2f} us/call', file=sys.stderr)
+    finally:
+        await ctx.teardown()
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        },
+        'benchmarks': results,
+    }
+
+
+def compare_results(baseline: dict[str, Any], current: dict[str, Any], threshold: float) -> list[dict[str, Any]]:
+    """
+    ベンチマークごとに中央値を比較する。
+    中央値が baseline の (1 + threshold) 倍を超えたものは status が 'regression' になる。
+    """
+    rows = []
+    for name, current_stats in current['benchmarks'].items():
+        baseline_stats = baseline['benchmarks'].get(name)
+        if baseline_stats is None:
+            rows.append({'name': name, 'baseline_us': None, 'current_us': current_stats['median_us'], 'status': 'new'})
+            continue
+        change = current_stats['median_us'] / baseline_stats['median_us'] - 1
+        if change > threshold:
+            status = 'regression'
+        elif change < -threshold:
+            status = 'improved'
+        else:
+            status = 'ok'
+        rows.append(
+            {
+                'name': name,
+                'baseline_us': baseline_stats['median_us'],
+                'current_us': current_stats['median_us'],
+                'change': round(change, 4),
+                'status': status,
+            }
+        )
+    return rows
+
+
+def _format_comparison(rows: list[dict[str, Any]]) -> str:
+    lines = [f'{"benchmark":<48} {"baseline us":>12} {"current us":>12} {"change":>8}  status']
+    for row in rows:
+        baseline = f'{row["baseline_us"]:.2f}' if row['baseline_us'] is not None else '-'
+        change = f'{row["change"]:+.1%}' if 'change' in row else '-'
+        lines.append(f'{row["name"]:<48} {baseline:>12} {row["current_us"]:>12.2f} {change:>8}  {row["status"]}')
+    return '\n'.join(lines)
+
+
+def _configure_environment() -> None:
+    # アプリケーションの設定は環境変数から読み込まれるため、src の import より前に設定する
+    os.environ.setdefault('CI', '1')
+    os.environ.setdefault('SECRET_KEY', 'micro-benchmark-secret-key')
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+
+def _write_json(path: Path, data: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2) + '\n', encoding='utf-8')
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Service-layer micro-benchmarks.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Run the benchmarks')
+    run_parser.add_argument('--filter', default=None, help='Only run benchmarks whose name contains this text')
+    run_parser.add_argument('--output', type=Path, default=None, help='Write the results to this JSON file')
+    run_parser.add_argument('--save-baseline', action='store_true', help=f'Write the results to {DEFAULT_BASELINE}')
+
+    compare_parser = subparsers.add_parser('compare', help='Compare results with a baseline')
+    compare_parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    compare_parser.add_argument('--current', type=Path, default=None, help='Results file (default: run now)')
+    compare_parser.add_argument('--filter', default=None, help='Only run benchmarks whose name contains this text')
+    compare_parser.add_argument(
+        '--threshold', type=float, default=DEFAULT_THRESHOLD, help='Allowed slowdown of the median (0.1 = 10%%)'
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        _configure_environment()
+        results = asyncio.run(run_benchmarks(args.filter))
+        if args.save_baseline:
+            _write_json(DEFAULT_BASELINE, results)
+        if args.output:
+            _write_json(args.output, results)
+        if not (args.save_baseline or args.output):
+            sys.stdout.write(json.dumps(results, indent=2) + '\n')
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+    if args.current:
+        current = json.loads(args.current.read_text(encoding='utf-8'))
+    else:
+        _configure_environment()
+        current = asyncio.run(run_benchmarks(args.filter))
+    rows = compare_results(baseline, current, args.threshold)
+    print(_format_comparison(rows))
+    regressions = [row['name'] for row in rows if row['status'] == 'regression']
+    if regressions:
+        print(f'\n{len(regressions)} regression(s) above {args.threshold:.0%}: {", ".join(regressions)}')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
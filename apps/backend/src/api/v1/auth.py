@@ -8,10 +8,11 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from src.core.config import settings
 from src.core.database import get_session
 from src.core.logger import APP_LOGGER_NAME
-from src.core.security import create_access_token, decode_access_token
+from src.core.security import create_access_token, decode_access_token_claims
 from src.models.user import User
-from src.schemas.token import Token
-from src.services import user_service
+from src.schemas.token import RefreshTokenRequest, Token
+from src.schemas.user import CurrentUser
+from src.services import token_service, user_service
 
 logger = logging.getLogger(APP_LOGGER_NAME)
 
@@ -30,7 +31,7 @@ async def login_for_access_token(
 ):
     """
     ユーザーのメールアドレス（フォームではusernameとして送信）とパスワードで認証し、
-    アクセストークンを発行する。
+    アクセストークンとリフレッシュトークンを発行する。
     """
     logger.info('Login attempt for username (email): %s', form_data.username)
 
@@ -49,35 +50,74 @@ async def login_for_access_token(
             headers={'WWW-Authenticate': 'Bearer'},  # OAuth2標準のレスポンスヘッダー
         )
 
-    # 3. アクセストークンを生成
+    # 3. アクセストークンとリフレッシュトークンを生成
+    token = await _issue_tokens(db, user)
+
+    logger.info('Token generated successfully for user: %s', user.email)
+
+    # 4. トークンを返す
+    return token
+
+
+@router.post('/refresh', response_model=Token)
+async def refresh_access_token(
+    refresh_in: RefreshTokenRequest,
+    db: AsyncSession = Depends(get_session),
+):
+    """
+    リフレッシュトークンを使って新しいアクセストークンを発行する。
+    パスワードの検証 (bcrypt) は行わない。使用したリフレッシュトークンは無効になり、
+    新しいリフレッシュトークンが返される (ローテーション)。
+    """
+    try:
+        user, new_refresh_token = await token_service.rotate_refresh_token(db, refresh_in.refresh_token)
+    except token_service.RefreshTokenError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(exc),
+            headers={'WWW-Authenticate': 'Bearer'},
+        ) from exc
+
+    logger.info('Access token refreshed for user: %s', user.email)
+    return Token(access_token=_create_user_access_token(user), token_type='bearer', refresh_token=new_refresh_token)
+
+
+def _create_user_access_token(user: User) -> str:
+    """ユーザーのアクセストークンを生成する"""
     # トークンに含めるデータ (subject はユーザーの一意な識別子)
     # 例: user.email または str(user.id)
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token_data = {'sub': user.email}
+    access_token_data: dict = {'sub': user.email}
+    if settings.TOKEN_EMBED_USER_CLAIMS:
+        # 読み取り専用のエンドポイントがDBを参照せずにユーザーを特定できるよう、ユーザー情報を埋め込む
+        access_token_data.update(
+            {'uid': user.id, 'username': user.username, 'active': user.is_active, 'su': user.is_superuser}
+        )
+    return create_access_token(data=access_token_data, expires_delta=access_token_expires)
 
-    access_token = create_access_token(data=access_token_data, expires_delta=access_token_expires)
 
-    logger.info('Token generated successfully for user: %s', user.email)
-
-    # 4. トークンを返す
-    return Token(access_token=access_token, token_type='bearer')
+async def _issue_tokens(db: AsyncSession, user: User) -> Token:
+    """ログインしたユーザーにアクセストークンと新しいリフレッシュトークンを発行する"""
+    refresh_token = await token_service.issue_refresh_token(db, user_id=user.id)
+    return Token(access_token=_create_user_access_token(user), token_type='bearer', refresh_token=refresh_token)
 
 
 async def get_current_active_user(
     token: str = Depends(oauth2_scheme),  # ヘッダーからトークンを取得
     db: AsyncSession = Depends(get_session),
-) -> User:  # 返り値の型ヒントを User モデルに
+) -> CurrentUser:  # 返り値はユーザーのスナップショット
     """
     提供されたアクセストークンを検証し、
-    アクティブなユーザーオブジェクトを返す依存関係関数。
+    アクティブなユーザーのスナップショットを返す依存関係関数。
+    ユーザーはキャッシュから取得するため、キャッシュヒット時はDBへのクエリが発生しない。
     トークンが無効、ユーザーが存在しない、または非アクティブな場合は HTTPException
     """
 
-    # decode_access_token はトークンが無効/期限切れの場合に HTTPException を発生させる
-    email_from_token = decode_access_token(token)
+    # decode_access_token_claims はトークンが無効/期限切れの場合に HTTPException を発生させる
+    email_from_token = decode_access_token_claims(token).sub
     logger.debug('get_current_active_user: Email from token: %s', email_from_token)
 
-    user = await user_service.get_user_by_email(db, email=email_from_token)
+    user = await user_service.get_current_user_snapshot(db, email=email_from_token)  # type: ignore[arg-type]
 
     if user is None:
         logger.warning('User not found for email from token: %s', email_from_token)
@@ -87,10 +127,36 @@ async def get_current_active_user(
             detail='Could not validate credentials - user not found',
             headers={'WWW-Authenticate': 'Bearer'},
         )
-    logger.debug('get_current_active_user: User found in DB: %s, is_active: %s', user.email, user.is_active)
+    logger.debug('get_current_active_user: User found: %s, is_active: %s', user.email, user.is_active)
     if not user.is_active:
         logger.warning('Authentication attempt for inactive user: %s', user.email)
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Inactive user')
 
     logger.debug('Current active user identified: %s', user.email)
     return user
+
+
+async def get_current_active_user_readonly(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_session),
+) -> CurrentUser:
+    """
+    読み取り専用のエンドポイント向けの get_current_active_user。
+    トークンにユーザー情報が埋め込まれている場合 (TOKEN_EMBED_USER_CLAIMS) は、
+    キャッシュもDBも参照せずにクレームからユーザーのスナップショットを作る。
+    埋め込まれていない場合は get_current_active_user と同じ処理を行う。
+    """
+    claims = decode_access_token_claims(token)
+    if claims.uid is None or claims.active is None:
+        return await get_current_active_user(token=token, db=db)
+
+    if not claims.active:
+        logger.warning('Authentication attempt for inactive user: %s', claims.sub)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Inactive user')
+    return CurrentUser(
+        id=claims.uid,
+        email=claims.sub,  # type: ignore[arg-type]
+        username=claims.username,  # type: ignore[arg-type]
+        is_active=claims.active,
+        is_superuser=bool(claims.su),
+    )
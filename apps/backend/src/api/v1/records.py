@@ -1,16 +1,47 @@
+import datetime
+import hashlib
 import logging
+from email.utils import format_datetime
+from typing import Any, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, File, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from src.api.v1.auth import get_current_active_user
+from src.api.v1.auth import get_current_active_user, get_current_active_user_readonly
+from src.core.config import settings
 from src.core.database import get_session
 from src.core.logger import APP_LOGGER_NAME
-from src.models.user import User
 
 # 必要なモジュールをインポート
-from src.schemas.record import RecordCreate, RecordRead, RecordUpdate
-from src.services import record_service
+from src.schemas.record import (
+    PersonalRecordKind,
+    PersonalRecordRead,
+    RecordBulkItemError,
+    RecordBulkResult,
+    RecordChanges,
+    RecordCreate,
+    RecordCreateResult,
+    RecordImportFailure,
+    RecordImportResult,
+    RecordRead,
+    RecordStatsBucket,
+    RecordUpdate,
+    record_rows_adapter,
+)
+from src.schemas.user import CurrentUser
+from src.services import (
+    export_service,
+    import_service,
+    personal_record_service,
+    record_service,
+    record_version_service,
+    search_service,
+    stats_service,
+    sync_service,
+)
+from src.services.record_write_coalescer import record_write_coalescer
 
 # ロガーの設定
 logger = logging.getLogger(APP_LOGGER_NAME)
@@ -22,48 +53,331 @@ router = APIRouter(
 )
 
 
-@router.post('/', response_model=RecordRead, status_code=status.HTTP_201_CREATED)
+@router.post('/', response_model=RecordCreateResult, status_code=status.HTTP_201_CREATED)
 async def create_record_endpoint(
     record_in: RecordCreate,  # リクエストボディ
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
 ):
     """
     新しいトレーニング記録を作成するエンドポイント。
+    この記録で自己ベスト (PR) を更新した場合は personal_records に含めて返す。
+    RECORD_WRITE_COALESCING が有効な場合は、同じユーザーの短時間の作成をまとめて書き込む。
     """
     # サービス層を呼び出して記録を作成
-    created_record = await record_service.create_record(db=db, record_in=record_in, user_id=current_user.id)
+    if settings.RECORD_WRITE_COALESCING:
+        created_record, personal_records = await record_write_coalescer.create_record(
+            record_in=record_in, user_id=current_user.id
+        )
+    else:
+        created_record, personal_records = await record_service.create_record_with_personal_records(
+            db=db, record_in=record_in, user_id=current_user.id
+        )
 
     # 作成された記録を返す
-    return created_record
+    result = RecordCreateResult.model_validate(created_record)
+    result.personal_records = personal_records
+    return result
+
+
+# 一括作成で 1 リクエストに含められる記録の上限
+MAX_BULK_RECORDS = 1000
+
+
+@router.post('/bulk', response_model=RecordBulkResult, status_code=status.HTTP_201_CREATED)
+async def create_records_bulk_endpoint(
+    # 要素ごとに検証してエラーを返すため、受け取りは list[Any] のままにしてスキーマだけ RecordCreate を参照させる
+    records_in: list[Any] = Body(
+        ...,
+        description='RecordCreate と同じ形式の記録のリスト',
+        json_schema_extra={'items': {'$ref': '#/components/schemas/RecordCreate'}},
+    ),
+    db: AsyncSession = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_active_user),
+):
+    """
+    複数のトレーニング記録を一括で作成するエンドポイント。
+    各要素を RecordCreate として検証し、検証に通ったものだけを 1 トランザクションで作成する。
+    検証エラーとなった要素はリクエスト全体を失敗させず、インデックスとともに errors に返す。
+    """
+    if len(records_in) > MAX_BULK_RECORDS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f'Too many records in one request (max {MAX_BULK_RECORDS})',
+        )
+
+    valid_records: list[RecordCreate] = []
+    errors: list[RecordBulkItemError] = []
+    for index, item in enumerate(records_in):
+        try:
+            valid_records.append(RecordCreate.model_validate(item))
+        except ValidationError as exc:
+            errors.append(
+                RecordBulkItemError(
+                    index=index,
+                    errors=exc.errors(include_url=False, include_context=False, include_input=False),  # type: ignore[arg-type]
+                )
+            )
+
+    logger.info(
+        'Bulk record creation by user %s: %d valid, %d invalid.', current_user.email, len(valid_records), len(errors)
+    )
+    created_records = await record_service.create_records_bulk(db=db, records_in=valid_records, user_id=current_user.id)
+    return RecordBulkResult(
+        created=[RecordRead.model_validate(record) for record in created_records],
+        errors=errors,
+    )
+
+
+# カーソル方式で次ページのカーソルを返すレスポンスヘッダー
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+
+# 条件付き GET の応答に付ける Cache-Control (ユーザーごとの内容なので共有キャッシュには保存させず、毎回再検証させる)
+CONDITIONAL_CACHE_CONTROL = 'private, no-cache'
+
+
+async def _conditional_headers(request: Request, db: AsyncSession, user_id: int) -> dict[str, str]:
+    """
+    ユーザーの記録の変更カウンターから ETag / Last-Modified ヘッダーを組み立てる。
+    ETag は (ユーザー, version, パス, クエリパラメータ) から決まるため、同じ version・同じ条件の応答は同じ内容になる。
+    一覧を取得する前に呼び出すこと (取得中に更新が入っても、古い version の ETag が付くだけで次回は 200 になる)。
+    """
+    version, updated_at = await record_version_service.get_version(db, user_id)
+    query = '&'.join(f'{key}={value}' for key, value in sorted(request.query_params.multi_items()))
+    digest = hashlib.blake2b(f'{user_id}|{request.url.path}|{query}'.encode('utf-8'), digest_size=8).hexdigest()
+    headers = {'ETag': f'"{version}-{digest}"', 'Cache-Control': CONDITIONAL_CACHE_CONTROL}
+    if updated_at is not None:
+        headers['Last-Modified'] = format_datetime(updated_at.replace(tzinfo=datetime.timezone.utc), usegmt=True)
+    return headers
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    """If-None-Match のいずれかの ETag が一致するかどうか (弱い比較) を返す"""
+    if_none_match = request.headers.get('if-none-match')
+    if not if_none_match:
+        return False
+    return any(tag.strip().removeprefix('W/') == etag for tag in if_none_match.split(','))
+
+
+@router.post('/import', response_model=RecordImportResult, status_code=status.HTTP_201_CREATED)
+async def import_records_endpoint(
+    file: UploadFile = File(..., description='CSV (ヘッダー付き) または NDJSON のファイル'),
+    import_format: Optional[import_service.ImportFormat] = Query(None, alias='format'),
+    db: AsyncSession = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_active_user),
+):
+    """
+    他のアプリなどから書き出した CSV / NDJSON のトレーニング記録を取り込む。
+    format を省略した場合はファイル名の拡張子 (.csv / .ndjson / .jsonl) から判定する。
+    ファイルは少しずつ読み込まれ、検証に通った行だけがチャンク単位でまとめて書き込まれる。
+    途中でファイルを読めなくなった場合は 400 を返し、detail (RecordImportFailure) に
+    読めなくなった行・コミット済みの件数・どの行までコミットしたかを含める。
+    """
+    if import_format is None:
+        filename = (file.filename or '').lower()
+        if filename.endswith('.csv'):
+            import_format = 'csv'
+        elif filename.endswith(('.ndjson', '.jsonl')):
+            import_format = 'ndjson'
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail='Could not determine file format; specify format=csv or format=ndjson',
+            )
+
+    logger.info('User %s importing records from %s (%s)', current_user.email, file.filename, import_format)
+    try:
+        return await import_service.import_records(
+            db=db, user_id=current_user.id, file=file.file, import_format=import_format
+        )
+    except import_service.ImportFileError as exc:
+        failure = RecordImportFailure(
+            message=str(exc), line=exc.line, committed_through_line=exc.committed_through_line, result=exc.result
+        )
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=failure.model_dump(mode='json')) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
 
 @router.get('/', response_model=list[RecordRead], status_code=status.HTTP_200_OK)
 async def read_records_endpoint(
+    request: Request,
     db: AsyncSession = Depends(get_session),
-    skip: int = 0,
-    limit: int = 100,
-    current_user: User = Depends(get_current_active_user),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    pagination: Literal['offset', 'cursor'] = 'offset',
+    cursor: Optional[str] = None,
+    exercise: Optional[str] = None,
+    date_from: Optional[datetime.date] = None,
+    date_to: Optional[datetime.date] = None,
+    sort: Optional[record_service.RecordSort] = None,
+    current_user: CurrentUser = Depends(get_current_active_user_readonly),
 ):
     """
     トレーニング記録の一覧を読み取る。
+
+    - pagination=offset (デフォルト): skip / limit でページングする。デフォルトの並び順は ID の昇順。
+    - pagination=cursor または cursor 指定時: キーセット方式でページングする。
+      デフォルトの並び順は (exercise_date, id) の昇順。
+      次のページがある場合は X-Next-Cursor ヘッダーにカーソルを返すので、
+      それを cursor パラメータに (同じ sort・絞り込み条件で) 渡して次のページを取得する。
+    - exercise / date_from / date_to: 種目名と日付の範囲 (両端を含む) で絞り込む。
+    - sort: id / exercise_date (先頭に - を付けると降順)。
+
+    応答には ETag と Last-Modified を付ける。If-None-Match が一致する場合は
+    変更カウンターを 1 行読むだけで 304 を返し、一覧の取得は行わない。
     """
-    records = await record_service.get_records(db=db, user_id=current_user.id, skip=skip, limit=limit)
-    return records
+    if date_from is not None and date_to is not None and date_from > date_to:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='date_from must not be after date_to')
+    filters = record_service.RecordFilters(exercise=exercise, date_from=date_from, date_to=date_to)
+
+    headers = await _conditional_headers(request, db, current_user.id)
+    if _not_modified(request, headers['ETag']):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # 一覧は件数が多くなるため、ORM インスタンスと RecordRead の検証を経由せずに
+    # 列の値から直接 JSON を組み立てる。response_model はスキーマ (OpenAPI) のためだけに残している。
+    if pagination == 'cursor' or cursor is not None:
+        try:
+            rows, next_cursor = await record_service.get_record_rows_by_cursor(
+                db=db,
+                user_id=current_user.id,
+                cursor=cursor,
+                limit=limit,
+                filters=filters,
+                sort=sort or 'exercise_date',
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Invalid cursor') from exc
+        if next_cursor is not None:
+            headers[NEXT_CURSOR_HEADER] = next_cursor
+    else:
+        rows = await record_service.get_record_rows(
+            db=db, user_id=current_user.id, skip=skip, limit=limit, filters=filters, sort=sort or 'id'
+        )
+
+    return Response(content=record_rows_adapter.dump_json(rows), media_type='application/json', headers=headers)
+
+
+@router.get('/search', response_model=list[RecordRead], status_code=status.HTTP_200_OK)
+async def search_records_endpoint(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_active_user_readonly),
+):
+    """
+    種目名とメモを全文検索し、一致した記録を関連度の高い順に返す。
+    各単語は前方一致で検索する ("ben" は "Bench Press" に一致する)。
+    PostgreSQL では部分一致と綴り間違いを許すあいまい検索も行う。
+    """
+    rows = await search_service.search_records(db=db, user_id=current_user.id, query=q, limit=limit)
+    return Response(content=record_rows_adapter.dump_json(rows), media_type='application/json')
+
+
+@router.get('/changes', response_model=RecordChanges, status_code=status.HTTP_200_OK)
+async def read_record_changes_endpoint(
+    since: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=1000),
+    db: AsyncSession = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_active_user_readonly),
+):
+    """
+    オフラインのクライアントとの差分同期。同期トークン since 以降に作成・更新された記録 (records) と
+    削除された記録 (deleted) を返す。since を省略すると全件を返す。
+    応答の next_since を保存しておき、次回の since に渡す。has_more が True の場合はすぐに続きを取得する。
+    """
+    try:
+        return await sync_service.get_changes(db=db, user_id=current_user.id, since=since, limit=limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Invalid sync token') from exc
+
+
+@router.get('/prs', response_model=list[PersonalRecordRead], status_code=status.HTTP_200_OK)
+async def read_personal_records_endpoint(
+    exercise: Optional[str] = None,
+    kind: Optional[PersonalRecordKind] = None,
+    db: AsyncSession = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_active_user_readonly),
+):
+    """
+    種目ごとの自己ベスト (最大重量、推定 1RM、重量ごとの最大レップ数、1 日の最大ボリューム) を返す。
+    自己ベストは記録の作成・更新・削除のたびに更新されているため、履歴は走査しない。
+    """
+    return await personal_record_service.get_personal_records(
+        db=db, user_id=current_user.id, exercise=exercise, kind=kind
+    )
+
+
+@router.get('/stats', response_model=list[RecordStatsBucket], status_code=status.HTTP_200_OK)
+async def read_record_stats_endpoint(
+    db: AsyncSession = Depends(get_session),
+    period: stats_service.StatsPeriod = 'week',
+    exercise: Optional[str] = None,
+    date_from: Optional[datetime.date] = None,
+    date_to: Optional[datetime.date] = None,
+    formula: stats_service.OneRepMaxFormula = 'epley',
+    current_user: CurrentUser = Depends(get_current_active_user_readonly),
+):
+    """
+    種目ごと・期間 (day / week / month) ごとの集計を返す。
+    総ボリューム (weight × reps × set_reps)、最大重量、推定 1RM (epley / brzycki)、セット数を
+    サーバー側の SQL で集計するため、クライアントが全履歴をダウンロードする必要はない。
+    """
+    return await stats_service.get_record_stats(
+        db=db,
+        user_id=current_user.id,
+        period=period,
+        exercise=exercise,
+        date_from=date_from,
+        date_to=date_to,
+        formula=formula,
+    )
+
+
+@router.get(
+    '/export',
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    responses={200: {'content': {media_type: {} for media_type in export_service.EXPORT_MEDIA_TYPES.values()}}},
+)
+async def export_records_endpoint(
+    export_format: export_service.ExportFormat = Query('csv', alias='format'),
+    db: AsyncSession = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_active_user_readonly),
+):
+    """
+    トレーニング履歴の全件を CSV または NDJSON でストリーミング出力する。
+    サーバーサイドカーソルから少しずつ読み出して送信するため、履歴の長さに関わらずメモリ使用量は一定。
+    """
+    filename = f'workout-records.{export_format}'
+    return StreamingResponse(
+        export_service.iter_records_export(db=db, user_id=current_user.id, export_format=export_format),
+        media_type=export_service.EXPORT_MEDIA_TYPES[export_format],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'},
+    )
 
 
 @router.get('/{record_id}', response_model=RecordRead, status_code=status.HTTP_200_OK)
 async def read_record_endpoint(
     record_id: int,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_session),  # DBセッションを有効化
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user_readonly),
 ):
     """
     指定されたIDのトレーニング記録を読み取る。
+    一覧と同じく ETag / Last-Modified を付け、If-None-Match が一致する場合は記録を読まずに 304 を返す。
     """
+    headers = await _conditional_headers(request, db, current_user.id)
+    if _not_modified(request, headers['ETag']):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
     db_record = await record_service.get_record(db=db, record_id=record_id, user_id=current_user.id)
     if db_record is None:
         raise HTTPException(status_code=404, detail='Workout record not found')
+    response.headers.update(headers)
     return db_record
 
 
@@ -72,7 +386,7 @@ async def update_record_endpoint(
     record_id: int,
     record_in: RecordUpdate,
     db: AsyncSession = Depends(get_session),  # DBセッションを有効化
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
 ):
     """
     指定されたIDのトレーニング記録を更新する。
@@ -87,7 +401,9 @@ async def update_record_endpoint(
 
 @router.delete('/{record_id}', response_model=RecordRead, status_code=status.HTTP_200_OK)
 async def delete_record_endpoint(
-    record_id: int, db: AsyncSession = Depends(get_session), current_user: User = Depends(get_current_active_user)
+    record_id: int,
+    db: AsyncSession = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_active_user),
 ):
     """
     指定されたIDのトレーニング記録を削除する。
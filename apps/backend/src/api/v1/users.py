@@ -6,8 +6,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from src.api.v1.auth import get_current_active_user
 from src.core.database import get_session
 from src.core.logger import APP_LOGGER_NAME
-from src.models.user import User
-from src.schemas.user import UserCreate, UserRead
+from src.schemas.user import CurrentUser, UserCreate, UserRead
 from src.services import user_service
 
 logger = logging.getLogger(APP_LOGGER_NAME)
@@ -45,7 +44,7 @@ async def create_new_user_endpoint(  # 関数名を register_user_endpoint か
 
 @router.get('/me', response_model=UserRead, status_code=status.HTTP_200_OK)
 async def read_users_me(
-    current_user: User = Depends(get_current_active_user),  # 依存関係を注入
+    current_user: CurrentUser = Depends(get_current_active_user),  # 依存関係を注入
 ):
     """
     現在認証されているユーザーの情報を取得します。
@@ -53,6 +52,6 @@ async def read_users_me(
     get_current_active_user 依存関係によってエラーが返されます。
     """
     logger.info('Fetching /users/me for user: %s', current_user.email)
-    # get_current_active_user が User オブジェクトを返すので、それをそのまま返す
+    # get_current_active_user がユーザーのスナップショットを返すので、それをそのまま返す
     # FastAPI が response_model=UserRead に従ってシリアライズしてくれる
     return current_user
@@ -0,0 +1,64 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+class TTLCache(Generic[K, V]):
+    """
+    有効期限 (TTL) 付きの LRU キャッシュ。
+
+    max_size を超えると最も長く参照されていないエントリから追い出す。
+    有効期限切れのエントリは参照時に削除される。
+    イベントループ上 (単一スレッド) から使う前提のため、ロックは持たない。
+    """
+
+    def __init__(self, max_size: int, ttl: float, timer: Callable[[], float] = time.monotonic):
+        if max_size <= 0:
+            raise ValueError('max_size must be positive')
+        self.max_size = max_size
+        self.ttl = ttl
+        self._timer = timer
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: K) -> Optional[V]:
+        """キーに対応する値を返す。存在しないか期限切れの場合は None を返す。"""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= self._timer():
+            del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        """値を保存する。ttl を指定するとこのエントリだけ有効期限を上書きする。"""
+        expires_at = self._timer() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def delete(self, key: K) -> None:
+        """キーを削除する。存在しない場合は何もしない。"""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """全エントリを削除する (ヒット/ミスのカウンタはそのまま)。"""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict[str, int]:
+        """ヒット数・ミス数・現在のエントリ数を返す。"""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._data)}
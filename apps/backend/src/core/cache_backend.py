@@ -0,0 +1,403 @@
+import asyncio
+import json
+import logging
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Coroutine, Generic, Optional, Sequence, TypeVar
+
+from pydantic import TypeAdapter, ValidationError
+
+from src.core.cache import TTLCache
+from src.core.config import Settings, settings
+from src.core.logger import APP_LOGGER_NAME
+
+logger = logging.getLogger(APP_LOGGER_NAME)
+
+V = TypeVar('V')
+
+
+class Cache(ABC, Generic[V]):
+    """
+    名前空間ごとのキャッシュ。キーは文字列で、値は名前空間の作成時に指定した型に限る。
+
+    読み書きは非同期で行う。SQLAlchemy のイベントフックのような同期処理から使うために、
+    結果を待たない set_nowait / delete_nowait も用意する。
+    """
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+
+    @property
+    @abstractmethod
+    def hits(self) -> int: ...
+
+    @property
+    @abstractmethod
+    def misses(self) -> int: ...
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[V]:
+        """キーに対応する値を返す。存在しないか期限切れの場合は None を返す。"""
+
+    @abstractmethod
+    async def get_many(self, keys: Sequence[str]) -> dict[str, V]:
+        """見つかったキーだけを含む キー -> 値 の辞書を返す"""
+
+    @abstractmethod
+    async def set(self, key: str, value: V, ttl: Optional[float] = None) -> None:
+        """値を保存する。ttl (秒) を指定するとこのエントリだけ有効期限を上書きする。"""
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """キーを削除する。共有キャッシュの場合は他のワーカーの手元のコピーも無効化する。"""
+
+    @abstractmethod
+    def set_nowait(self, key: str, value: V, ttl: Optional[float] = None) -> None:
+        """set の完了を待たずに戻る。手元のコピーにはすぐに反映される。"""
+
+    @abstractmethod
+    def delete_nowait(self, *keys: str) -> None:
+        """delete の完了を待たずに戻る。手元のコピーからはすぐに削除される。"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """このプロセスが持つエントリを削除する (共有キャッシュの内容はそのまま)。"""
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+    def stats(self) -> dict[str, int]:
+        """ヒット数・ミス数・このプロセスが持つエントリ数を返す。"""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self)}
+
+
+class CacheBackend(ABC):
+    """名前空間ごとのキャッシュを作成し、接続などの資源のライフサイクルを管理する"""
+
+    def __init__(self) -> None:
+        self._namespaces: dict[str, Cache[Any]] = {}
+
+    def namespace(self, name: str, value_type: type[V], max_size: int, ttl: float, version: int = 1) -> Cache[V]:
+        """
+        名前空間のキャッシュを作成する。
+        max_size はこのプロセスが保持するエントリ数の上限、ttl は既定の有効期間 (秒)。
+        version は共有キャッシュのキーに含める値の形式のバージョンで、value_type のフィールドを変えたら上げる
+        (新旧のワーカーが混在していても、互いの値を読まない)。
+        """
+        if name in self._namespaces:
+            raise ValueError(f'Cache namespace {name} is already registered')
+        cache = self._create(name, value_type, max_size, ttl, version)
+        self._namespaces[name] = cache
+        return cache
+
+    @abstractmethod
+    def _create(self, name: str, value_type: type[V], max_size: int, ttl: float, version: int) -> Cache[V]: ...
+
+    async def start(self) -> None:
+        """アプリケーションの起動時に呼ぶ"""
+
+    async def close(self) -> None:
+        """アプリケーションの終了時に呼ぶ"""
+
+
+class _MemoryCache(Cache[V]):
+    def __init__(self, namespace: str, max_size: int, ttl: float):
+        super().__init__(namespace)
+        self._local: TTLCache[str, V] = TTLCache(max_size=max_size, ttl=ttl)
+
+    @property
+    def hits(self) -> int:
+        return self._local.hits
+
+    @property
+    def misses(self) -> int:
+        return self._local.misses
+
+    async def get(self, key: str) -> Optional[V]:
+        return self._local.get(key)
+
+    async def get_many(self, keys: Sequence[str]) -> dict[str, V]:
+        found = {}
+        for key in keys:
+            value = self._local.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    async def set(self, key: str, value: V, ttl: Optional[float] = None) -> None:
+        self._local.set(key, value, ttl=ttl)
+
+    async def delete(self, *keys: str) -> None:
+        self.delete_nowait(*keys)
+
+    def set_nowait(self, key: str, value: V, ttl: Optional[float] = None) -> None:
+        self._local.set(key, value, ttl=ttl)
+
+    def delete_nowait(self, *keys: str) -> None:
+        for key in keys:
+            self._local.delete(key)
+
+    def clear(self) -> None:
+        self._local.clear()
+
+    def __len__(self) -> int:
+        return len(self._local)
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    プロセス内の TTL 付き LRU キャッシュ。値はシリアライズせずにそのまま保持する。
+    ワーカーが 1 つの場合や、ワーカー間で共有しなくてよい場合に使う。
+    """
+
+    def _create(self, name: str, value_type: type[V], max_size: int, ttl: float, version: int) -> Cache[V]:
+        return _MemoryCache(name, max_size=max_size, ttl=ttl)
+
+
+class _RedisCache(Cache[V]):
+    def __init__(
+        self, backend: 'RedisCacheBackend', namespace: str, value_type: type[V], max_size: int, ttl: float, version: int
+    ):
+        super().__init__(namespace)
+        self._backend = backend
+        self._version = version
+        self._adapter: TypeAdapter[V] = TypeAdapter(value_type)
+        self._ttl = ttl
+        # 手元のコピー (ニアキャッシュ)。他のワーカーの削除は pub/sub で届くが、
+        # 届かなかった場合に備えて local_ttl より長くは保持しない
+        self._local: TTLCache[str, V] = TTLCache(max_size=max_size, ttl=min(backend.local_ttl, ttl))
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def _redis_key(self, key: str) -> str:
+        return f'{self._backend.key_prefix}:{self.namespace}:v{self._version}:{key}'
+
+    def _local_ttl(self, ttl: Optional[float]) -> Optional[float]:
+        return None if ttl is None else min(self._local.ttl, ttl)
+
+    async def get(self, key: str) -> Optional[V]:
+        return (await self.get_many([key])).get(key)
+
+    async def get_many(self, keys: Sequence[str]) -> dict[str, V]:
+        unique_keys = list(dict.fromkeys(keys))
+        found: dict[str, V] = {}
+        remote_keys: list[str] = []
+        for key in unique_keys:
+            value = self._local.get(key)
+            if value is None:
+                remote_keys.append(key)
+            else:
+                found[key] = value
+        if remote_keys:
+            try:
+                payloads = await self._backend.client.mget([self._redis_key(key) for key in remote_keys])
+            except self._backend.errors:
+                logger.warning('Cache get failed for namespace %s. Treating as a miss.', self.namespace, exc_info=True)
+                payloads = [None] * len(remote_keys)
+            corrupt_keys: list[str] = []
+            for key, payload in zip(remote_keys, payloads):
+                if payload is None:
+                    continue
+                try:
+                    value = self._adapter.validate_json(payload)
+                except (ValidationError, ValueError):
+                    corrupt_keys.append(key)
+                    continue
+                self._local.set(key, value)
+                found[key] = value
+            if corrupt_keys:
+                await self._delete_corrupt(corrupt_keys)
+        self._hits += len(found)
+        self._misses += len(unique_keys) - len(found)
+        return found
+
+    async def _delete_corrupt(self, keys: Sequence[str]) -> None:
+        """読み込めない値 (壊れた値や形式の異なる値) をミスとして扱い、共有キャッシュから削除する"""
+        logger.warning(
+            'Cache entries in namespace %s could not be decoded. Deleting %s keys.', self.namespace, len(keys)
+        )
+        try:
+            await self._backend.client.delete(*(self._redis_key(key) for key in keys))
+        except self._backend.errors:
+            logger.warning('Cache delete failed for namespace %s.', self.namespace, exc_info=True)
+
+    async def set(self, key: str, value: V, ttl: Optional[float] = None) -> None:
+        self._local.set(key, value, ttl=self._local_ttl(ttl))
+        expire_ms = max(1, int((self._ttl if ttl is None else ttl) * 1000))
+        try:
+            await self._backend.client.set(self._redis_key(key), self._adapter.dump_json(value), px=expire_ms)
+        except self._backend.errors:
+            logger.warning('Cache set failed for namespace %s.', self.namespace, exc_info=True)
+
+    async def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        for key in keys:
+            self._local.delete(key)
+        try:
+            await self._backend.client.delete(*(self._redis_key(key) for key in keys))
+            await self._backend.publish_invalidation(self.namespace, keys)
+        except self._backend.errors:
+            logger.warning('Cache delete failed for namespace %s.', self.namespace, exc_info=True)
+
+    def set_nowait(self, key: str, value: V, ttl: Optional[float] = None) -> None:
+        self._local.set(key, value, ttl=self._local_ttl(ttl))
+        self._backend.spawn(self.set(key, value, ttl=ttl))
+
+    def delete_nowait(self, *keys: str) -> None:
+        for key in keys:
+            self._local.delete(key)
+        self._backend.spawn(self.delete(*keys))
+
+    def invalidate_local(self, keys: Sequence[str]) -> None:
+        for key in keys:
+            self._local.delete(key)
+
+    def clear(self) -> None:
+        self._local.clear()
+
+    def __len__(self) -> int:
+        return len(self._local)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Redis (または互換のサーバー) を共有キャッシュとするバックエンド。
+
+    値は JSON にシリアライズして保存し、ワーカーごとに短い TTL の手元のコピーを持つ。
+    削除は '{key_prefix}:invalidate' チャネルに通知し、他のワーカーは手元のコピーを破棄する。
+    Redis に接続できない場合はキャッシュのミスとして扱い、リクエストは失敗させない。
+    """
+
+    RECONNECT_DELAY_SECONDS = 1.0
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        client: Any = None,
+        key_prefix: str = 'workout-recorder',
+        local_ttl: float = 5.0,
+    ):
+        super().__init__()
+        try:
+            from redis import asyncio as aioredis
+            from redis.exceptions import RedisError
+        except ImportError as exc:
+            raise RuntimeError('CACHE_BACKEND=redis requires the redis package (pip install redis)') from exc
+        if client is None:
+            if url is None:
+                raise ValueError('Either url or client is required')
+            client = aioredis.Redis.from_url(url)
+        self.client = client
+        self.errors: tuple[type[BaseException], ...] = (RedisError, OSError)
+        self.key_prefix = key_prefix
+        self.local_ttl = local_ttl
+        self.channel = f'{key_prefix}:invalidate'
+        self._origin = uuid.uuid4().hex
+        self._pubsub: Any = None
+        self._listener: Optional[asyncio.Task] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    def _create(self, name: str, value_type: type[V], max_size: int, ttl: float, version: int) -> Cache[V]:
+        return _RedisCache(self, name, value_type, max_size=max_size, ttl=ttl, version=version)
+
+    def spawn(self, coro: Coroutine[Any, Any, None]) -> None:
+        """完了を待たない処理をタスクとして実行する (close で完了を待つ)"""
+        try:
+            task = asyncio.get_running_loop().create_task(coro)
+        except RuntimeError:
+            coro.close()
+            logger.warning('No running event loop. Skipped a shared cache update.')
+            return
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def publish_invalidation(self, namespace: str, keys: Sequence[str]) -> None:
+        message = json.dumps({'origin': self._origin, 'namespace': namespace, 'keys': list(keys)})
+        await self.client.publish(self.channel, message)
+
+    def _clear_local(self) -> None:
+        for cache in self._namespaces.values():
+            cache.clear()
+
+    def _on_message(self, data: Any) -> None:
+        message = json.loads(data)
+        if message['origin'] == self._origin:
+            return
+        cache = self._namespaces.get(message['namespace'])
+        if isinstance(cache, _RedisCache):
+            cache.invalidate_local(message['keys'])
+
+    async def _subscribe(self) -> None:
+        self._pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(self.channel)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                if self._pubsub is None:
+                    await self._subscribe()
+                    # 購読が切れていた間の削除は届かないため、手元のコピーを捨てる
+                    self._clear_local()
+                async for message in self._pubsub.listen():
+                    if message['type'] == 'message':
+                        self._on_message(message['data'])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning('Cache invalidation listener failed. Reconnecting.', exc_info=True)
+            await self._reset_pubsub()
+            self._clear_local()
+            await asyncio.sleep(self.RECONNECT_DELAY_SECONDS)
+
+    async def _reset_pubsub(self) -> None:
+        pubsub, self._pubsub = self._pubsub, None
+        if pubsub is not None:
+            try:
+                await pubsub.aclose()
+            except self.errors:
+                pass
+
+    async def start(self) -> None:
+        if self._listener is not None:
+            return
+        try:
+            await self._subscribe()
+        except self.errors:
+            logger.warning('Could not subscribe to %s. Retrying in the background.', self.channel, exc_info=True)
+            await self._reset_pubsub()
+        self._listener = asyncio.create_task(self._listen())
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self._reset_pubsub()
+        await self.client.aclose()
+
+
+def create_cache_backend(config: Settings = settings) -> CacheBackend:
+    """設定 (CACHE_BACKEND) に応じたキャッシュのバックエンドを作成する"""
+    if config.CACHE_BACKEND == 'redis':
+        return RedisCacheBackend(
+            url=config.CACHE_REDIS_URL, key_prefix=config.CACHE_KEY_PREFIX, local_ttl=config.CACHE_LOCAL_TTL_SECONDS
+        )
+    return MemoryCacheBackend()
+
+
+# アプリケーション全体で共有するキャッシュのバックエンド
+cache_backend = create_cache_backend()
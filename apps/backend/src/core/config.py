@@ -1,6 +1,6 @@
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -28,6 +28,12 @@ class Settings(BaseSettings):
     TEST_DATABASE_URL: Optional[str] = Field(default='sqlite+aiosqlite:///./test.db' if os.environ.get('CI') else None)
 
     LOG_LEVEL: str = Field(default='INFO')
+    # ログの出力形式 ('text' または 'json')
+    LOG_FORMAT: str = Field(default='text')
+    # ログの書き込みを別スレッド (QueueListener) で行うかどうか
+    LOG_ASYNC: bool = Field(default=True)
+    # 書き込み待ちのログの最大件数 (超えた分は破棄して数える)
+    LOG_QUEUE_MAX_SIZE: int = Field(default=10000)
 
     # トークン署名に使用する秘密鍵 (非常に重要。複雑でランダムな文字列にしてください)
     SECRET_KEY: str = Field(..., alias='SECRET_KEY')
@@ -35,6 +41,67 @@ class Settings(BaseSettings):
     ALGORITHM: str = Field('HS256', alias='ALGORITHM')
     # アクセストークンの有効期間 (分単位)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(30, alias='ACCESS_TOKEN_EXPIRE_MINUTES')
+    # 検証済みのアクセストークンを保持するキャッシュの最大件数
+    TOKEN_CACHE_MAX_SIZE: int = Field(default=4096)
+    # アクセストークンにユーザーID・有効フラグなどを埋め込むかどうか
+    # 有効にすると読み取り専用のエンドポイントはDBを参照しないが、
+    # ユーザーの無効化はトークンの有効期限が切れるまで反映されない
+    TOKEN_EMBED_USER_CLAIMS: bool = Field(default=False)
+    # リフレッシュトークンの有効期間 (日単位)
+    REFRESH_TOKEN_EXPIRE_DAYS: int = Field(default=30)
+    # 発行したリフレッシュトークンを保持するキャッシュの最大件数
+    REFRESH_TOKEN_CACHE_MAX_SIZE: int = Field(default=4096)
+
+    # 認証済みユーザーのスナップショットを保持するキャッシュの最大件数
+    USER_CACHE_MAX_SIZE: int = Field(default=1024)
+    # ユーザーキャッシュの有効期間 (秒)
+    USER_CACHE_TTL_SECONDS: float = Field(default=60.0)
+
+    # 種目名 -> 種目ID の対応を保持するキャッシュの最大件数
+    EXERCISE_CACHE_MAX_SIZE: int = Field(default=8192)
+    # 種目キャッシュの有効期間 (秒)。種目は改名・削除されないため長めでよい
+    EXERCISE_CACHE_TTL_SECONDS: float = Field(default=3600.0)
+
+    # ユーザー・リフレッシュトークン・種目のキャッシュの保存先
+    # 'memory' はプロセスごと、'redis' はワーカー間で共有する (redis パッケージが必要)
+    CACHE_BACKEND: Literal['memory', 'redis'] = Field(default='memory')
+    # CACHE_BACKEND=redis の場合の接続先
+    CACHE_REDIS_URL: str = Field(default='redis://localhost:6379/0')
+    # Redis のキーと無効化通知のチャネルに付ける接頭辞 (同じ Redis を使う別の環境と分ける)
+    CACHE_KEY_PREFIX: str = Field(default='workout-recorder')
+    # 共有キャッシュの値を各ワーカーの手元に保持する最長の秒数
+    CACHE_LOCAL_TTL_SECONDS: float = Field(default=5.0)
+
+    # 同じユーザーの記録の作成 (POST /records/) を短時間まとめて 1 トランザクションで書き込むかどうか
+    RECORD_WRITE_COALESCING: bool = Field(default=False)
+    # 最初の記録からバッチを書き込むまで待つ最長のミリ秒 (0 より大きく 50 以下)
+    RECORD_WRITE_COALESCE_DELAY_MS: float = Field(default=5.0, gt=0, le=50)
+    # 1 つのバッチにまとめる記録の最大件数 (1 以上 1000 以下)。達した時点ですぐに書き込む
+    RECORD_WRITE_COALESCE_MAX_BATCH: int = Field(default=32, ge=1, le=1000)
+
+    # パスワードのハッシュ化/検証 (bcrypt) を実行するワーカースレッド数
+    PASSWORD_HASH_WORKERS: int = Field(default=4)
+    # 空きワーカーを待てる処理数の上限 (超えると 503 を返す)
+    PASSWORD_HASH_MAX_QUEUE: int = Field(default=32)
+    # 503 応答の Retry-After ヘッダーに設定する秒数
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = Field(default=1)
+
+    # DB接続プールに常に保持する接続数 (PostgreSQL のみ)
+    DB_POOL_SIZE: int = Field(default=10)
+    # プールが埋まっているときに一時的に追加で開ける接続数
+    DB_MAX_OVERFLOW: int = Field(default=20)
+    # プールから接続を取得するまで待つ最大秒数
+    DB_POOL_TIMEOUT: float = Field(default=30.0)
+    # この秒数より古い接続は再接続する (-1 で無効)
+    DB_POOL_RECYCLE: int = Field(default=1800)
+    # 接続をプールから取り出す前に生存確認を行うかどうか
+    DB_POOL_PRE_PING: bool = Field(default=True)
+    # 実行する SQL をすべてログに出力するかどうか (デバッグ用)
+    DB_ECHO: bool = Field(default=False)
+    # asyncpg のプリペアドステートメントキャッシュの件数 (pgbouncer の transaction モードでは 0 にする)
+    DB_STATEMENT_CACHE_SIZE: int = Field(default=100)
+    # サーバー側のステートメントタイムアウト (ミリ秒、0 で無効)
+    DB_STATEMENT_TIMEOUT_MS: int = Field(default=30000)
 
     # 非同期DB接続用のURLを生成するプロパティ
     @property
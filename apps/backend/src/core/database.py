@@ -1,28 +1,111 @@
-from typing import AsyncGenerator
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Optional
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlmodel import SQLModel  # SQLModel をインポート
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from .config import Settings, settings
+from .metrics import instrument_engine
+
+
+@dataclass(frozen=True)
+class EngineProfile:
+    """
+    エンジンと接続プールの設定の組。
+    プールの設定は PostgreSQL にのみ適用し、SQLite では SQLAlchemy の既定のプールを使う。
+    """
+
+    pool_size: int
+    max_overflow: int
+    pool_timeout: float
+    pool_recycle: int
+    pool_pre_ping: bool
+    echo: bool
+    # asyncpg のプリペアドステートメントキャッシュの件数
+    statement_cache_size: int
+    # サーバー側のステートメントタイムアウト (ミリ秒、0 で無効)
+    statement_timeout_ms: int
+
+
+def production_profile(config: Settings) -> EngineProfile:
+    """本番用のプロファイル。値は Settings (環境変数) から読み込む。"""
+    return EngineProfile(
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
+        echo=config.DB_ECHO,
+        statement_cache_size=config.DB_STATEMENT_CACHE_SIZE,
+        statement_timeout_ms=config.DB_STATEMENT_TIMEOUT_MS,
+    )
+
+
+def unit_test_profile(config: Settings) -> EngineProfile:
+    """
+    テスト用のプロファイル。
+    小さなプールで接続のリークを早く検出し、生存確認や再接続は行わない。
+    """
+    return EngineProfile(
+        pool_size=2,
+        max_overflow=3,
+        pool_timeout=5.0,
+        pool_recycle=-1,
+        pool_pre_ping=False,
+        echo=config.DB_ECHO,
+        statement_cache_size=config.DB_STATEMENT_CACHE_SIZE,
+        statement_timeout_ms=config.DB_STATEMENT_TIMEOUT_MS,
+    )
+
+
+def engine_options(url: str, profile: EngineProfile) -> dict[str, Any]:
+    """create_async_engine に渡すキーワード引数をプロファイルから組み立てる"""
+    options: dict[str, Any] = {'echo': profile.echo, 'pool_pre_ping': profile.pool_pre_ping}
+    parsed_url = make_url(url)
+    if parsed_url.get_backend_name() == 'sqlite':
+        # SQLite (特にインメモリDB) は StaticPool などを使うため、プールの大きさは指定しない
+        return options
+
+    options.update(
+        pool_size=profile.pool_size,
+        max_overflow=profile.max_overflow,
+        pool_timeout=profile.pool_timeout,
+        pool_recycle=profile.pool_recycle,
+    )
+    if parsed_url.get_driver_name() == 'asyncpg':
+        connect_args: dict[str, Any] = {
+            # asyncpg 本体と SQLAlchemy のアダプターの両方がステートメントをキャッシュする
+            'statement_cache_size': profile.statement_cache_size,
+            'prepared_statement_cache_size': profile.statement_cache_size,
+        }
+        if profile.statement_timeout_ms > 0:
+            connect_args['server_settings'] = {'statement_timeout': str(profile.statement_timeout_ms)}
+        options['connect_args'] = connect_args
+    return options
+
+
+def create_engine(url: str, profile: EngineProfile) -> AsyncEngine:
+    """プロファイルに従って非同期エンジンを作成し、クエリ計測用のイベントを登録する"""
+    return instrument_engine(create_async_engine(url, **engine_options(url, profile)))
+
+
+def create_session_maker(engine_to_use: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    """エンジンに紐づくセッションファクトリーを作成する"""
+    return async_sessionmaker(bind=engine_to_use, class_=AsyncSession, expire_on_commit=False)
 
-from .config import settings
 
 # 本番用エンジンとセッション
-production_engine = create_async_engine(settings.ASYNC_DATABASE_URL, echo=True)
-production_session_local = async_sessionmaker(
-    bind=production_engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-)
+production_engine = create_engine(settings.ASYNC_DATABASE_URL, production_profile(settings))
+production_session_local = create_session_maker(production_engine)
 
 # テスト用エンジンとセッション
-test_engine = None
-test_session_local = None
+test_engine: Optional[AsyncEngine] = None
+test_session_local: Optional[async_sessionmaker[AsyncSession]] = None
 if settings.ASYNC_TEST_DATABASE_URL:
-    test_engine = create_async_engine(settings.ASYNC_TEST_DATABASE_URL, echo=True)
-    test_session_local = async_sessionmaker(
-        bind=test_engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-    )
+    test_engine = create_engine(settings.ASYNC_TEST_DATABASE_URL, unit_test_profile(settings))
+    test_session_local = create_session_maker(test_engine)
 
 # 使用するエンジンとセッションを決定
 engine = test_engine if test_engine else production_engine
@@ -0,0 +1,95 @@
+import asyncio
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, TypeVar
+
+T = TypeVar('T')
+
+
+class PoolSaturatedError(Exception):
+    """ワーカープールの待ち行列が上限に達していて、新しい処理を受け付けられない場合の例外"""
+
+
+@dataclass
+class PoolMetrics:
+    """ワーカープールの処理件数と、待ち時間・処理時間の累計/最大値 (秒)"""
+
+    completed: int = 0
+    rejected: int = 0
+    queue_wait_seconds_total: float = 0.0
+    queue_wait_seconds_max: float = 0.0
+    run_seconds_total: float = 0.0
+    run_seconds_max: float = 0.0
+
+
+class BoundedThreadPool:
+    """
+    同時実行数と待ち行列の長さに上限を持つスレッドプール。
+
+    bcrypt のような CPU を長時間使う同期処理をイベントループから切り離して実行する。
+    実行中 + 待機中の処理が max_workers + max_queue に達している場合は
+    PoolSaturatedError を発生させ、呼び出し側でバックプレッシャーをかけられるようにする。
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, name: str):
+        if max_workers <= 0:
+            raise ValueError('max_workers must be positive')
+        if max_queue < 0:
+            raise ValueError('max_queue must not be negative')
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.name = name
+        self.metrics = PoolMetrics()
+        self._pending = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+
+    @property
+    def pending(self) -> int:
+        """実行中および待機中の処理数"""
+        return self._pending
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        """func(*args) をワーカースレッドで実行し、結果を返す。"""
+        if self._pending >= self.max_workers + self.max_queue:
+            self.metrics.rejected += 1
+            raise PoolSaturatedError(f'{self.name} pool is saturated ({self._pending} pending)')
+
+        self._pending += 1
+        submitted_at = time.perf_counter()
+
+        def _timed_call() -> tuple[T, float, float]:
+            started_at = time.perf_counter()
+            result = func(*args)
+            return result, started_at - submitted_at, time.perf_counter() - started_at
+
+        loop = asyncio.get_running_loop()
+        future = self._executor.submit(_timed_call)
+        # 呼び出し元がキャンセルされてもワーカースレッドは処理を続けるため、
+        # 実行中の数と統計はスレッドの処理が終わった時点でイベントループ上で更新する
+        future.add_done_callback(lambda done: self._call_soon(loop, done))
+        result, _, _ = await asyncio.wrap_future(future, loop=loop)
+        return result
+
+    def _call_soon(self, loop: asyncio.AbstractEventLoop, done: Future[tuple[Any, float, float]]) -> None:
+        try:
+            loop.call_soon_threadsafe(self._finish, done)
+        except RuntimeError:
+            # イベントループが終了している場合は更新先もないため無視する
+            pass
+
+    def _finish(self, done: Future[tuple[Any, float, float]]) -> None:
+        self._pending -= 1
+        if done.cancelled() or done.exception() is not None:
+            return
+        _, queue_wait, run_time = done.result()
+        metrics = self.metrics
+        metrics.completed += 1
+        metrics.queue_wait_seconds_total += queue_wait
+        metrics.queue_wait_seconds_max = max(metrics.queue_wait_seconds_max, queue_wait)
+        metrics.run_seconds_total += run_time
+        metrics.run_seconds_max = max(metrics.run_seconds_max, run_time)
+
+    def shutdown(self) -> None:
+        """ワーカースレッドを停止する"""
+        self._executor.shutdown(wait=False)
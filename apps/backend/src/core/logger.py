@@ -1,22 +1,112 @@
+import atexit
+import copy
+import json
 import logging
+import queue
 import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
 
 from src.core.config import settings
+from src.core.metrics import registry
 
 # アプリケーション全体で使うロガーの名前を定義
 # これにより、他のモジュールから同じ名前でロガーを取得できます
 APP_LOGGER_NAME = 'WorkoutRecorderAPI'
 
+# 待ち行列が一杯で破棄されたログの件数
+log_records_dropped_total = registry.counter(
+    'log_records_dropped_total', 'Log records dropped because the logging queue was full.'
+)
+
+# 非同期モードで、例外のトレースバックを待ち行列に積む前に文字列にするためのフォーマッター
+_traceback_formatter = logging.Formatter()
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    ログを待ち行列に積むだけのハンドラ。
+    待ち行列が一杯の場合は待たずにログを破棄し、破棄した件数を数える。
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        待ち行列に積むコピーを作る。引数はここでメッセージに埋め込む (別スレッドで変更されても影響しない)。
+        QueueHandler.prepare と異なり、例外のトレースバックはメッセージに結合せずに exc_text に残し、
+        書き込む側のフォーマッター (JsonFormatter の exception など) に任せる。
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = _traceback_formatter.formatException(record.exc_info)
+        # トレースバックのオブジェクトは文字列にしたので、待ち行列には積まない
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            log_records_dropped_total.inc()
+
+
+class JsonFormatter(logging.Formatter):
+    """ログを 1 行の JSON として出力するフォーマッター"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            'timestamp': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'module': record.module,
+            'function': record.funcName,
+            'line': record.lineno,
+        }
+        if record.exc_info:
+            payload['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload['exception'] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False)
+
+
+# 非同期モードでログを書き込んでいるリスナー (setup_logger のたびに作り直す)
+_queue_listener: Optional[QueueListener] = None
+
+
+def stop_logging() -> None:
+    """
+    非同期モードのリスナーを停止する。待ち行列に残っているログは書き込んでから停止する。
+    プロセス終了時に atexit から呼ばれる。
+    """
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+atexit.register(stop_logging)
+
 
 def setup_logger():
     """
     アプリケーション用の共通ロガーを設定します。
+    LOG_ASYNC が有効な場合、リクエストを処理するスレッドはログを待ち行列に積むだけにし、
+    標準出力への書き込みは QueueListener のスレッドで行う。
     """
     # APP_LOGGER_NAME でロガーインスタンスを取得
     logger = logging.getLogger(APP_LOGGER_NAME)
 
     # 既にハンドラが設定されている場合は、重複を避けるために一度クリアする
     # (特にUvicornのリロード時などに有効)
+    stop_logging()
     if logger.hasHandlers():
         logger.handlers.clear()
 
@@ -34,15 +124,27 @@ def setup_logger():
     # %(module)s: モジュール名
     # %(funcName)s: 関数名
     # %(message)s: ログメッセージ
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d %(funcName)s] - %(message)s'  # noqa: E501
-    )
+    formatter: logging.Formatter
+    if str(settings.LOG_FORMAT).lower() == 'json':
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d %(funcName)s] - %(message)s'  # noqa: E501
+        )
 
     # コンソール出力用のハンドラ (StreamHandler) を作成
     # Docker環境では sys.stdout を使うのが一般的
     stream_handler = logging.StreamHandler(sys.stdout)
     stream_handler.setFormatter(formatter)
-    logger.addHandler(stream_handler)
+
+    if settings.LOG_ASYNC:
+        global _queue_listener
+        log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_MAX_SIZE)
+        logger.addHandler(DroppingQueueHandler(log_queue))
+        _queue_listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+        _queue_listener.start()
+    else:
+        logger.addHandler(stream_handler)
 
     # (オプション) ファイル出力ハンドラも追加できます
     # file_handler = logging.FileHandler("app.log")
@@ -0,0 +1,351 @@
+"""
+Prometheus のテキスト形式でメトリクスを公開するための最小限の実装。
+
+リクエストごとのレイテンシ・処理中のリクエスト数を ASGI ミドルウェアで、
+DBクエリの件数・時間を SQLAlchemy のイベントで計測する。
+クエリはリクエスト単位でも集計し、N+1 クエリや遅いエンドポイントを見つけられるようにする。
+メトリクスはイベントループのスレッドからのみ更新されるため、ロックは使わない。
+"""
+
+import bisect
+import contextvars
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# /metrics の Content-Type
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# ルーティングにマッチしなかったリクエストのラベル (任意のパスでラベルが増えないようにする)
+UNMATCHED_ROUTE = '<unmatched>'
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+LabelValues = tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ''
+    pairs = ','.join(f'{name}="{_escape_label_value(value)}"' for name, value in zip(names, values))
+    return '{' + pairs + '}'
+
+
+class _Metric:
+    metric_type = ''
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+
+    def _check_labels(self, labels: LabelValues) -> None:
+        if len(labels) != len(self.label_names):
+            raise ValueError(f'{self.name} expects labels {self.label_names}, got {labels}')
+
+    def samples(self) -> Iterable[tuple[str, str, float]]:
+        """(メトリクス名, ラベル文字列, 値) を返す"""
+        raise NotImplementedError
+
+    def render(self) -> list[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.metric_type}']
+        lines.extend(f'{name}{labels} {_format_value(value)}' for name, labels, value in self.samples())
+        return lines
+
+
+class _ScalarMetric(_Metric):
+    """
+    ラベルの組ごとに 1 つの値を持つメトリクス。
+    callback を指定すると、出力のたびに callback() の値を読み取る (ラベルなしの場合のみ)。
+    他のモジュールが持つ統計値 (キャッシュのヒット数など) を公開するのに使う。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        callback: Optional[Callable[[], float]] = None,
+    ):
+        super().__init__(name, documentation, label_names)
+        if callback is not None and label_names:
+            raise ValueError('callback metrics cannot have labels')
+        self._callback = callback
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._check_labels(labels)
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        if self._callback is not None:
+            return float(self._callback())
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> Iterable[tuple[str, str, float]]:
+        if self._callback is not None:
+            yield self.name, '', float(self._callback())
+            return
+        for labels, value in sorted(self._values.items()):
+            yield self.name, _format_labels(self.label_names, labels), value
+
+
+class Counter(_ScalarMetric):
+    """単調増加するカウンター"""
+
+    metric_type = 'counter'
+
+
+class Gauge(_ScalarMetric):
+    """増減する値"""
+
+    metric_type = 'gauge'
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float) -> None:
+        self._check_labels(labels)
+        self._values[labels] = value
+
+
+@dataclass
+class _HistogramSeries:
+    bucket_counts: list[int]
+    count: int = 0
+    total: float = 0.0
+
+
+class Histogram(_Metric):
+    """値の分布を累積バケットで数えるヒストグラム"""
+
+    metric_type = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[LabelValues, _HistogramSeries] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        self._check_labels(labels)
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = _HistogramSeries(bucket_counts=[0] * len(self.buckets))
+        # value 以上の上限を持つ最初のバケットにだけ数え、出力時に累積する
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series.bucket_counts[index] += 1
+        series.count += 1
+        series.total += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return series.count if series else 0
+
+    def sum(self, *labels: str) -> float:
+        series = self._series.get(labels)
+        return series.total if series else 0.0
+
+    def samples(self) -> Iterable[tuple[str, str, float]]:
+        bucket_label_names = self.label_names + ('le',)
+        for labels, series in sorted(self._series.items()):
+            cumulative = 0
+            for upper_bound, bucket_count in zip(self.buckets, series.bucket_counts):
+                cumulative += bucket_count
+                bucket_labels = _format_labels(bucket_label_names, labels + (_format_value(upper_bound),))
+                yield f'{self.name}_bucket', bucket_labels, cumulative
+            yield f'{self.name}_bucket', _format_labels(bucket_label_names, labels + ('+Inf',)), series.count
+            label_string = _format_labels(self.label_names, labels)
+            yield f'{self.name}_sum', label_string, series.total
+            yield f'{self.name}_count', label_string, series.count
+
+
+class MetricsRegistry:
+    """メトリクスをまとめて保持し、Prometheus のテキスト形式で出力する"""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> Any:
+        if metric.name in self._metrics:
+            raise ValueError(f'Metric {metric.name} is already registered')
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        callback: Optional[Callable[[], float]] = None,
+    ) -> Counter:
+        return self.register(Counter(name, documentation, label_names, callback=callback))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        callback: Optional[Callable[[], float]] = None,
+    ) -> Gauge:
+        return self.register(Gauge(name, documentation, label_names, callback=callback))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, label_names, buckets=buckets))
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+# アプリケーション全体で共有するレジストリとメトリクス
+registry = MetricsRegistry()
+
+http_requests_total = registry.counter(
+    'http_requests_total', 'Total HTTP requests by route template and status code.', ('method', 'route', 'status')
+)
+http_request_duration_seconds = registry.histogram(
+    'http_request_duration_seconds', 'HTTP request latency in seconds by route template.', ('method', 'route')
+)
+http_requests_in_progress = registry.gauge(
+    'http_requests_in_progress', 'HTTP requests currently being processed.', ('method',)
+)
+http_request_db_queries = registry.histogram(
+    'http_request_db_queries',
+    'Number of DB queries executed per HTTP request.',
+    ('method', 'route'),
+    buckets=QUERY_COUNT_BUCKETS,
+)
+http_request_db_seconds = registry.histogram(
+    'http_request_db_seconds', 'Total DB time spent per HTTP request in seconds.', ('method', 'route')
+)
+db_queries_total = registry.counter('db_queries_total', 'Total DB queries executed.')
+db_query_duration_seconds = registry.histogram('db_query_duration_seconds', 'DB query latency in seconds.')
+
+
+@dataclass
+class RequestDBStats:
+    """1 リクエストの間に実行されたDBクエリの件数と合計時間"""
+
+    queries: int = 0
+    seconds: float = 0.0
+
+
+# 処理中のリクエストのDB統計 (リクエスト外のクエリでは None)
+current_request_db_stats: contextvars.ContextVar[Optional[RequestDBStats]] = contextvars.ContextVar(
+    'current_request_db_stats', default=None
+)
+
+_QUERY_START_KEY = 'metrics_query_start'
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault(_QUERY_START_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    starts = conn.info.get(_QUERY_START_KEY)
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    db_queries_total.inc()
+    db_query_duration_seconds.observe(elapsed)
+    stats = current_request_db_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.seconds += elapsed
+
+
+def _handle_error(exception_context) -> None:
+    # 失敗したクエリの開始時刻を捨て、次のクエリの計測がずれないようにする
+    connection = exception_context.connection
+    if connection is not None:
+        starts = connection.info.get(_QUERY_START_KEY)
+        if starts:
+            starts.pop()
+
+
+def instrument_engine(engine: AsyncEngine) -> AsyncEngine:
+    """エンジンにクエリ計測用のイベントを登録する (同じエンジンに複数回呼んでもよい)"""
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(sync_engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(sync_engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(sync_engine, 'handle_error', _handle_error)
+    return engine
+
+
+class MetricsMiddleware:
+    """
+    HTTP リクエストのレイテンシ、処理中の件数、リクエストごとのDBクエリ件数・時間を記録する ASGI ミドルウェア。
+    ラベルには実際のパスではなくルートのテンプレート (例: /api/v1/records/{record_id}) を使う。
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        method = scope['method']
+        status_code = 500
+        stats = RequestDBStats()
+        token = current_request_db_stats.set(stats)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+            await send(message)
+
+        http_requests_in_progress.inc(method)
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started_at
+            http_requests_in_progress.dec(method)
+            current_request_db_stats.reset(token)
+            # ルーティングでマッチした APIRoute は scope['route'] に設定される
+            route = scope.get('route')
+            route_label = getattr(route, 'path', None) or UNMATCHED_ROUTE
+            http_requests_total.inc(method, route_label, str(status_code))
+            http_request_duration_seconds.observe(elapsed, method, route_label)
+            http_request_db_queries.observe(stats.queries, method, route_label)
+            http_request_db_seconds.observe(stats.seconds, method, route_label)
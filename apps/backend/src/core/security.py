@@ -1,4 +1,6 @@
+import hashlib
 import logging
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
@@ -7,8 +9,12 @@ from jose import jwt
 from jose.exceptions import ExpiredSignatureError, JWTError
 from passlib.context import CryptContext
 
+from src.core.cache import TTLCache
 from src.core.config import settings
+from src.core.hash_pool import BoundedThreadPool, PoolSaturatedError
 from src.core.logger import APP_LOGGER_NAME
+from src.core.metrics import registry
+from src.schemas.token import TokenData
 
 logger = logging.getLogger(APP_LOGGER_NAME)
 
@@ -25,9 +31,59 @@ EXPIRED_TOKEN_EXCEPTION = HTTPException(
     headers={'WWW-Authenticate': 'Bearer'},
 )
 
+# パスワードハッシュ用のワーカープールが混雑している場合の例外
+SERVICE_BUSY_EXCEPTION = HTTPException(
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    detail='Server is busy, please retry later',
+    headers={'Retry-After': str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+)
+
 # パスワードハッシュ化のコンテキストを設定 (bcrypt を使用)
 pwd_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
 
+# bcrypt の計算はイベントループをブロックするため、専用のワーカープールで実行する
+password_hash_pool = BoundedThreadPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    name='password-hash',
+)
+
+registry.gauge(
+    'password_hash_pool_pending',
+    'Password hashing tasks running or waiting in the worker pool.',
+    callback=lambda: password_hash_pool.pending,
+)
+registry.counter(
+    'password_hash_pool_completed_total',
+    'Password hashing tasks completed by the worker pool.',
+    callback=lambda: password_hash_pool.metrics.completed,
+)
+registry.counter(
+    'password_hash_pool_rejected_total',
+    'Password hashing tasks rejected because the worker pool was saturated.',
+    callback=lambda: password_hash_pool.metrics.rejected,
+)
+registry.counter(
+    'password_hash_pool_queue_wait_seconds_total',
+    'Total time password hashing tasks waited for a worker.',
+    callback=lambda: password_hash_pool.metrics.queue_wait_seconds_total,
+)
+registry.gauge(
+    'password_hash_pool_queue_wait_seconds_max',
+    'Longest time a password hashing task waited for a worker.',
+    callback=lambda: password_hash_pool.metrics.queue_wait_seconds_max,
+)
+registry.counter(
+    'password_hash_pool_run_seconds_total',
+    'Total time the worker pool spent hashing passwords.',
+    callback=lambda: password_hash_pool.metrics.run_seconds_total,
+)
+registry.gauge(
+    'password_hash_pool_run_seconds_max',
+    'Longest time a single password hashing task ran.',
+    callback=lambda: password_hash_pool.metrics.run_seconds_max,
+)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """平文パスワードとハッシュ化されたパスワードを比較検証する"""
@@ -39,6 +95,30 @@ def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    verify_password をワーカープールで実行する非同期版。
+    プールの待ち行列が上限に達している場合は 503 (Retry-After 付き) の HTTPException を発生させる。
+    """
+    try:
+        return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+    except PoolSaturatedError as exc:
+        logger.warning('Password verification rejected: %s', exc)
+        raise SERVICE_BUSY_EXCEPTION from exc
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    hash_password をワーカープールで実行する非同期版。
+    プールの待ち行列が上限に達している場合は 503 (Retry-After 付き) の HTTPException を発生させる。
+    """
+    try:
+        return await password_hash_pool.run(hash_password, password)
+    except PoolSaturatedError as exc:
+        logger.warning('Password hashing rejected: %s', exc)
+        raise SERVICE_BUSY_EXCEPTION from exc
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     与えられたデータと有効期限からアクセストークン (JWT) を生成します。
@@ -61,21 +141,40 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-def decode_access_token(token: str) -> str:
+# トークンのダイジェスト -> 検証済みのクレーム
+# 同じトークンが有効期限まで何度も使われるため、2 回目以降は署名の検証と JSON のパースを省く
+# TTL はエントリごとにトークンの残り有効期間を設定する
+token_cache: TTLCache[bytes, TokenData] = TTLCache(
+    max_size=settings.TOKEN_CACHE_MAX_SIZE, ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
+
+registry.counter('token_cache_hits_total', 'Verified access token cache hits.', callback=lambda: token_cache.hits)
+registry.counter('token_cache_misses_total', 'Verified access token cache misses.', callback=lambda: token_cache.misses)
+
+
+def _token_digest(token: str) -> bytes:
+    # トークン自体をキーにしないよう、ダイジェストをキーにする
+    return hashlib.sha256(token.encode('utf-8')).digest()
+
+
+def decode_access_token_claims(token: str) -> TokenData:
     """
-    アクセストークンをデコードし、ペイロードから subject (ユーザー識別子) を抽出する。
+    アクセストークンを検証し、クレームを返す。
+    検証済みのトークンはキャッシュし、有効期限内の 2 回目以降は jwt.decode を行わない。
+    キャッシュから返す場合も有効期限 (exp) を確認し、期限切れなら検証失敗と同じ例外を発生させる。
     検証に失敗した場合は HTTPException を発生させる。
     """
+    digest = _token_digest(token)
+    claims = token_cache.get(digest)
+    if claims is not None:
+        if claims.exp is not None and claims.exp <= time.time():
+            token_cache.delete(digest)
+            logger.warning('Token decoding failed: Token has expired.')
+            raise EXPIRED_TOKEN_EXCEPTION
+        return claims
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        # "sub" (subject) クレームを取得
-        subject: Optional[str] = payload.get('sub')
-        if subject is None:
-            logger.warning("Token decoding failed: 'sub' claim missing in payload: %s", payload)
-            # subject がペイロードに含まれない、または None の場合は不正なトークン
-            raise CREDENTIALS_EXCEPTION
-        logger.debug('Token decoded successfully. Subject (sub): %s', subject)
-        return subject
     except ExpiredSignatureError as exc:
         logger.warning('Token decoding failed: Token has expired.')
         # トークンの有効期限切れ
@@ -84,3 +183,25 @@ def decode_access_token(token: str) -> str:
         logger.warning('Token decoding failed: JWTError: %s.', str(exc))
         # その他のJWT関連エラー (署名不正など)
         raise CREDENTIALS_EXCEPTION from exc
+
+    # "sub" (subject) クレームを取得
+    if payload.get('sub') is None:
+        logger.warning("Token decoding failed: 'sub' claim missing in payload: %s", payload)
+        # subject がペイロードに含まれない、または None の場合は不正なトークン
+        raise CREDENTIALS_EXCEPTION
+    claims = TokenData.model_validate(payload)
+    logger.debug('Token decoded successfully. Subject (sub): %s', claims.sub)
+
+    if claims.exp is not None:
+        token_cache.set(digest, claims, ttl=claims.exp - time.time())
+    else:
+        token_cache.set(digest, claims)
+    return claims
+
+
+def decode_access_token(token: str) -> str:
+    """
+    アクセストークンをデコードし、ペイロードから subject (ユーザー識別子) を抽出する。
+    検証に失敗した場合は HTTPException を発生させる。
+    """
+    return decode_access_token_claims(token).sub  # type: ignore[return-value]
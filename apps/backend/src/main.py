@@ -1,13 +1,32 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import Response
 
 from src.api.v1 import api_router_v1
+from src.core.cache_backend import cache_backend
 from src.core.logger import setup_logger
+from src.core.metrics import PROMETHEUS_CONTENT_TYPE, MetricsMiddleware, registry
+from src.services.record_write_coalescer import record_write_coalescer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 共有キャッシュの無効化通知の購読を開始し、終了時に接続を閉じる
+    await cache_backend.start()
+    try:
+        yield
+    finally:
+        # まとめて書き込む待ちの記録を書き込んでから終了する
+        await record_write_coalescer.close()
+        await cache_backend.close()
 
 
 def create_app() -> FastAPI:
     app = FastAPI(
         title='Workout Recorder API',
         version='0.1.0',
+        lifespan=lifespan,
         # (オプション) OpenAPIドキュメントのURLなどを設定
         # docs_url="/api/docs",
         # redoc_url="/api/redoc",
@@ -16,6 +35,11 @@ def create_app() -> FastAPI:
     setup_logger()
 
     app.include_router(api_router_v1, prefix='/api')
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get('/metrics', include_in_schema=False)
+    def read_metrics():
+        return Response(content=registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
 
     @app.get('/')
     def read_root():
@@ -1 +1,6 @@
+from .exercise import Exercise  # noqa: F401
+from .personal_best import PersonalBest  # noqa: F401
 from .record import WorkoutRecord  # noqa: F401
+from .record_version import RecordVersion  # noqa: F401
+from .refresh_token import RefreshToken  # noqa: F401
+from .rollup import WorkoutDailyRollup  # noqa: F401
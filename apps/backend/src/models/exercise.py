@@ -0,0 +1,38 @@
+from typing import Optional
+
+from sqlalchemy import Index, UniqueConstraint, text
+from sqlmodel import Field, SQLModel
+
+# 種目名の全文検索 (PostgreSQL のみ) のインデックスの式。記録の検索で、種目名が一致する種目の絞り込みに使う
+EXERCISE_NAME_TSVECTOR_SQL = "to_tsvector('simple', name)"
+
+
+class Exercise(SQLModel, table=True):
+    """
+    種目のカタログ。記録は種目名の文字列ではなくこのテーブルの ID で種目を参照する。
+
+    user_id が None の種目は全ユーザー共通 (グローバル) の種目で、
+    それ以外はユーザーが記録したときに自動で登録されるユーザー固有の種目。
+    同じ名前の種目はユーザーごと (グローバルは全体で) に 1 つだけ存在する。
+    """
+
+    __table_args__ = (
+        UniqueConstraint('user_id', 'name', name='uq_exercise_user_id_name'),
+        # NULL は一意制約で重複とみなされないため、グローバルな種目の名前は部分インデックスで一意にする
+        Index(
+            'uq_exercise_global_name',
+            'name',
+            unique=True,
+            postgresql_where=text('user_id IS NULL'),
+            sqlite_where=text('user_id IS NULL'),
+        ),
+        # 種目名の全文検索 (PostgreSQL のみ): 単語・前方一致用の tsvector と、部分一致・あいまい検索用のトライグラム
+        Index('ix_exercise_name_tsv', text(EXERCISE_NAME_TSVECTOR_SQL), postgresql_using='gin').ddl_if(
+            dialect='postgresql'
+        ),
+        Index('ix_exercise_name_trgm', text('name gin_trgm_ops'), postgresql_using='gin').ddl_if(dialect='postgresql'),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: Optional[int] = Field(default=None, description='Owner of the exercise (None for global exercises)')
+    name: str = Field(description='Exercise name')
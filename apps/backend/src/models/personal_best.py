@@ -0,0 +1,24 @@
+import datetime
+from typing import Optional
+
+from sqlmodel import Field, SQLModel
+
+
+class PersonalBest(SQLModel, table=True):
+    """
+    ユーザー・種目ごとの自己ベスト (PR)。
+
+    記録の作成時に差分で更新されるため、PR の判定で全履歴を走査する必要はない。
+    kind ごとに 1 行 (reps_at_weight は重量ごとに 1 行) を持ち、kind が reps_at_weight 以外の行の weight は 0。
+    session_volume は日ごとの集計 (workout_daily_rollup) の最大値で、特定の記録に対応しないため record_id は None。
+    """
+
+    __tablename__ = 'personal_best'  # type: ignore[assignment]
+
+    user_id: int = Field(primary_key=True, description='ID of the user')
+    exercise_id: int = Field(primary_key=True, foreign_key='exercise.id', description='ID of the exercise')
+    kind: str = Field(primary_key=True, description='max_weight, est_1rm, reps_at_weight or session_volume')
+    weight: float = Field(default=0.0, primary_key=True, description='Weight for reps_at_weight (0 otherwise)')
+    value: float = Field(description='Best value (weight, estimated 1RM, reps or volume)')
+    record_id: Optional[int] = Field(default=None, description='Record that set the best (None for session_volume)')
+    achieved_on: datetime.date = Field(description='Date the best was set')
@@ -1,10 +1,48 @@
-from datetime import date
-from typing import Optional
+from datetime import date, datetime, timezone
+from typing import TYPE_CHECKING, Optional
 
+from sqlalchemy import DDL, Index, event, text
+from sqlalchemy.orm import query_expression
 from sqlmodel import Field, SQLModel
 
+# 全文検索の対象となる文書 (種目名 + メモ)。種目名は exercise テーブルとの結合から得る
+SEARCH_DOCUMENT_SQL = "(coalesce(exercise.name, '') || ' ' || coalesce(workoutrecord.notes, ''))"
+SEARCH_TSVECTOR_SQL = f"to_tsvector('simple', {SEARCH_DOCUMENT_SQL})"
+
+# 結合した文書にはインデックスを張れないため、PostgreSQL ではメモと種目名 (exercise.EXERCISE_NAME_TSVECTOR_SQL) に
+# 別々のインデックスを張り、検索する記録の候補の絞り込みに使う。
+# インデックスの式と検索条件の式が一致しないとインデックスが使われないため、式は文字列で共有する
+NOTES_SEARCH_SQL = "coalesce(notes, '')"
+NOTES_TSVECTOR_SQL = f"to_tsvector('simple', {NOTES_SEARCH_SQL})"
+
+# SQLite で全文検索に使う FTS5 の仮想テーブルと、その外部コンテンツとなるビュー (記録と種目名の結合)
+SEARCH_FTS_TABLE = 'workoutrecord_fts'
+SEARCH_VIEW = 'workoutrecord_search'
+
+
+def _utcnow() -> datetime:
+    # SQLite ではタイムゾーン情報が失われるため、UTC のタイムゾーンなしの日時で統一する
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
 
 class WorkoutRecord(SQLModel, table=True):
+    __table_args__ = (
+        # キーセットページネーション (user_id で絞り込み、(exercise_date, id) 順で走査) 用の複合インデックス
+        Index('ix_workoutrecord_user_id_exercise_date_id', 'user_id', 'exercise_date', 'id'),
+        # 種目ごとの絞り込み・集計用 (種目名の文字列ではなく整数の ID で引く)。
+        # 末尾に id を含めることで、種目 + 日付範囲で絞り込んだ一覧も (exercise_date, id) 順のまま走査できる
+        Index('ix_workoutrecord_user_id_exercise_id_exercise_date_id', 'user_id', 'exercise_id', 'exercise_date', 'id'),
+        # 差分同期 (user_id で絞り込み、(updated_at, id) 順で走査) 用
+        Index('ix_workoutrecord_user_id_updated_at_id', 'user_id', 'updated_at', 'id'),
+        # メモの全文検索 (PostgreSQL のみ): 単語・前方一致用の tsvector と、部分一致・あいまい検索用のトライグラム
+        Index('ix_workoutrecord_notes_tsv', text(NOTES_TSVECTOR_SQL), postgresql_using='gin').ddl_if(
+            dialect='postgresql'
+        ),
+        Index('ix_workoutrecord_notes_trgm', text(f'({NOTES_SEARCH_SQL}) gin_trgm_ops'), postgresql_using='gin').ddl_if(
+            dialect='postgresql'
+        ),
+    )
+
     id: Optional[int] = Field(
         default=None,
         primary_key=True,
@@ -12,8 +50,71 @@ class WorkoutRecord(SQLModel, table=True):
     )
     user_id: int = Field(..., description='ID of the user who performed the workout', index=True)
     exercise_date: date = Field(..., description='Date of the workout')  # date型に変更
-    exercise: str = Field(..., description='Exercises performed during the workout', index=True)
+    exercise_id: int = Field(..., foreign_key='exercise.id', description='ID of the exercise in the catalog')
     weight: float = Field(..., description='Weight lifted during the workout, if applicable')
     reps: int = Field(..., description='Number of repetitions performed')
     set_reps: int = Field(..., description='Number of sets performed')
     notes: Optional[str] = Field(default=None, description='Additional notes about the workout')
+    # 差分同期用。作成・更新・削除のたびに更新する (UTC)
+    updated_at: datetime = Field(default_factory=_utcnow, description='When the record was last changed (UTC)')
+    # 論理削除。削除された記録は差分同期で削除を伝えるために残し、一覧・集計などからは除外する
+    deleted_at: Optional[datetime] = Field(default=None, description='When the record was deleted (UTC)')
+
+    if TYPE_CHECKING:
+        # 種目名 (列ではなく、下で追加する exercise テーブルとの結合から読み込む属性)
+        exercise: str
+
+
+# 種目名は記録に保存せず、exercise テーブルと結合して読み込む (record_service.select_records を参照)。
+# 結合せずに読み込んだ場合や INSERT / UPDATE の RETURNING で得た記録では None のため、呼び出し側が設定する
+WorkoutRecord.__mapper__.add_property('exercise', query_expression())  # type: ignore[attr-defined]
+
+
+# create_all / drop_all (テスト) でも Alembic のマイグレーションと同じ検索用のオブジェクトを作成する。
+# トライグラムのインデックスには pg_trgm 拡張が必要
+event.listen(
+    SQLModel.metadata,
+    'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql'),
+)
+# SQLite の全文検索: 記録と種目名を結合したビューを外部コンテンツとする FTS5 の仮想テーブル。
+# 外部コンテンツのテーブルは自動で同期されないため、記録の追加・削除・更新と種目名の変更をトリガーで追従させる
+SEARCH_SQLITE_STATEMENTS = (
+    f'CREATE VIEW {SEARCH_VIEW} AS '
+    'SELECT workoutrecord.id AS id, exercise.name AS exercise, workoutrecord.notes AS notes '
+    'FROM workoutrecord JOIN exercise ON exercise.id = workoutrecord.exercise_id',
+    f"CREATE VIRTUAL TABLE {SEARCH_FTS_TABLE} USING fts5(exercise, notes, content='{SEARCH_VIEW}', "
+    "content_rowid='id', tokenize='unicode61', prefix='2 3')",
+    f'CREATE TRIGGER workoutrecord_fts_ai AFTER INSERT ON workoutrecord BEGIN '
+    f'INSERT INTO {SEARCH_FTS_TABLE}(rowid, exercise, notes) '
+    'SELECT new.id, name, new.notes FROM exercise WHERE id = new.exercise_id; END',
+    f'CREATE TRIGGER workoutrecord_fts_ad AFTER DELETE ON workoutrecord BEGIN '
+    f'INSERT INTO {SEARCH_FTS_TABLE}({SEARCH_FTS_TABLE}, rowid, exercise, notes) '
+    "SELECT 'delete', old.id, name, old.notes FROM exercise WHERE id = old.exercise_id; END",
+    f'CREATE TRIGGER workoutrecord_fts_au AFTER UPDATE OF exercise_id, notes ON workoutrecord BEGIN '
+    f'INSERT INTO {SEARCH_FTS_TABLE}({SEARCH_FTS_TABLE}, rowid, exercise, notes) '
+    "SELECT 'delete', old.id, name, old.notes FROM exercise WHERE id = old.exercise_id; "
+    f'INSERT INTO {SEARCH_FTS_TABLE}(rowid, exercise, notes) '
+    'SELECT new.id, name, new.notes FROM exercise WHERE id = new.exercise_id; END',
+    f'CREATE TRIGGER exercise_fts_au AFTER UPDATE OF name ON exercise BEGIN '
+    f'INSERT INTO {SEARCH_FTS_TABLE}({SEARCH_FTS_TABLE}, rowid, exercise, notes) '
+    "SELECT 'delete', id, old.name, notes FROM workoutrecord WHERE exercise_id = old.id; "
+    f'INSERT INTO {SEARCH_FTS_TABLE}(rowid, exercise, notes) '
+    'SELECT id, new.name, notes FROM workoutrecord WHERE exercise_id = new.id; END',
+)
+for _statement in SEARCH_SQLITE_STATEMENTS:
+    event.listen(
+        WorkoutRecord.__table__,  # type: ignore[attr-defined]
+        'after_create',
+        DDL(_statement).execute_if(dialect='sqlite'),
+    )
+event.listen(
+    WorkoutRecord.__table__,  # type: ignore[attr-defined]
+    'before_drop',
+    DDL(f'DROP TABLE IF EXISTS {SEARCH_FTS_TABLE}').execute_if(dialect='sqlite'),
+)
+event.listen(
+    WorkoutRecord.__table__,  # type: ignore[attr-defined]
+    'before_drop',
+    DDL(f'DROP VIEW IF EXISTS {SEARCH_VIEW}').execute_if(dialect='sqlite'),
+)
@@ -0,0 +1,23 @@
+import datetime
+
+from sqlmodel import Field, SQLModel
+
+
+class RecordVersion(SQLModel, table=True):
+    """
+    ユーザーごとのトレーニング記録の変更カウンター。
+
+    記録の作成・更新・削除・取り込みと同じトランザクション内で version を 1 ずつ増やすため、
+    記録の一覧・詳細が前回から変わったかどうかは、この 1 行を主キーで読むだけで判定できる。
+    一度も記録を書き込んでいないユーザーの行はない (version 0 とみなす)。
+    日時は UTC (タイムゾーン情報なし) で保存する。
+    """
+
+    __tablename__ = 'record_version'  # type: ignore[assignment]
+
+    # ユーザーIDをそのまま主キーにする (採番しない)
+    user_id: int = Field(
+        primary_key=True, sa_column_kwargs={'autoincrement': False}, description='ID of the user who owns the records'
+    )
+    version: int = Field(default=0, description="Incremented on every change to the user's records")
+    updated_at: datetime.datetime = Field(description='When the records were last changed (UTC)')
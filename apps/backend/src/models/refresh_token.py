@@ -0,0 +1,25 @@
+import datetime
+from typing import Optional
+
+from sqlmodel import Field, SQLModel
+
+
+class RefreshToken(SQLModel, table=True):
+    """
+    アクセストークンの再発行に使うリフレッシュトークン。
+
+    トークン自体は保存せず、SHA-256 のダイジェストだけを保存する。
+    使用されたトークンは revoked_at を設定して無効にし、同じ family_id の新しいトークンを発行する (ローテーション)。
+    無効化済みのトークンが再び使われた場合は漏洩とみなし、同じ family_id のトークンをすべて無効にする。
+    日時はすべて UTC (タイムゾーン情報なし) で保存する。
+    """
+
+    __tablename__ = 'refresh_token'  # type: ignore[assignment]
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    token_hash: str = Field(unique=True, index=True, description='SHA-256 hex digest of the token')
+    user_id: int = Field(index=True, description='ID of the user the token was issued to')
+    family_id: str = Field(index=True, description='Shared by all tokens rotated from the same login')
+    created_at: datetime.datetime = Field(description='When the token was issued (UTC)')
+    expires_at: datetime.datetime = Field(description='When the token expires (UTC)')
+    revoked_at: Optional[datetime.datetime] = Field(default=None, description='When the token was used or revoked')
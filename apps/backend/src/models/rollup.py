@@ -0,0 +1,23 @@
+import datetime
+from typing import Optional
+
+from sqlmodel import Field, SQLModel
+
+
+class WorkoutDailyRollup(SQLModel, table=True):
+    """
+    ユーザー・種目・日付ごとのトレーニング記録の集計 (マテリアライズドビュー相当)。
+
+    WorkoutRecord の作成・更新・削除と同じトランザクション内で差分更新されるため、
+    集計の読み取りはセット数ではなく日数に比例する行数だけを参照すればよい。
+    """
+
+    __tablename__ = 'workout_daily_rollup'  # type: ignore[assignment]
+
+    user_id: int = Field(primary_key=True, description='ID of the user who performed the workout')
+    exercise_id: int = Field(primary_key=True, foreign_key='exercise.id', description='ID of the exercise')
+    date: datetime.date = Field(primary_key=True, description='Date of the workout')
+    volume: float = Field(default=0.0, description='Sum of weight x reps x set_reps')
+    max_weight: float = Field(default=0.0, description='Heaviest weight lifted on the day')
+    est_1rm: Optional[float] = Field(default=None, description='Best estimated 1RM (Epley) on the day')
+    sets: int = Field(default=0, description='Total number of sets (sum of set_reps)')
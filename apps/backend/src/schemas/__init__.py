@@ -1,15 +1,42 @@
-from .record import RecordBase, RecordCreate, RecordRead, RecordUpdate
-from .token import Token, TokenData
-from .user import UserBase, UserCreate, UserRead
+from .record import (
+    PersonalRecordRead,
+    RecordBase,
+    RecordBulkItemError,
+    RecordBulkResult,
+    RecordChanges,
+    RecordCreate,
+    RecordCreateResult,
+    RecordImportResult,
+    RecordImportRowError,
+    RecordRead,
+    RecordReadRow,
+    RecordStatsBucket,
+    RecordTombstone,
+    RecordUpdate,
+)
+from .token import RefreshTokenRequest, Token, TokenData
+from .user import CurrentUser, UserBase, UserCreate, UserRead
 
 __all__ = [
     'UserBase',
     'UserCreate',
     'UserRead',
+    'CurrentUser',
     'RecordBase',
     'RecordCreate',
+    'RecordCreateResult',
     'RecordRead',
+    'RecordReadRow',
     'RecordUpdate',
+    'RecordBulkItemError',
+    'RecordBulkResult',
+    'RecordImportRowError',
+    'RecordImportResult',
+    'RecordStatsBucket',
+    'RecordChanges',
+    'RecordTombstone',
+    'PersonalRecordRead',
+    'RefreshTokenRequest',
     'Token',
     'TokenData',
 ]
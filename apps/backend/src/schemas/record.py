@@ -1,7 +1,7 @@
 import datetime
-from typing import Optional
+from typing import Any, Literal, Optional, TypedDict
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 
 # WorkoutRecord の Config を除いた基本部分を継承
@@ -23,11 +23,73 @@ class RecordRead(RecordBase):
 
     id: int
     user_id: int
+    updated_at: datetime.datetime
 
     class Config:
         from_attributes = True  # DBモデルから変換できるようにする
 
 
+PersonalRecordKind = Literal['max_weight', 'est_1rm', 'reps_at_weight', 'session_volume']
+
+
+class PersonalRecordRead(BaseModel):
+    """種目ごとの自己ベスト (PR) の出力スキーマ"""
+
+    exercise: str
+    kind: PersonalRecordKind
+    value: float  # 重量 / 推定 1RM / レップ数 / 1 日の総ボリューム
+    weight: Optional[float] = None  # reps_at_weight の場合の重量
+    record_id: Optional[int] = None  # PR を出した記録 (session_volume の場合は None)
+    achieved_on: datetime.date
+    previous_value: Optional[float] = None  # 記録作成時に更新した場合の更新前の値
+
+
+class RecordCreateResult(RecordRead):
+    """記録作成時の出力スキーマ (作成した記録で更新した自己ベストを含む)"""
+
+    personal_records: list[PersonalRecordRead] = []
+
+
+class RecordReadRow(TypedDict):
+    """
+    RecordRead と同じ形の辞書。
+    一覧取得で ORM インスタンスや RecordRead を経由せずに JSON に変換するために使う。
+    """
+
+    exercise_date: datetime.date
+    exercise: str
+    weight: float
+    reps: int
+    set_reps: int
+    notes: Optional[str]
+    id: int
+    user_id: int
+    updated_at: datetime.datetime
+
+
+# RecordRead のフィールドの並び (JSON のキーの順序)
+RECORD_READ_FIELDS: tuple[str, ...] = tuple(RecordRead.model_fields)
+
+# RecordReadRow のリストを検証せずに JSON のバイト列に変換するアダプター (起動時に一度だけ構築する)
+record_rows_adapter: TypeAdapter[list[RecordReadRow]] = TypeAdapter(list[RecordReadRow])
+
+
+class RecordTombstone(BaseModel):
+    """差分同期で返す削除済みの記録"""
+
+    id: int
+    deleted_at: datetime.datetime
+
+
+class RecordChanges(BaseModel):
+    """差分同期の結果スキーマ"""
+
+    records: list[RecordRead]  # 作成・更新された記録
+    deleted: list[RecordTombstone]  # 削除された記録
+    next_since: Optional[str] = None  # 次回の since に渡すトークン (変更がなければリクエストの since のまま)
+    has_more: bool = False  # True の場合は next_since ですぐに続きを取得する
+
+
 class RecordUpdate(BaseModel):
     """記録更新時の入力スキーマ (全てのフィールドがオプショナル)"""
 
@@ -38,3 +100,53 @@ class RecordUpdate(BaseModel):
     reps: Optional[int] = None
     set_reps: Optional[int] = None
     notes: Optional[str] = None
+
+
+class RecordBulkItemError(BaseModel):
+    """一括作成時に検証エラーとなった要素 (リクエスト内のインデックスとエラー内容)"""
+
+    index: int
+    errors: list[dict[str, Any]]
+
+
+class RecordBulkResult(BaseModel):
+    """一括作成の結果スキーマ (作成された記録と、検証エラーとなった要素)"""
+
+    created: list[RecordRead]
+    errors: list[RecordBulkItemError]
+
+
+class RecordImportRowError(BaseModel):
+    """インポート時に検証エラーとなった行 (ファイル内の行番号とエラー内容)"""
+
+    row: int
+    errors: list[dict[str, Any]]
+
+
+class RecordImportResult(BaseModel):
+    """インポートの結果サマリー"""
+
+    accepted: int
+    rejected: int
+    errors: list[RecordImportRowError]
+    errors_truncated: bool = False  # rejected の一部しか errors に含まれていない場合は True
+
+
+class RecordImportFailure(BaseModel):
+    """インポートの途中でファイルを読めなくなった場合のエラー内容 (400 の detail)"""
+
+    message: str
+    line: int  # 読めなくなった行 (文字コードの誤りの場合、実際の位置はこの行以降になることがある)
+    committed_through_line: Optional[int]  # この行までの記録はコミット済み (None の場合は 1 件も取り込んでいない)
+    result: RecordImportResult  # accepted はコミット済みの件数
+
+
+class RecordStatsBucket(BaseModel):
+    """種目ごと・期間ごとの集計結果スキーマ"""
+
+    exercise: str
+    period_start: datetime.date
+    total_volume: float  # weight × reps × set_reps の合計
+    top_set_weight: float  # 期間内の最大重量
+    estimated_1rm: float  # 期間内の推定 1RM の最大値
+    set_count: int  # セット数 (set_reps の合計)
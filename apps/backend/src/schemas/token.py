@@ -10,6 +10,16 @@ class Token(BaseModel):
 
     access_token: str
     token_type: str
+    # アクセストークンの再発行 (POST /auth/refresh) に使うトークン
+    refresh_token: Optional[str] = None
+
+
+class RefreshTokenRequest(BaseModel):
+    """
+    POST /auth/refresh のリクエストボディ。
+    """
+
+    refresh_token: str
 
 
 class TokenData(BaseModel):
@@ -20,3 +30,12 @@ class TokenData(BaseModel):
     # "sub" (subject) はJWTの標準的なクレームで、
     # ユーザーの識別子 (例: メールアドレスやユーザーID) を入れる
     sub: Optional[str] = None
+    # 有効期限 (UNIX 時刻)
+    exp: Optional[float] = None
+
+    # TOKEN_EMBED_USER_CLAIMS が有効な場合だけ埋め込まれるユーザー情報
+    # (読み取り専用のエンドポイントでDBを参照せずにユーザーを特定するために使う)
+    uid: Optional[int] = None
+    username: Optional[str] = None
+    active: Optional[bool] = None
+    su: Optional[bool] = None
@@ -19,3 +19,20 @@ class UserRead(UserBase):
 
     class Config:
         from_attributes = True
+
+
+class CurrentUser(BaseModel):
+    """
+    認証済みユーザーの軽量でイミュータブルなスナップショット。
+    get_current_active_user が返し、ユーザーキャッシュに保存される。
+    """
+
+    id: int
+    email: str
+    username: Optional[str] = None
+    is_active: bool
+    is_superuser: bool
+
+    class Config:
+        from_attributes = True
+        frozen = True
@@ -0,0 +1,29 @@
+"""
+期限切れのリフレッシュトークン (refresh_token) を削除するコマンド。
+ローテーションされずに放置された family のトークンも削除されるよう、cron などで定期的に実行する。
+
+使い方 (apps/backend で実行):
+    uv run python -m src.scripts.purge_refresh_tokens
+"""
+
+import asyncio
+
+from src.core.database import async_session_local, engine
+from src.core.logger import setup_logger
+from src.services import token_service
+
+
+async def main() -> int:
+    try:
+        async with async_session_local() as session:
+            row_count = await token_service.purge_expired_refresh_tokens(session)
+            await session.commit()
+            return row_count
+    finally:
+        await engine.dispose()
+
+
+if __name__ == '__main__':
+    setup_logger()
+    row_count = asyncio.run(main())
+    print(f'Purged expired refresh tokens: {row_count} rows')
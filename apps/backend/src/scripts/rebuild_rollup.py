@@ -0,0 +1,33 @@
+"""
+日ごとの集計テーブル (workout_daily_rollup) を WorkoutRecord から作り直すコマンド。
+
+使い方 (apps/backend で実行):
+    uv run python -m src.scripts.rebuild_rollup            # 全ユーザー
+    uv run python -m src.scripts.rebuild_rollup --user-id 1
+"""
+
+import argparse
+import asyncio
+from typing import Optional
+
+from src.core.database import async_session_local, engine
+from src.core.logger import setup_logger
+from src.services import rollup_service
+
+
+async def main(user_id: Optional[int] = None) -> int:
+    try:
+        async with async_session_local() as session:
+            return await rollup_service.rebuild(session, user_id=user_id)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Rebuild the workout_daily_rollup table from workout records.')
+    parser.add_argument('--user-id', type=int, default=None, help='Only rebuild rows for this user')
+    args = parser.parse_args()
+
+    setup_logger()
+    row_count = asyncio.run(main(user_id=args.user_id))
+    print(f'Rebuilt workout_daily_rollup: {row_count} rows')
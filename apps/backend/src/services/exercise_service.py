@@ -0,0 +1,118 @@
+# apps/backend/src/services/exercise_service.py
+
+import logging
+from typing import Iterable, Optional
+
+from sqlalchemy import event, or_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.cache_backend import Cache, cache_backend
+from src.core.config import settings
+from src.core.logger import APP_LOGGER_NAME
+from src.core.metrics import registry
+from src.models.exercise import Exercise
+
+logger = logging.getLogger(APP_LOGGER_NAME)
+
+# '{ユーザーID}:{種目名}' -> 種目ID
+# 種目は改名・削除されないため、一度解決した対応はキャッシュしてよい。
+# 記録の作成や種目での絞り込みのたびに発生する種目テーブルの検索を省くために使う
+exercise_id_cache: Cache[int] = cache_backend.namespace(
+    'exercise_id', int, max_size=settings.EXERCISE_CACHE_MAX_SIZE, ttl=settings.EXERCISE_CACHE_TTL_SECONDS
+)
+
+registry.counter(
+    'exercise_cache_hits_total', 'Exercise name to ID cache hits.', callback=lambda: exercise_id_cache.hits
+)
+registry.counter(
+    'exercise_cache_misses_total', 'Exercise name to ID cache misses.', callback=lambda: exercise_id_cache.misses
+)
+
+# トランザクション内で解決した種目ID は、コミットされるまでキャッシュに入れずに Session.info に保持する。
+# ロールバックされた場合に、存在しない種目ID がキャッシュに残らないようにするため
+_PENDING_KEY = 'pending_exercise_ids'
+
+
+def exercise_cache_key(user_id: int, name: str) -> str:
+    return f'{user_id}:{name}'
+
+
+@event.listens_for(Session, 'after_commit')
+def _cache_committed_exercise_ids(session: Session) -> None:
+    for key, exercise_id in session.info.pop(_PENDING_KEY, {}).items():
+        exercise_id_cache.set_nowait(key, exercise_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending_exercise_ids(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+async def _lookup_exercise_ids(db: AsyncSession, user_id: int, names: list[str]) -> dict[str, int]:
+    """
+    ユーザー固有の種目とグローバルな種目から名前で種目IDを検索する。
+    同じ名前の種目が両方にある場合はユーザー固有の種目を優先する。
+    """
+    statement = select(Exercise.id, Exercise.user_id, Exercise.name).where(
+        Exercise.name.in_(names),  # type: ignore[attr-defined]
+        or_(col(Exercise.user_id) == user_id, col(Exercise.user_id).is_(None)),
+    )
+    found: dict[str, int] = {}
+    for exercise_id, owner_id, name in (await db.exec(statement)).all():
+        if owner_id is not None or name not in found:
+            found[name] = exercise_id  # type: ignore[assignment]
+    return found
+
+
+async def find_exercise_id(db: AsyncSession, user_id: int, name: str) -> Optional[int]:
+    """種目名に対応する種目IDを返す。ユーザーが使える種目に存在しない場合は None を返す (登録はしない)。"""
+    cached = await exercise_id_cache.get(exercise_cache_key(user_id, name))
+    if cached is not None:
+        return cached
+    exercise_id = (await _lookup_exercise_ids(db, user_id, [name])).get(name)
+    if exercise_id is not None:
+        await exercise_id_cache.set(exercise_cache_key(user_id, name), exercise_id)
+    return exercise_id
+
+
+async def resolve_exercise_ids(db: AsyncSession, user_id: int, names: Iterable[str]) -> dict[str, int]:
+    """
+    種目名 -> 種目ID の辞書を返す。カタログに存在しない種目はユーザー固有の種目として登録する。
+    登録は INSERT ... ON CONFLICT DO NOTHING で行うため、同じ種目が同時に登録されても重複しない。
+    呼び出し側のトランザクション内で実行され、コミットは呼び出し側が行う。
+    DBから解決した種目ID は、コミットされた時点でキャッシュに入る。
+    """
+    pending: dict[str, int] = db.sync_session.info.setdefault(_PENDING_KEY, {})
+    unique_names = list(dict.fromkeys(names))
+    cached_ids = await exercise_id_cache.get_many([exercise_cache_key(user_id, name) for name in unique_names])
+    resolved: dict[str, int] = {}
+    missing: list[str] = []
+    for name in unique_names:
+        key = exercise_cache_key(user_id, name)
+        cached = cached_ids.get(key, pending.get(key))
+        if cached is None:
+            missing.append(name)
+        else:
+            resolved[name] = cached
+    if not missing:
+        return resolved
+
+    found = await _lookup_exercise_ids(db, user_id, missing)
+    new_names = [name for name in missing if name not in found]
+    if new_names:
+        dialect_insert = postgresql.insert if db.get_bind().dialect.name == 'postgresql' else sqlite.insert
+        await db.exec(  # type: ignore[call-overload]
+            dialect_insert(Exercise)
+            .values([{'user_id': user_id, 'name': name} for name in new_names])
+            .on_conflict_do_nothing(index_elements=['user_id', 'name'])
+        )
+        found.update(await _lookup_exercise_ids(db, user_id, new_names))
+        logger.info('Registered %s new exercises for user_id: %s', len(new_names), user_id)
+
+    for name, exercise_id in found.items():
+        pending[exercise_cache_key(user_id, name)] = exercise_id
+    resolved.update(found)
+    return resolved
@@ -0,0 +1,97 @@
+# apps/backend/src/services/export_service.py
+
+import csv
+import io
+import json
+import logging
+from typing import AsyncIterator, Literal
+
+from sqlalchemy import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.logger import APP_LOGGER_NAME
+from src.models.exercise import Exercise
+from src.models.record import WorkoutRecord
+
+logger = logging.getLogger(APP_LOGGER_NAME)
+
+ExportFormat = Literal['csv', 'ndjson']
+
+# エクスポートする列 (CSV のヘッダー / NDJSON のキー)
+EXPORT_COLUMNS = ('id', 'exercise_date', 'exercise', 'weight', 'reps', 'set_reps', 'notes')
+
+# サーバーサイドカーソルから一度に取り出す行数
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_MEDIA_TYPES: dict[str, str] = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def _rows_to_csv(rows) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    for row in rows:
+        writer.writerow(
+            (row.id, row.exercise_date.isoformat(), row.exercise, row.weight, row.reps, row.set_reps, row.notes or '')
+        )
+    return buffer.getvalue().encode('utf-8')
+
+
+def _rows_to_ndjson(rows) -> bytes:
+    lines = [
+        json.dumps(
+            {
+                'id': row.id,
+                'exercise_date': row.exercise_date.isoformat(),
+                'exercise': row.exercise,
+                'weight': row.weight,
+                'reps': row.reps,
+                'set_reps': row.set_reps,
+                'notes': row.notes,
+            },
+            ensure_ascii=False,
+        )
+        for row in rows
+    ]
+    lines.append('')
+    return '\n'.join(lines).encode('utf-8')
+
+
+async def iter_records_export(
+    db: AsyncSession, user_id: int, export_format: ExportFormat, batch_size: int = EXPORT_BATCH_SIZE
+) -> AsyncIterator[bytes]:
+    """
+    ユーザーの全トレーニング記録を CSV / NDJSON のバイト列として少しずつ返す非同期ジェネレーター。
+
+    ORM インスタンスを作らずに列のタプルだけを取得し、サーバーサイドカーソル (yield_per) から
+    batch_size 行ずつ取り出してそのままバイト列に変換するため、履歴の長さに関わらずメモリ使用量は一定になる。
+    StreamingResponse がレスポンスを送り終えた時点でセッションを閉じる。
+    """
+    logger.info('Exporting workout records for user_id: %s as %s', user_id, export_format)
+    table = WorkoutRecord.__table__.c  # type: ignore[attr-defined]
+    exercise = Exercise.__table__.c  # type: ignore[attr-defined]
+    # 種目名は exercise テーブルとの結合から得る
+    columns = (exercise.name.label('exercise') if name == 'exercise' else table[name] for name in EXPORT_COLUMNS)
+    statement = (
+        select(*columns)
+        .join_from(WorkoutRecord.__table__, Exercise.__table__, exercise.id == table.exercise_id)  # type: ignore[attr-defined]
+        .where(table.user_id == user_id, table.deleted_at.is_(None))
+        .order_by(table.exercise_date, table.id)
+        .execution_options(yield_per=batch_size)
+    )
+    serialize = _rows_to_csv if export_format == 'csv' else _rows_to_ndjson
+
+    exported = 0
+    try:
+        if export_format == 'csv':
+            yield (','.join(EXPORT_COLUMNS) + '\n').encode('utf-8')
+        result = await db.stream(statement)
+        async for rows in result.partitions():
+            exported += len(rows)
+            yield serialize(rows)
+    finally:
+        # レスポンスの送信中もセッション (接続) を使い続けるため、ここで明示的に閉じる
+        await db.close()
+        logger.info('Exported %s workout records for user_id: %s', exported, user_id)
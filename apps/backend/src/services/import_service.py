@@ -0,0 +1,231 @@
+# apps/backend/src/services/import_service.py
+
+import csv
+import datetime
+import itertools
+import json
+import logging
+from typing import Any, BinaryIO, Iterator, Literal, Optional
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from src.core.logger import APP_LOGGER_NAME
+from src.models.record import WorkoutRecord
+from src.schemas.record import RecordBase, RecordImportResult, RecordImportRowError
+from src.services import exercise_service, personal_record_service, record_version_service, rollup_service
+
+logger = logging.getLogger(APP_LOGGER_NAME)
+
+ImportFormat = Literal['csv', 'ndjson']
+
+# 1 回の INSERT / COPY で書き込む行数 (メモリ使用量はこの行数に比例する)
+IMPORT_CHUNK_SIZE = 1000
+# 結果に含める検証エラーの最大件数 (件数自体は rejected で全て数える)
+MAX_REPORTED_ERRORS = 100
+
+# DBに書き込む列 (COPY の列順)
+_INSERT_COLUMNS = (
+    'user_id',
+    'exercise_date',
+    'exercise_id',
+    'weight',
+    'reps',
+    'set_reps',
+    'notes',
+    'updated_at',
+)
+
+
+class ImportFileError(ValueError):
+    """
+    ファイルを途中から読めなくなった場合 (文字コードや CSV の形式の誤り) の例外。
+    それまでにコミットしたチャンクは取り込まれたまま残るため、import_records は
+    コミット済みの結果 (result) と、どの行までコミットしたか (committed_through_line) を設定してから送出する。
+    """
+
+    def __init__(self, line: int, reason: Exception):
+        super().__init__(f'Uploaded file could not be parsed at line {line}: {reason}')
+        self.line = line
+        self.result = RecordImportResult(accepted=0, rejected=0, errors=[])
+        self.committed_through_line: Optional[int] = None
+
+
+def _decode_lines(file: BinaryIO) -> Iterator[str]:
+    """
+    ファイルを 1 行ずつ UTF-8 (先頭の BOM は読み飛ばす) の文字列として返す。
+    行ごとにデコードするため、読めない行があればその行番号で ImportFileError を送出できる。
+    """
+    for line_number, raw_line in enumerate(file, start=1):
+        try:
+            yield raw_line.decode('utf-8-sig' if line_number == 1 else 'utf-8')
+        except UnicodeDecodeError as exc:
+            raise ImportFileError(line_number, exc) from exc
+
+
+def _iter_csv_rows(lines: Iterator[str]) -> Iterator[tuple[int, Any]]:
+    """CSV を 1 行ずつ (行番号, 行の辞書) として返す。空欄は None として扱う。"""
+    reader = csv.DictReader(lines)
+    try:
+        for row in reader:
+            yield reader.line_num, {key: (value if value != '' else None) for key, value in row.items()}
+    except csv.Error as exc:
+        raise ImportFileError(reader.line_num, exc) from exc
+
+
+def _iter_ndjson_rows(lines: Iterator[str]) -> Iterator[tuple[int, Any]]:
+    """NDJSON を 1 行ずつ (行番号, JSON 値) として返す。空行は読み飛ばす。"""
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError as exc:
+            # JSON として読めない行は検証エラーと同じ扱いにする
+            yield line_number, exc
+
+
+async def _write_chunk(
+    db: AsyncSession, user_id: int, records: list[RecordBase], changed_at: datetime.datetime
+) -> set[int]:
+    """
+    検証済みの記録をまとめて書き込み、書き込んだ記録の種目IDを返す。
+    changed_at は変更カウンターを更新したときの日時で、記録の updated_at になる。
+    PostgreSQL (asyncpg) では COPY、それ以外では executemany を使う。
+    """
+    exercise_ids = await exercise_service.resolve_exercise_ids(db, user_id, (record.exercise for record in records))
+    rows = [
+        (
+            user_id,
+            record.exercise_date,
+            exercise_ids[record.exercise],
+            record.weight,
+            record.reps,
+            record.set_reps,
+            record.notes,
+            changed_at,
+        )
+        for record in records
+    ]
+    if db.get_bind().dialect.driver == 'asyncpg':
+        connection = await db.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(  # type: ignore[union-attr]
+            WorkoutRecord.__tablename__, records=rows, columns=list(_INSERT_COLUMNS)
+        )
+    else:
+        await db.exec(  # type: ignore[call-overload]
+            insert(WorkoutRecord.__table__),  # type: ignore[attr-defined]
+            params=[dict(zip(_INSERT_COLUMNS, row)) for row in rows],
+        )
+    await rollup_service.apply_added_records(db, user_id, records, exercise_ids)
+    return set(exercise_ids.values())
+
+
+async def _write_and_commit_chunk(db: AsyncSession, user_id: int, records: list[RecordBase]) -> set[int]:
+    """
+    変更カウンターを更新してから 1 チャンク分の記録を書き込み、コミットする。
+    カウンターの行ロックはコミットまで保持されるため、ロックを持つ時間は 1 チャンク分の書き込みで済む。
+    """
+    changed_at = await record_version_service.bump_version(db, user_id)
+    exercise_ids = await _write_chunk(db, user_id, records, changed_at)
+    await db.commit()
+    return exercise_ids
+
+
+def _next_rows(rows: Iterator[tuple[int, Any]], count: int) -> list[tuple[int, Any]]:
+    """rows から最大 count 行を読み込む (ファイルの読み込みと解析を行うため、スレッドプールで呼び出す)"""
+    return list(itertools.islice(rows, count))
+
+
+async def import_records(
+    db: AsyncSession,
+    user_id: int,
+    file: BinaryIO,
+    import_format: ImportFormat,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> RecordImportResult:
+    """
+    アップロードされた CSV / NDJSON ファイルを少しずつ読み込み、トレーニング記録として取り込む。
+
+    ファイルの読み込みと解析は chunk_size 行ずつスレッドプールで行い、イベントループをブロックしない。
+    各行を RecordBase で検証し、検証に通った行を chunk_size 行ずつまとめて書き込むため、
+    ピーク時のメモリ使用量はファイルサイズではなくチャンクサイズで決まる。
+    検証エラーとなった行は取り込まずに数え、先頭 MAX_REPORTED_ERRORS 件の内容を結果に含める。
+
+    変更カウンターの行ロックを取り込み全体で保持し続けないよう、チャンクごとにコミットする。
+    そのため途中でエラーが発生した場合は、それまでにコミットしたチャンクは取り込まれたまま残る
+    (自己ベストはコミット済みの記録から作り直してから例外を送出する)。
+    ファイルを途中から読めなくなった場合は ImportFileError を送出し、コミット済みの件数と
+    どの行までコミットしたかを伝える (修正したファイルはその次の行から取り込み直せばよい)。
+    """
+    logger.info('Importing workout records for user_id: %s from %s', user_id, import_format)
+    lines = _decode_lines(file)
+    rows = _iter_csv_rows(lines) if import_format == 'csv' else _iter_ndjson_rows(lines)
+
+    result = RecordImportResult(accepted=0, rejected=0, errors=[])
+    chunk: list[RecordBase] = []
+    # コミット済みの記録の種目IDと、コミット済みの最後の行
+    exercise_ids: set[int] = set()
+    committed_through_line: Optional[int] = None
+    row_number = 0
+    try:
+        while batch := await run_in_threadpool(_next_rows, rows, chunk_size):
+            for row_number, row in batch:
+                try:
+                    if isinstance(row, json.JSONDecodeError):
+                        raise ValueError(f'Invalid JSON: {row.msg}')
+                    chunk.append(RecordBase.model_validate(row))
+                except (ValidationError, ValueError) as exc:
+                    result.rejected += 1
+                    if len(result.errors) < MAX_REPORTED_ERRORS:
+                        errors: list[dict[str, Any]]
+                        if isinstance(exc, ValidationError):
+                            errors = [
+                                {**error}
+                                for error in exc.errors(include_url=False, include_context=False, include_input=False)
+                            ]
+                        else:
+                            errors = [{'loc': [], 'msg': str(exc), 'type': 'value_error'}]
+                        result.errors.append(RecordImportRowError(row=row_number, errors=errors))
+                    continue
+
+                if len(chunk) >= chunk_size:
+                    exercise_ids |= await _write_and_commit_chunk(db, user_id, chunk)
+                    result.accepted += len(chunk)
+                    committed_through_line = row_number
+                    chunk = []
+
+        if chunk:
+            exercise_ids |= await _write_and_commit_chunk(db, user_id, chunk)
+            result.accepted += len(chunk)
+    except Exception as exc:
+        await db.rollback()
+        if exercise_ids:
+            logger.warning('Import for user_id: %s failed after committing %s records', user_id, result.accepted)
+            await _recompute_personal_records(db, user_id, exercise_ids)
+        if isinstance(exc, ImportFileError):
+            result.errors_truncated = result.rejected > len(result.errors)
+            exc.result = result
+            exc.committed_through_line = committed_through_line
+        raise
+
+    await _recompute_personal_records(db, user_id, exercise_ids)
+    result.errors_truncated = result.rejected > len(result.errors)
+    logger.info(
+        'Imported workout records for user_id: %s (accepted: %s, rejected: %s)',
+        user_id,
+        result.accepted,
+        result.rejected,
+    )
+    return result
+
+
+async def _recompute_personal_records(db: AsyncSession, user_id: int, exercise_ids: set[int]) -> None:
+    # COPY で書き込んだ記録の ID は分からないため、取り込んだ種目の自己ベストはまとめて作り直す
+    if not exercise_ids:
+        return
+    await personal_record_service.recompute(db, user_id, exercise_ids)
+    await db.commit()
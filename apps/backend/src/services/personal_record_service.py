@@ -0,0 +1,282 @@
+# apps/backend/src/services/personal_record_service.py
+
+import datetime
+import logging
+from dataclasses import dataclass
+from typing import Iterable, Optional, Sequence
+
+from sqlalchemy import and_, delete, insert, or_, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.logger import APP_LOGGER_NAME
+from src.models.exercise import Exercise
+from src.models.personal_best import PersonalBest
+from src.models.record import WorkoutRecord
+from src.models.rollup import WorkoutDailyRollup
+from src.schemas.record import PersonalRecordKind, PersonalRecordRead
+from src.services import exercise_service
+from src.services.stats_service import estimate_1rm
+
+logger = logging.getLogger(APP_LOGGER_NAME)
+
+# (exercise_id, kind, weight) の組で自己ベストの行を特定する (reps_at_weight 以外の weight は 0)
+BestKey = tuple[int, str, float]
+
+_NO_WEIGHT = 0.0
+
+
+@dataclass(frozen=True)
+class _Best:
+    value: float
+    record_id: Optional[int]
+    achieved_on: datetime.date
+
+
+def _is_better(candidate: _Best, current: Optional[_Best]) -> bool:
+    # 同じ値の場合は先に出した方を自己ベストとする
+    return current is None or candidate.value > current.value
+
+
+def _record_bests(records: Iterable[WorkoutRecord]) -> dict[BestKey, _Best]:
+    """
+    記録から max_weight / est_1rm / reps_at_weight の最大値を求める。
+    records は (exercise_date, id) の昇順で渡す (同じ値の場合は先の記録を採用する)。
+    """
+    bests: dict[BestKey, _Best] = {}
+
+    def offer(key: BestKey, value: Optional[float], record: WorkoutRecord) -> None:
+        if value is None:
+            return
+        candidate = _Best(value=value, record_id=record.id, achieved_on=record.exercise_date)
+        if _is_better(candidate, bests.get(key)):
+            bests[key] = candidate
+
+    for record in records:
+        offer((record.exercise_id, 'max_weight', _NO_WEIGHT), record.weight, record)
+        offer((record.exercise_id, 'est_1rm', _NO_WEIGHT), estimate_1rm(record.weight, record.reps), record)
+        if record.reps > 0:
+            offer((record.exercise_id, 'reps_at_weight', record.weight), float(record.reps), record)
+    return bests
+
+
+def _session_volume_bests(rows: Iterable) -> dict[BestKey, _Best]:
+    """日ごとの集計行 (exercise_id, date, volume) から 1 日の総ボリュームの最大値を求める"""
+    bests: dict[BestKey, _Best] = {}
+    for row in rows:
+        key = (row.exercise_id, 'session_volume', _NO_WEIGHT)
+        candidate = _Best(value=row.volume, record_id=None, achieved_on=row.date)
+        if _is_better(candidate, bests.get(key)):
+            bests[key] = candidate
+    return bests
+
+
+def _sorted_records(records: Iterable[WorkoutRecord]) -> list[WorkoutRecord]:
+    return sorted(records, key=lambda record: (record.exercise_date, record.id or 0))
+
+
+async def _load_bests(db: AsyncSession, user_id: int, keys: Iterable[BestKey]) -> dict[BestKey, _Best]:
+    unique_keys = list(set(keys))
+    if not unique_keys:
+        return {}
+    statement = select(PersonalBest).where(
+        PersonalBest.user_id == user_id,
+        tuple_(col(PersonalBest.exercise_id), col(PersonalBest.kind), col(PersonalBest.weight)).in_(unique_keys),
+    )
+    return {
+        (best.exercise_id, best.kind, best.weight): _Best(
+            value=best.value, record_id=best.record_id, achieved_on=best.achieved_on
+        )
+        for best in (await db.exec(statement)).all()
+    }
+
+
+async def _upsert_bests(db: AsyncSession, user_id: int, bests: dict[BestKey, _Best]) -> None:
+    """自己ベストの行を追加・更新する。同時に更新された場合に備え、値が大きくなる場合だけ上書きする。"""
+    if not bests:
+        return
+    rows = [
+        {
+            'user_id': user_id,
+            'exercise_id': exercise_id,
+            'kind': kind,
+            'weight': weight,
+            'value': best.value,
+            'record_id': best.record_id,
+            'achieved_on': best.achieved_on,
+        }
+        for (exercise_id, kind, weight), best in bests.items()
+    ]
+    dialect_insert = postgresql.insert if db.get_bind().dialect.name == 'postgresql' else sqlite.insert
+    statement = dialect_insert(PersonalBest).values(rows)
+    table = PersonalBest.__table__.c  # type: ignore[attr-defined]
+    statement = statement.on_conflict_do_update(
+        index_elements=['user_id', 'exercise_id', 'kind', 'weight'],
+        set_={
+            'value': statement.excluded.value,
+            'record_id': statement.excluded.record_id,
+            'achieved_on': statement.excluded.achieved_on,
+        },
+        where=statement.excluded.value > table.value,
+    )
+    await db.exec(statement)  # type: ignore[call-overload]
+
+
+async def apply_new_records(
+    db: AsyncSession, user_id: int, records: Sequence[WorkoutRecord]
+) -> list[PersonalRecordRead]:
+    """
+    追加された記録で自己ベストを差分更新し、更新した自己ベスト (PR) を返す。
+    比較するのは追加された記録と自己ベストの行だけなので、履歴の長さに関わらずコストは一定。
+    初めて記録した種目・重量は比較対象がないため、自己ベストとして保存するが PR としては返さない。
+    日ごとの集計 (workout_daily_rollup) を反映した後に、呼び出し側のトランザクション内で実行する。
+    """
+    if not records:
+        return []
+
+    candidates = _record_bests(_sorted_records(records))
+    day_keys = {(record.exercise_id, record.exercise_date) for record in records}
+    volume_rows = (
+        await db.exec(
+            select(
+                col(WorkoutDailyRollup.exercise_id), col(WorkoutDailyRollup.date), col(WorkoutDailyRollup.volume)
+            ).where(
+                WorkoutDailyRollup.user_id == user_id,
+                tuple_(col(WorkoutDailyRollup.exercise_id), col(WorkoutDailyRollup.date)).in_(list(day_keys)),
+            )
+        )
+    ).all()
+    candidates.update(_session_volume_bests(volume_rows))
+
+    current = await _load_bests(db, user_id, candidates.keys())
+    improved = {key: best for key, best in candidates.items() if _is_better(best, current.get(key))}
+    await _upsert_bests(db, user_id, improved)
+
+    exercise_names = {record.exercise_id: record.exercise for record in records}
+    achieved = [
+        PersonalRecordRead(
+            exercise=exercise_names[exercise_id],
+            kind=kind,  # type: ignore[arg-type]
+            value=best.value,
+            weight=weight if kind == 'reps_at_weight' else None,
+            record_id=best.record_id,
+            achieved_on=best.achieved_on,
+            previous_value=current[(exercise_id, kind, weight)].value,
+        )
+        for (exercise_id, kind, weight), best in improved.items()
+        if (exercise_id, kind, weight) in current
+    ]
+    if achieved:
+        logger.info('User %s set %s personal records', user_id, len(achieved))
+    return achieved
+
+
+async def holds_personal_best(
+    db: AsyncSession, user_id: int, record_id: int, exercise_id: int, exercise_date: datetime.date
+) -> bool:
+    """記録 (または記録の日の総ボリューム) がいずれかの自己ベストになっているかどうかを返す"""
+    statement = select(PersonalBest.kind).where(
+        PersonalBest.user_id == user_id,
+        PersonalBest.exercise_id == exercise_id,
+        or_(
+            col(PersonalBest.record_id) == record_id,
+            and_(col(PersonalBest.kind) == 'session_volume', col(PersonalBest.achieved_on) == exercise_date),
+        ),
+    )
+    return (await db.exec(statement.limit(1))).first() is not None
+
+
+async def recompute(db: AsyncSession, user_id: int, exercise_ids: Iterable[int]) -> None:
+    """
+    指定された種目の自己ベストを記録と日ごとの集計から作り直す。
+    最大値は差分では減らせないため、自己ベストになっている記録が更新・削除されたときに使う。
+    走査するのはその種目の記録だけ ((user_id, exercise_id, exercise_date) インデックス)。
+    呼び出し側のトランザクション内で実行され、コミットは呼び出し側が行う。
+    """
+    unique_ids = list(set(exercise_ids))
+    if not unique_ids:
+        return
+
+    records = (
+        await db.exec(
+            # sqlmodel の select は 4 列までしか型付けされていない
+            select(  # type: ignore[call-overload]
+                WorkoutRecord.id,
+                WorkoutRecord.exercise_id,
+                WorkoutRecord.exercise_date,
+                WorkoutRecord.weight,
+                WorkoutRecord.reps,
+            )
+            .where(
+                WorkoutRecord.user_id == user_id,
+                WorkoutRecord.exercise_id.in_(unique_ids),  # type: ignore[attr-defined]
+                WorkoutRecord.deleted_at.is_(None),  # type: ignore[union-attr]
+            )
+            .order_by(WorkoutRecord.exercise_date, WorkoutRecord.id)
+        )
+    ).all()
+    bests = _record_bests(records)  # type: ignore[arg-type]
+    volume_rows = (
+        await db.exec(
+            select(col(WorkoutDailyRollup.exercise_id), col(WorkoutDailyRollup.date), col(WorkoutDailyRollup.volume))
+            .where(WorkoutDailyRollup.user_id == user_id, col(WorkoutDailyRollup.exercise_id).in_(unique_ids))
+            .order_by(col(WorkoutDailyRollup.date))
+        )
+    ).all()
+    bests.update(_session_volume_bests(volume_rows))
+
+    await db.exec(  # type: ignore[call-overload]
+        delete(PersonalBest).where(
+            col(PersonalBest.user_id) == user_id,
+            PersonalBest.exercise_id.in_(unique_ids),  # type: ignore[attr-defined]
+        )
+    )
+    if bests:
+        await db.exec(  # type: ignore[call-overload]
+            insert(PersonalBest),
+            params=[
+                {
+                    'user_id': user_id,
+                    'exercise_id': exercise_id,
+                    'kind': kind,
+                    'weight': weight,
+                    'value': best.value,
+                    'record_id': best.record_id,
+                    'achieved_on': best.achieved_on,
+                }
+                for (exercise_id, kind, weight), best in bests.items()
+            ],
+        )
+    logger.debug('Recomputed personal bests for user_id: %s, exercise_ids: %s', user_id, unique_ids)
+
+
+async def get_personal_records(
+    db: AsyncSession, user_id: int, exercise: Optional[str] = None, kind: Optional[PersonalRecordKind] = None
+) -> list[PersonalRecordRead]:
+    """ユーザーの自己ベストを種目名・種類・重量の順に返す"""
+    statement = (
+        select(Exercise.name, PersonalBest)
+        .join(Exercise, col(Exercise.id) == PersonalBest.exercise_id)
+        .where(PersonalBest.user_id == user_id)
+        .order_by(col(Exercise.name), col(PersonalBest.kind), col(PersonalBest.weight))
+    )
+    if exercise is not None:
+        exercise_id = await exercise_service.find_exercise_id(db, user_id, exercise)
+        if exercise_id is None:
+            return []
+        statement = statement.where(PersonalBest.exercise_id == exercise_id)
+    if kind is not None:
+        statement = statement.where(PersonalBest.kind == kind)
+
+    return [
+        PersonalRecordRead(
+            exercise=name,
+            kind=best.kind,  # type: ignore[arg-type]
+            value=best.value,
+            weight=best.weight if best.kind == 'reps_at_weight' else None,
+            record_id=best.record_id,
+            achieved_on=best.achieved_on,
+        )
+        for name, best in (await db.exec(statement)).all()
+    ]
@@ -1,35 +1,96 @@
 # apps/backend/src/services/record_service.py
 
+import base64
+import datetime
 import logging
-from typing import Optional
+from dataclasses import dataclass
+from typing import Literal, Optional
 
-from sqlalchemy import asc, column
-from sqlmodel import select
+from sqlalchemy import asc, desc, insert, tuple_, update
+from sqlalchemy.orm import with_expression
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlmodel import col, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.core.logger import APP_LOGGER_NAME
+from src.models.exercise import Exercise
 from src.models.record import WorkoutRecord
-from src.schemas.record import RecordCreate, RecordUpdate
+from src.schemas.record import RECORD_READ_FIELDS, PersonalRecordRead, RecordCreate, RecordReadRow, RecordUpdate
+from src.services import exercise_service, personal_record_service, record_version_service, rollup_service
 
 logger = logging.getLogger(APP_LOGGER_NAME)
 
+# 記録の種目名 (UPDATE ... RETURNING で記録と一緒に返す)
+_EXERCISE_NAME = select(Exercise.name).where(col(Exercise.id) == col(WorkoutRecord.exercise_id)).scalar_subquery()
+
+
+def select_records():
+    """
+    記録の SELECT。exercise テーブルを結合し、種目名を WorkoutRecord.exercise に読み込む。
+    セッションに読み込み済みの記録には with_expression の値が反映されないため、populate_existing で読み直す。
+    """
+    return (
+        select(WorkoutRecord)
+        .join(Exercise, col(Exercise.id) == col(WorkoutRecord.exercise_id))
+        .options(with_expression(col(WorkoutRecord.exercise), col(Exercise.name)))
+        .execution_options(populate_existing=True)
+    )
+
+
+def select_record_rows():
+    """RecordRead のフィールドと同じ順序の列の SELECT。種目名は exercise テーブルとの結合から得る。"""
+    columns = (
+        col(Exercise.name) if name == 'exercise' else getattr(WorkoutRecord, name) for name in RECORD_READ_FIELDS
+    )
+    return (
+        select(*columns)  # type: ignore[call-overload]
+        .select_from(WorkoutRecord)
+        .join(Exercise, col(Exercise.id) == col(WorkoutRecord.exercise_id))
+    )
+
+
+def _set_exercise_name(record: WorkoutRecord, name: str) -> None:
+    # 結合せずに得た記録 (INSERT / UPDATE の RETURNING など) に種目名を設定する (変更としては扱わない)
+    set_committed_value(record, 'exercise', name)
+
 
 async def create_record(db: AsyncSession, record_in: RecordCreate, user_id: int) -> WorkoutRecord:
     """
     新しいトレーニング記録を作成し、データベースに保存する。
     """
+    db_record, _ = await create_record_with_personal_records(db, record_in, user_id)
+    return db_record
+
+
+async def create_record_with_personal_records(
+    db: AsyncSession, record_in: RecordCreate, user_id: int
+) -> tuple[WorkoutRecord, list[PersonalRecordRead]]:
+    """
+    新しいトレーニング記録を作成し、(作成した記録, この記録で更新した自己ベストのリスト) を返す。
+    """
 
     logger.info('Creating new workout record for user_id: %s, exercise: %s', user_id, record_in.exercise)
     # 1. 入力スキーマ (RecordCreate) から
     #    データベースモデル (WorkoutRecord) のインスタンスを作成します。
     #    Pydantic V2 では model_validate() を使います。
-    record_data = record_in.model_dump()
-    db_record = WorkoutRecord(**record_data, user_id=user_id)
+    record_data = record_in.model_dump(exclude={'exercise'})
+    exercise_ids = await exercise_service.resolve_exercise_ids(db, user_id, [record_in.exercise])
+    changed_at = await record_version_service.bump_version(db, user_id)
+    db_record = WorkoutRecord(
+        **record_data, user_id=user_id, exercise_id=exercise_ids[record_in.exercise], updated_at=changed_at
+    )
 
     # 2. 作成したインスタンスをデータベースセッションに追加します。
     #    この時点ではまだDBには保存されていません。
     db.add(db_record)
 
+    # 日ごとの集計テーブルと自己ベストにも同じトランザクション内で反映します。
+    # 自己ベストには記録の ID を保存するため、先に flush して ID を採番します。
+    await db.flush()
+    _set_exercise_name(db_record, record_in.exercise)
+    await rollup_service.apply_added_records(db, user_id, [db_record])
+    personal_records = await personal_record_service.apply_new_records(db, user_id, [db_record])
+
     # 3. データベースにコミット (永続化) します。
     #    これにより、トランザクションが実行され、データが保存されます。
     await db.commit()
@@ -38,10 +99,72 @@ async def create_record(db: AsyncSession, record_in: RecordCreate, user_id: int)
     #    これにより、DBが自動的に採番した 'id' などの情報が
     #    db_record オブジェクトに反映されます。
     await db.refresh(db_record)
+    _set_exercise_name(db_record, record_in.exercise)
 
     logger.info('Workout record created with ID: %s for user_id: %s', db_record.id, user_id)
     # 5. 作成され、IDが採番されたレコードオブジェクトを返します。
-    return db_record
+    return db_record, personal_records
+
+
+async def create_records_bulk(db: AsyncSession, records_in: list[RecordCreate], user_id: int) -> list[WorkoutRecord]:
+    """
+    複数のトレーニング記録を 1 トランザクションでまとめて作成する。
+    行ごとの commit / refresh は行わず、複数行の INSERT ... RETURNING で
+    採番された ID を含む記録を一度に受け取る。返り値は入力と同じ順序になる。
+    """
+    records, _ = await create_records_bulk_with_personal_records(db, records_in, user_id)
+    return records
+
+
+async def create_records_bulk_with_personal_records(
+    db: AsyncSession, records_in: list[RecordCreate], user_id: int
+) -> tuple[list[WorkoutRecord], list[PersonalRecordRead]]:
+    """
+    create_records_bulk と同じく記録をまとめて作成し、
+    (作成した記録, これらの記録で更新した自己ベストのリスト) を返す。
+    """
+    if not records_in:
+        return [], []
+
+    logger.info('Creating %s workout records in bulk for user_id: %s', len(records_in), user_id)
+    exercise_ids = await exercise_service.resolve_exercise_ids(
+        db, user_id, (record_in.exercise for record_in in records_in)
+    )
+    changed_at = await record_version_service.bump_version(db, user_id)
+    rows = [
+        {
+            **record_in.model_dump(exclude={'exercise'}),
+            'user_id': user_id,
+            'exercise_id': exercise_ids[record_in.exercise],
+            'updated_at': changed_at,
+        }
+        for record_in in records_in
+    ]
+
+    # 複数のパラメータセットを渡すと SQLAlchemy が複数行の VALUES を持つ
+    # 1 つの INSERT ... RETURNING にまとめて送信する (insertmanyvalues)。
+    # RETURNING の行順も採番の順序も保証されないため、sort_by_parameter_order で
+    # 返る行を入力 (パラメータ) の順に揃える。
+    statement = insert(WorkoutRecord).returning(WorkoutRecord, sort_by_parameter_order=True)
+    result = await db.exec(statement, params=rows)  # type: ignore[call-overload]
+    records: list[WorkoutRecord] = list(result.scalars().all())
+    for record, record_in in zip(records, records_in, strict=True):
+        _set_exercise_name(record, record_in.exercise)
+    await rollup_service.apply_added_records(db, user_id, records)
+    personal_records = await personal_record_service.apply_new_records(db, user_id, records)
+    await db.commit()
+
+    logger.info('Created %s workout records in bulk for user_id: %s', len(records), user_id)
+    return records, personal_records
+
+
+def _live_record_clauses(record_id: int, user_id: int) -> tuple:
+    # 所有者の条件と、論理削除されていない条件
+    return (
+        WorkoutRecord.id == record_id,
+        WorkoutRecord.user_id == user_id,
+        WorkoutRecord.deleted_at.is_(None),  # type: ignore[union-attr]
+    )
 
 
 async def get_record(db: AsyncSession, record_id: int, user_id: int) -> Optional[WorkoutRecord]:
@@ -51,10 +174,7 @@ async def get_record(db: AsyncSession, record_id: int, user_id: int) -> Optional
     """
     logger.debug('Fetching workout record with record_id: %s for user_id: %s', record_id, user_id)
 
-    statement = select(WorkoutRecord).where(
-        WorkoutRecord.id == record_id,
-        WorkoutRecord.user_id == user_id,  # ユーザーIDの条件を追加
-    )
+    statement = select_records().where(*_live_record_clauses(record_id, user_id))
 
     result = await db.exec(statement)
     record = result.one_or_none()
@@ -71,26 +191,269 @@ async def get_record(db: AsyncSession, record_id: int, user_id: int) -> Optional
     return record
 
 
-async def get_records(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100) -> list[WorkoutRecord]:
+# 一覧の並び順 (先頭の - は降順)。exercise_date の場合は同じ日付の記録を id 順に並べる
+RecordSort = Literal['id', '-id', 'exercise_date', '-exercise_date']
+
+
+@dataclass(frozen=True)
+class RecordFilters:
+    """一覧取得の絞り込み条件 (すべて SQL の WHERE に変換される)"""
+
+    exercise: Optional[str] = None
+    date_from: Optional[datetime.date] = None  # この日付以降 (この日を含む)
+    date_to: Optional[datetime.date] = None  # この日付以前 (この日を含む)
+
+
+NO_FILTERS = RecordFilters()
+
+
+async def _where_clauses(db: AsyncSession, user_id: int, filters: RecordFilters) -> Optional[list]:
+    """
+    絞り込み条件を WHERE 句の条件のリストに変換する。
+    種目は種目ID に解決し、(user_id, exercise_id, exercise_date, id) または
+    (user_id, exercise_date, id) インデックスの範囲スキャンになるようにする。
+    存在しない種目が指定された場合は、一致する記録がないため None を返す。
+    """
+    clauses = [
+        WorkoutRecord.user_id == user_id,  # ユーザーIDでフィルタリング
+        WorkoutRecord.deleted_at.is_(None),  # type: ignore[union-attr]
+    ]
+    if filters.exercise is not None:
+        exercise_id = await exercise_service.find_exercise_id(db, user_id, filters.exercise)
+        if exercise_id is None:
+            return None
+        clauses.append(WorkoutRecord.exercise_id == exercise_id)
+    if filters.date_from is not None:
+        clauses.append(WorkoutRecord.exercise_date >= filters.date_from)
+    if filters.date_to is not None:
+        clauses.append(WorkoutRecord.exercise_date <= filters.date_to)
+    return clauses
+
+
+def _order_by(sort: RecordSort) -> tuple:
+    direction = desc if sort.startswith('-') else asc
+    if sort.lstrip('-') == 'id':
+        return (direction(col(WorkoutRecord.id)),)
+    return (direction(col(WorkoutRecord.exercise_date)), direction(col(WorkoutRecord.id)))
+
+
+async def _fetch_offset_page(
+    db: AsyncSession, statement, user_id: int, skip: int, limit: int, filters: RecordFilters, sort: RecordSort
+) -> list:
+    clauses = await _where_clauses(db, user_id, filters)
+    if clauses is None:
+        return []
+    statement = statement.where(*clauses).order_by(*_order_by(sort)).offset(skip).limit(limit)
+    result = await db.exec(statement)
+    return list(result.all())
+
+
+def to_read_rows(rows) -> list[RecordReadRow]:
+    return [dict(zip(RECORD_READ_FIELDS, row)) for row in rows]  # type: ignore[misc]
+
+
+async def get_records(
+    db: AsyncSession,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    filters: RecordFilters = NO_FILTERS,
+    sort: RecordSort = 'id',
+) -> list[WorkoutRecord]:
     """
     トレーニング記録の一覧をデータベースから取得する。
     skip と limit を使ってページネーションをサポートする。
+    filters で種目・日付の範囲を絞り込み、sort で並び順 (デフォルトは ID の昇順) を指定できる。
     """
-    logger.debug('Fetching list of workout records for user_id: %s with skip: %s, limit: %s', user_id, skip, limit)
-
-    statement = (
-        select(WorkoutRecord)
-        .where(WorkoutRecord.user_id == user_id)  # ユーザーIDでフィルタリング
-        .offset(skip)
-        .limit(limit)
-        .order_by(asc(column('id')))  # IDで昇順にソート
+    logger.debug(
+        'Fetching list of workout records for user_id: %s with skip: %s, limit: %s, filters: %s, sort: %s',
+        user_id,
+        skip,
+        limit,
+        filters,
+        sort,
     )
 
-    result = await db.exec(statement)
-    records = result.all()
+    records = await _fetch_offset_page(db, select_records(), user_id, skip, limit, filters, sort)
 
     logger.debug('Found %s records for user_id: %s.', len(records), user_id)
-    return list(records)
+    return records
+
+
+async def get_record_rows(
+    db: AsyncSession,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    filters: RecordFilters = NO_FILTERS,
+    sort: RecordSort = 'id',
+) -> list[RecordReadRow]:
+    """
+    get_records と同じ記録を RecordReadRow (辞書) のリストとして返す。
+    ORM インスタンスを組み立てずに必要な列だけを取得するため、一覧をそのまま JSON にする場合に使う。
+    """
+    logger.debug('Fetching record rows for user_id: %s with skip: %s, limit: %s', user_id, skip, limit)
+
+    rows = to_read_rows(await _fetch_offset_page(db, select_record_rows(), user_id, skip, limit, filters, sort))
+
+    logger.debug('Found %s record rows for user_id: %s.', len(rows), user_id)
+    return rows
+
+
+def encode_cursor(exercise_date: datetime.date, record_id: int) -> str:
+    """
+    (exercise_date, id) からクライアントに返す不透明なカーソル文字列を生成する。
+    """
+    raw = f'{exercise_date.isoformat()}|{record_id}'
+    return base64.urlsafe_b64encode(raw.encode('ascii')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple[datetime.date, int]:
+    """
+    encode_cursor で生成したカーソルを (exercise_date, id) に戻す。
+    形式が不正な場合は ValueError を発生させる。
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode('ascii')).decode('ascii')
+        date_part, id_part = raw.split('|')
+        return datetime.date.fromisoformat(date_part), int(id_part)
+    except (ValueError, UnicodeError) as exc:
+        raise ValueError(f'Invalid cursor: {cursor!r}') from exc
+
+
+def _after_cursor(cursor: str, sort: RecordSort):
+    """カーソルの位置より後ろ (sort の並び順で) の記録を表す条件を返す"""
+    after_date, after_id = decode_cursor(cursor)
+    descending = sort.startswith('-')
+    if sort.lstrip('-') == 'id':
+        return col(WorkoutRecord.id) < after_id if descending else col(WorkoutRecord.id) > after_id
+    key = tuple_(col(WorkoutRecord.exercise_date), col(WorkoutRecord.id))
+    return key < (after_date, after_id) if descending else key > (after_date, after_id)
+
+
+async def _fetch_cursor_page(
+    db: AsyncSession,
+    statement,
+    user_id: int,
+    cursor: Optional[str],
+    limit: int,
+    filters: RecordFilters,
+    sort: RecordSort,
+) -> tuple[list, Optional[str]]:
+    # 不正なカーソルは絞り込み条件より先に ValueError にする
+    after_cursor = _after_cursor(cursor, sort) if cursor else None
+    clauses = await _where_clauses(db, user_id, filters)
+    if clauses is None:
+        return [], None
+    statement = statement.where(*clauses)
+    if after_cursor is not None:
+        statement = statement.where(after_cursor)
+    # 次ページの有無を判定するため 1 件多く取得する
+    statement = statement.order_by(*_order_by(sort)).limit(limit + 1)
+
+    result = await db.exec(statement)
+    rows = list(result.all())
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.exercise_date, last.id)
+    return rows, next_cursor
+
+
+async def get_records_by_cursor(
+    db: AsyncSession,
+    user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    filters: RecordFilters = NO_FILTERS,
+    sort: RecordSort = 'exercise_date',
+) -> tuple[list[WorkoutRecord], Optional[str]]:
+    """
+    キーセット (カーソル) 方式でトレーニング記録の一覧を取得する。
+    デフォルトでは (exercise_date, id) の昇順で並べ、カーソルより後ろの行だけを
+    (user_id, exercise_date, id) インデックスでシークするため、何ページ目でもコストが一定になる。
+    sort を変えた場合も、カーソルは同じ sort で取得したものを渡す。
+    次のページがある場合は (記録一覧, 次ページのカーソル)、なければ (記録一覧, None) を返す。
+    """
+    logger.debug(
+        'Fetching workout records by cursor for user_id: %s with cursor: %s, limit: %s', user_id, cursor, limit
+    )
+
+    records, next_cursor = await _fetch_cursor_page(db, select_records(), user_id, cursor, limit, filters, sort)
+
+    logger.debug('Found %s records for user_id: %s (next_cursor: %s).', len(records), user_id, next_cursor)
+    return records, next_cursor
+
+
+async def get_record_rows_by_cursor(
+    db: AsyncSession,
+    user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    filters: RecordFilters = NO_FILTERS,
+    sort: RecordSort = 'exercise_date',
+) -> tuple[list[RecordReadRow], Optional[str]]:
+    """
+    get_records_by_cursor と同じ記録を RecordReadRow (辞書) のリストとして返す。
+    """
+    logger.debug('Fetching record rows by cursor for user_id: %s with cursor: %s, limit: %s', user_id, cursor, limit)
+
+    rows, next_cursor = await _fetch_cursor_page(db, select_record_rows(), user_id, cursor, limit, filters, sort)
+
+    logger.debug('Found %s record rows for user_id: %s (next_cursor: %s).', len(rows), user_id, next_cursor)
+    return to_read_rows(rows), next_cursor
+
+
+# 集計行 (workout_daily_rollup) の値に影響する列。notes だけの更新では集計を再計算しない
+_ROLLUP_COLUMNS = frozenset({'exercise_date', 'weight', 'reps', 'set_reps'})
+
+
+async def _execute_record_update(db: AsyncSession, statement, record_id: int) -> Optional[WorkoutRecord]:
+    """
+    記録 1 件の UPDATE を実行し、更新後の記録を種目名付きで返す。条件に一致しなければ None。
+    RETURNING に対応していないDBでは UPDATE の後に SELECT で結果を取得する。
+    """
+    if db.get_bind().dialect.update_returning:
+        result = await db.exec(  # type: ignore[call-overload]
+            statement.returning(WorkoutRecord, _EXERCISE_NAME).execution_options(populate_existing=True)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        db_record, exercise_name = row
+        _set_exercise_name(db_record, exercise_name)
+        return db_record
+    result = await db.exec(statement)  # type: ignore[call-overload]
+    if not result.rowcount:
+        return None
+    return (
+        await db.exec(select_records().where(WorkoutRecord.id == record_id).execution_options(populate_existing=True))
+    ).one()
+
+
+async def _refresh_personal_bests(
+    db: AsyncSession, user_id: int, db_record: WorkoutRecord, old_rollup_key: Optional[rollup_service.RollupKey]
+) -> None:
+    """
+    記録の更新を自己ベストに反映する。
+    更新前の記録 (またはその日の総ボリューム) が自己ベストだった場合は値が下がり得るため種目ごとに作り直し、
+    そうでなければ更新後の値で差分更新する。
+    """
+    if old_rollup_key is not None:
+        _, old_exercise_id, old_date = old_rollup_key
+        if await personal_record_service.holds_personal_best(
+            db,
+            user_id,
+            db_record.id,  # type: ignore[arg-type]
+            old_exercise_id,
+            old_date,
+        ):
+            await personal_record_service.recompute(db, user_id, {old_exercise_id, db_record.exercise_id})
+            return
+    await personal_record_service.apply_new_records(db, user_id, [db_record])
 
 
 async def update_record(
@@ -98,23 +461,59 @@ async def update_record(
 ) -> Optional[WorkoutRecord]:
     """
     指定されたIDのトレーニング記録を更新する。
-    記録が存在しない場合は None を返す。
-    """
-    db_record = await get_record(db=db, record_id=record_id, user_id=user_id)
-    if not db_record:
-        return None
+    記録が存在しない (または他のユーザーの記録である) 場合は None を返す。
 
+    所有者の条件を付けた 1 つの UPDATE ... RETURNING で更新と結果の取得を行うため、
+    読み込み → 書き換え → 書き込みの間に他の端末の更新が割り込むことがない。
+    RETURNING に対応していないDBでは UPDATE の後に SELECT で結果を取得する。
+    """
     # 更新データ (RecordUpdate) から、値がセットされているフィールドのみを取得
     # Pydantic V2 の model_dump() は exclude_unset=True で未設定フィールドを除外できる
     update_data = record_update.model_dump(exclude_unset=True)
+    # 種目は必須のため、null は未指定として扱う
+    exercise_name = update_data.pop('exercise', None)
+    if not update_data and exercise_name is None:
+        return await get_record(db=db, record_id=record_id, user_id=user_id)
+    affects_rollup = exercise_name is not None or bool(_ROLLUP_COLUMNS & update_data.keys())
+    # 更新前の値を読む前に変更カウンターを更新し、同じユーザーの書き込みと直列にする
+    update_data['updated_at'] = await record_version_service.bump_version(db, user_id)
+
+    old_rollup_key: Optional[rollup_service.RollupKey] = None
+    if affects_rollup:
+        # 集計行と自己ベストに影響する場合は、更新前のキーを取得しておく
+        old_key_result = await db.exec(
+            select(col(WorkoutRecord.exercise_id), col(WorkoutRecord.exercise_date)).where(
+                *_live_record_clauses(record_id, user_id)
+            )
+        )
+        old_key_row = old_key_result.one_or_none()
+        if old_key_row is None:
+            return None
+        old_exercise_id, old_exercise_date = old_key_row
+        old_rollup_key = (user_id, old_exercise_id, old_exercise_date)
+
+    if exercise_name is not None:
+        exercise_ids = await exercise_service.resolve_exercise_ids(db, user_id, [exercise_name])
+        update_data['exercise_id'] = exercise_ids[exercise_name]
 
-    # 取得したDBレコードのフィールドを、更新データで上書き
-    for key, value in update_data.items():
-        setattr(db_record, key, value)
+    statement = (
+        update(WorkoutRecord)
+        .where(*_live_record_clauses(record_id, user_id))
+        .values(**update_data)
+        .execution_options(synchronize_session=False)
+    )
+    db_record = await _execute_record_update(db, statement, record_id)
+    if db_record is None:
+        return None
 
-    db.add(db_record)  # SQLAlchemy に変更を通知
+    if affects_rollup:
+        # 更新前後の集計行を同じトランザクション内で再計算する
+        rollup_keys = [rollup_service.rollup_key(db_record)]
+        if old_rollup_key is not None:
+            rollup_keys.append(old_rollup_key)
+        await rollup_service.refresh_keys(db, rollup_keys)
+        await _refresh_personal_bests(db, user_id, db_record, old_rollup_key)
     await db.commit()
-    await db.refresh(db_record)  # DBから最新情報を再読み込み
 
     return db_record
 
@@ -123,9 +522,12 @@ async def delete_record(db: AsyncSession, record_id: int, user_id: int) -> Optio
     """
     Deletes a workout record if it exists and belongs to the specified user.
 
-    This function attempts to delete a workout record by its ID, but only if the
-    record belongs to the user making the request. This ensures users can only
-    delete their own records.
+    The record is soft-deleted: deleted_at and updated_at are set so that the
+    deletion can be delivered to offline clients through the changes feed, and
+    every other read excludes it. The ownership check and the deletion are a
+    single UPDATE ... RETURNING statement, so the deleted row is returned
+    without a preceding SELECT. Dialects without RETURNING fall back to the
+    UPDATE followed by a SELECT.
 
     Args:
         db (AsyncSession): The database session.
@@ -135,30 +537,37 @@ async def delete_record(db: AsyncSession, record_id: int, user_id: int) -> Optio
     Returns:
         Optional[WorkoutRecord]:
             - The deleted WorkoutRecord object if successful (for serialization).
-            - None if the record doesn't exist or doesn't belong to the user.
+            - None if the record doesn't exist, is already deleted or doesn't belong to the user.
 
     Raises:
         SQLAlchemyError: If there's an issue with the database operation.
     """
 
     logger.info('User %s attempting to delete record_id: %s', user_id, record_id)
-    record_object = await get_record(db=db, record_id=record_id, user_id=user_id)
-    if record_object:
-        # 所有者であるかを確認
-        if record_object.user_id != user_id:
-            logger.warning(
-                'User %s attempted to delete record_id: %s owned by user %s. Forbidden.',
-                user_id,
-                record_id,
-                record_object.user_id,
-            )
-            return None  # 他人の記録なので削除しない (Noneを返す)
-
-        # 所有者なので削除
-        await db.delete(record_object)
-        await db.commit()
-        logger.info('Record record_id: %s deleted successfully by user %s.', record_id, user_id)
-        return record_object  # 削除されたオブジェクトを返す (API層でシリアライズ用)
-
-    logger.warning('Record record_id: %s not found for deletion by user %s.', record_id, user_id)
-    return None  # 記録が見つからない
+    deleted_at = await record_version_service.bump_version(db, user_id)
+    statement = (
+        update(WorkoutRecord)
+        .where(*_live_record_clauses(record_id, user_id))
+        .values(deleted_at=deleted_at, updated_at=deleted_at)
+        .execution_options(synchronize_session=False)
+    )
+    record_object = await _execute_record_update(db, statement, record_id)
+    if record_object is None:
+        logger.warning('Record record_id: %s not found for deletion by user %s.', record_id, user_id)
+        return None  # 記録が見つからない、または他人の記録
+
+    # 削除した行はセッションから切り離し、API層でのシリアライズ用にそのまま返す
+    db.expunge(record_object)
+    await rollup_service.refresh_keys(db, [rollup_service.rollup_key(record_object)])
+    if await personal_record_service.holds_personal_best(
+        db,
+        user_id,
+        record_object.id,  # type: ignore[arg-type]
+        record_object.exercise_id,
+        record_object.exercise_date,
+    ):
+        # 自己ベストになっていた記録を削除した場合だけ、その種目の自己ベストを作り直す
+        await personal_record_service.recompute(db, user_id, [record_object.exercise_id])
+    await db.commit()
+    logger.info('Record record_id: %s deleted successfully by user %s.', record_id, user_id)
+    return record_object
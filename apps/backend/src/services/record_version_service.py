@@ -0,0 +1,76 @@
+# apps/backend/src/services/record_version_service.py
+
+import datetime
+import logging
+from typing import Optional
+
+from sqlalchemy import func, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.logger import APP_LOGGER_NAME
+from src.models.record_version import RecordVersion
+
+logger = logging.getLogger(APP_LOGGER_NAME)
+
+
+def _utcnow() -> datetime.datetime:
+    # SQLite ではタイムゾーン情報が失われるため、UTC のタイムゾーンなしの日時で統一する
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+
+async def bump_version(db: AsyncSession, user_id: int) -> datetime.datetime:
+    """
+    ユーザーの記録の変更カウンターを 1 増やし (行がなければ version 1 で作成する)、変更日時を返す。
+    記録を書き込むトランザクション内で、記録を書き込む前に呼び出し、返った日時を記録の updated_at にする。
+
+    変更日時はカウンターの行をロックしてから決め、前回の変更日時より必ず後 (少なくとも 1 マイクロ秒後) にする。
+    ロックはコミットまで保持されるため、同じユーザーの書き込みは直列になり、updated_at の順序とコミットの順序が
+    一致する (差分同期で、後からコミットされた変更を取りこぼさない)。時計が戻ったり、ワーカー間で時計がずれたり
+    しても順序は崩れない。
+    """
+    table = RecordVersion.__table__.c  # type: ignore[attr-defined]
+    if db.get_bind().dialect.name == 'postgresql':
+        # ON CONFLICT DO UPDATE の SET は行ロックの取得後に評価される。
+        # now() はトランザクションの開始時刻なので、実行時の時刻を返す clock_timestamp() を使う
+        now = text("(clock_timestamp() AT TIME ZONE 'utc')")
+        statement = postgresql.insert(RecordVersion).values(user_id=user_id, version=1, updated_at=now)
+        statement = statement.on_conflict_do_update(
+            index_elements=['user_id'],
+            set_={
+                'version': table.version + 1,
+                'updated_at': func.greatest(now, table.updated_at + datetime.timedelta(microseconds=1)),
+            },
+        )
+        return (await db.exec(statement.returning(table.updated_at))).scalar_one()  # type: ignore[call-overload]
+
+    # SQLite はマイクロ秒単位の日時の計算ができないため、カウンターを増やして書き込みロックを取得してから、
+    # 前回の変更日時をもとに新しい変更日時を決めて書き込む
+    sqlite_statement = sqlite.insert(RecordVersion).values(user_id=user_id, version=1, updated_at=_utcnow())
+    sqlite_statement = sqlite_statement.on_conflict_do_update(
+        index_elements=['user_id'], set_={'version': table.version + 1}
+    )
+    version, previous = (
+        await db.exec(sqlite_statement.returning(table.version, table.updated_at))  # type: ignore[call-overload]
+    ).one()
+    if version == 1:
+        return previous
+    changed_at = max(_utcnow(), previous + datetime.timedelta(microseconds=1))
+    statement_update = update(RecordVersion).where(col(RecordVersion.user_id) == user_id)
+    await db.exec(statement_update.values(updated_at=changed_at))  # type: ignore[call-overload]
+    return changed_at
+
+
+async def get_version(db: AsyncSession, user_id: int) -> tuple[int, Optional[datetime.datetime]]:
+    """
+    ユーザーの記録の (version, 最終更新日時) を返す。まだ記録を書き込んでいない場合は (0, None)。
+    主キーで 1 行読むだけなので、一覧を取得する前の変更確認に使える。
+    """
+    row = (
+        await db.exec(select(RecordVersion.version, RecordVersion.updated_at).where(RecordVersion.user_id == user_id))
+    ).one_or_none()
+    if row is None:
+        return 0, None
+    version, updated_at = row
+    return version, updated_at
@@ -0,0 +1,191 @@
+# apps/backend/src/services/record_write_coalescer.py
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.config import settings
+from src.core.database import async_session_local
+from src.core.logger import APP_LOGGER_NAME
+from src.core.metrics import registry
+from src.models.record import WorkoutRecord
+from src.schemas.record import PersonalRecordRead, RecordCreate
+from src.services import record_service
+
+logger = logging.getLogger(APP_LOGGER_NAME)
+
+# 待機時間とバッチの大きさの上限 (設定値が大きすぎると応答が遅れ、1 トランザクションが長くなる)
+MAX_DELAY_SECONDS = 0.05
+MAX_BATCH_SIZE = 1000
+
+CreatedRecord = tuple[WorkoutRecord, list[PersonalRecordRead]]
+
+
+@dataclass
+class _PendingBatch:
+    """ユーザーごとにまとめている書き込み待ちの記録"""
+
+    records_in: list[RecordCreate] = field(default_factory=list)
+    futures: list['asyncio.Future[CreatedRecord]'] = field(default_factory=list)
+    timer: Optional[asyncio.TimerHandle] = None
+
+
+@dataclass
+class CoalescerMetrics:
+    """書き込んだバッチ数・記録数と、失敗したバッチ数"""
+
+    batches: int = 0
+    records: int = 0
+    failed_batches: int = 0
+
+
+def _personal_records_for(
+    record: WorkoutRecord, records: list[WorkoutRecord], personal_records: list[PersonalRecordRead]
+) -> list[PersonalRecordRead]:
+    """
+    バッチ全体で更新した自己ベストのうち、record に対応するものを返す。
+    1 日の総ボリューム (record_id なし) は、その種目・日付の記録のうちバッチ内で最後のものに対応させる。
+    """
+    last_of_day = {(other.exercise, other.exercise_date): other.id for other in records}
+    return [
+        personal_record
+        for personal_record in personal_records
+        if personal_record.record_id == record.id
+        or (
+            personal_record.record_id is None
+            and last_of_day.get((personal_record.exercise, personal_record.achieved_on)) == record.id
+        )
+    ]
+
+
+class RecordWriteCoalescer:
+    """
+    同じユーザーの記録の作成を短い時間だけ待ってまとめ、1 トランザクションの複数行 INSERT で書き込む。
+
+    最初の記録から max_delay 秒経つか、max_batch 件たまった時点で書き込む。
+    書き込みは create_records_bulk_with_personal_records と同じ処理を専用のセッションで行い、
+    各呼び出し元にはそれぞれの記録 (採番された ID を含む) と、その記録で更新した自己ベストを返す。
+    同じユーザーのバッチは順番に書き込むため、ID は呼び出しの順に採番される。
+    バッチの書き込みに失敗した場合は、そのバッチのすべての呼び出し元に例外を返す。
+
+    バッチ内の記録は前後の記録と比べずにまとめて自己ベストと比較するため、
+    同じバッチで自己ベストを 2 回更新した場合に返す PR は良い方の 1 件だけになる。
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        max_delay: float,
+        max_batch: int,
+    ):
+        if not 0 < max_delay <= MAX_DELAY_SECONDS:
+            raise ValueError(f'max_delay must be in (0, {MAX_DELAY_SECONDS}] seconds')
+        if not 0 < max_batch <= MAX_BATCH_SIZE:
+            raise ValueError(f'max_batch must be in [1, {MAX_BATCH_SIZE}]')
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self.metrics = CoalescerMetrics()
+        self._session_factory = session_factory
+        self._pending: dict[int, _PendingBatch] = {}
+        # ユーザーごとの最後に開始した書き込み (次のバッチはこれの完了を待ってから書き込む)
+        self._writing: dict[int, asyncio.Task] = {}
+
+    @property
+    def pending(self) -> int:
+        """書き込み待ちの記録数"""
+        return sum(len(batch.records_in) for batch in self._pending.values())
+
+    async def create_record(self, record_in: RecordCreate, user_id: int) -> CreatedRecord:
+        """記録をバッチに加え、書き込まれたら (作成した記録, この記録で更新した自己ベストのリスト) を返す"""
+        loop = asyncio.get_running_loop()
+        batch = self._pending.get(user_id)
+        if batch is None:
+            batch = self._pending[user_id] = _PendingBatch()
+            batch.timer = loop.call_later(self.max_delay, self._flush, user_id)
+        future: asyncio.Future[CreatedRecord] = loop.create_future()
+        batch.records_in.append(record_in)
+        batch.futures.append(future)
+        if len(batch.records_in) >= self.max_batch:
+            self._flush(user_id)
+        # 呼び出し元がキャンセルされてもバッチの書き込みは続ける
+        return await asyncio.shield(future)
+
+    def _flush(self, user_id: int) -> None:
+        batch = self._pending.pop(user_id, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = asyncio.get_running_loop().create_task(self._write(user_id, batch, self._writing.get(user_id)))
+        self._writing[user_id] = task
+
+        def _forget(done: asyncio.Task) -> None:
+            if self._writing.get(user_id) is done:
+                del self._writing[user_id]
+
+        task.add_done_callback(_forget)
+
+    async def _write(self, user_id: int, batch: _PendingBatch, previous: Optional[asyncio.Task]) -> None:
+        if previous is not None:
+            await asyncio.wait({previous})
+        try:
+            async with self._session_factory() as db:
+                records, personal_records = await record_service.create_records_bulk_with_personal_records(
+                    db, batch.records_in, user_id
+                )
+            # 記録は INSERT ... RETURNING (sort_by_parameter_order=True) により入力の順で返るため、
+            # i 番目の記録が i 番目の呼び出し元のものになる。件数が合わなければ誰にも記録を返さない
+            if len(records) != len(batch.futures):
+                raise RuntimeError(f'Expected {len(batch.futures)} records from the batch write, got {len(records)}')
+        except Exception as exc:
+            self.metrics.failed_batches += 1
+            logger.exception('Failed to write %s coalesced records for user_id: %s', len(batch.records_in), user_id)
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        self.metrics.batches += 1
+        self.metrics.records += len(records)
+        logger.debug('Wrote %s coalesced records for user_id: %s', len(records), user_id)
+        for future, record in zip(batch.futures, records, strict=True):
+            if not future.done():
+                future.set_result((record, _personal_records_for(record, records, personal_records)))
+
+    async def close(self) -> None:
+        """待機中のバッチをすぐに書き込み、書き込みが終わるまで待つ"""
+        for user_id in list(self._pending):
+            self._flush(user_id)
+        if self._writing:
+            await asyncio.wait(set(self._writing.values()))
+
+
+record_write_coalescer = RecordWriteCoalescer(
+    session_factory=async_session_local,
+    max_delay=settings.RECORD_WRITE_COALESCE_DELAY_MS / 1000,
+    max_batch=settings.RECORD_WRITE_COALESCE_MAX_BATCH,
+)
+
+registry.counter(
+    'record_write_batches_total',
+    'Coalesced record write batches.',
+    callback=lambda: record_write_coalescer.metrics.batches,
+)
+registry.counter(
+    'record_write_batched_records_total',
+    'Records written through coalesced batches.',
+    callback=lambda: record_write_coalescer.metrics.records,
+)
+registry.counter(
+    'record_write_failed_batches_total',
+    'Coalesced record write batches that failed.',
+    callback=lambda: record_write_coalescer.metrics.failed_batches,
+)
+registry.gauge(
+    'record_write_pending',
+    'Records waiting in the write coalescer.',
+    callback=lambda: record_write_coalescer.pending,
+)
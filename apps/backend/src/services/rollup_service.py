@@ -0,0 +1,159 @@
+# apps/backend/src/services/rollup_service.py
+
+import datetime
+import logging
+from typing import Iterable, Mapping, Optional, Union
+
+from sqlalchemy import delete, func, insert, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.sql.elements import ColumnElement
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.logger import APP_LOGGER_NAME
+from src.models.record import WorkoutRecord
+from src.models.rollup import WorkoutDailyRollup
+from src.schemas.record import RecordBase
+from src.services.stats_service import estimate_1rm, estimate_1rm_expr
+
+logger = logging.getLogger(APP_LOGGER_NAME)
+
+# (user_id, exercise_id, date) の組で集計行を特定する
+RollupKey = tuple[int, int, datetime.date]
+
+
+def rollup_key(record: WorkoutRecord) -> RollupKey:
+    """記録が属する集計行のキーを返す"""
+    return (record.user_id, record.exercise_id, record.exercise_date)
+
+
+def _max_or_none(a: Optional[float], b: Optional[float]) -> Optional[float]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return max(a, b)
+
+
+def _greatest(dialect_name: str, a: ColumnElement, b: ColumnElement) -> ColumnElement:
+    """NULL を無視して大きい方を返す SQL 式 (PostgreSQL の GREATEST 相当)"""
+    if dialect_name == 'postgresql':
+        return func.greatest(a, b)
+    # SQLite の複数引数 max() は NULL を含むと NULL を返すため coalesce で補う
+    return func.max(func.coalesce(a, b), func.coalesce(b, a))
+
+
+async def apply_added_records(
+    db: AsyncSession,
+    user_id: int,
+    records: Iterable[Union[WorkoutRecord, RecordBase]],
+    exercise_ids: Optional[Mapping[str, int]] = None,
+) -> None:
+    """
+    ユーザーに追加された記録を集計行に差分として反映する (INSERT ... ON CONFLICT DO UPDATE)。
+    records は WorkoutRecord でも、DBに直接書き込んだ検証済みの RecordBase でもよい。
+    RecordBase の場合は種目名 -> 種目ID の辞書を exercise_ids に渡す。
+    呼び出し側のトランザクション内で実行され、コミットは呼び出し側が行う。
+    """
+    deltas: dict[RollupKey, dict] = {}
+    for record in records:
+        exercise_id = exercise_ids[record.exercise] if exercise_ids is not None else record.exercise_id  # type: ignore[union-attr]
+        key = (user_id, exercise_id, record.exercise_date)
+        delta = deltas.setdefault(key, {'volume': 0.0, 'max_weight': None, 'est_1rm': None, 'sets': 0})
+        delta['volume'] += record.weight * record.reps * record.set_reps
+        delta['max_weight'] = _max_or_none(delta['max_weight'], record.weight)
+        delta['est_1rm'] = _max_or_none(delta['est_1rm'], estimate_1rm(record.weight, record.reps))
+        delta['sets'] += record.set_reps
+    if not deltas:
+        return
+
+    rows = [
+        {'user_id': user_id, 'exercise_id': exercise_id, 'date': date, **delta}
+        for (_, exercise_id, date), delta in deltas.items()
+    ]
+    dialect_name = db.get_bind().dialect.name
+    dialect_insert = postgresql.insert if dialect_name == 'postgresql' else sqlite.insert
+    statement = dialect_insert(WorkoutDailyRollup).values(rows)
+    table = WorkoutDailyRollup.__table__.c  # type: ignore[attr-defined]
+    statement = statement.on_conflict_do_update(
+        index_elements=['user_id', 'exercise_id', 'date'],
+        set_={
+            'volume': table.volume + statement.excluded.volume,
+            'max_weight': _greatest(dialect_name, table.max_weight, statement.excluded.max_weight),
+            'est_1rm': _greatest(dialect_name, table.est_1rm, statement.excluded.est_1rm),
+            'sets': table.sets + statement.excluded.sets,
+        },
+    )
+    await db.exec(statement)  # type: ignore[call-overload]
+    logger.debug('Applied %s rollup deltas', len(rows))
+
+
+def _aggregate_select():
+    """WorkoutRecord (論理削除されたものを除く) を集計行の形に GROUP BY する SELECT を返す"""
+    return (
+        select(  # type: ignore[call-overload]
+            WorkoutRecord.user_id,
+            WorkoutRecord.exercise_id,
+            WorkoutRecord.exercise_date,
+            func.sum(WorkoutRecord.weight * WorkoutRecord.reps * WorkoutRecord.set_reps),
+            func.max(WorkoutRecord.weight),
+            func.max(estimate_1rm_expr(WorkoutRecord.weight, WorkoutRecord.reps)),  # type: ignore[arg-type]
+            func.sum(WorkoutRecord.set_reps),
+        )
+        .where(WorkoutRecord.deleted_at.is_(None))  # type: ignore[union-attr]
+        .group_by(WorkoutRecord.user_id, WorkoutRecord.exercise_id, WorkoutRecord.exercise_date)
+    )
+
+
+_ROLLUP_COLUMNS = ['user_id', 'exercise_id', 'date', 'volume', 'max_weight', 'est_1rm', 'sets']
+
+
+async def refresh_keys(db: AsyncSession, keys: Iterable[RollupKey]) -> None:
+    """
+    指定されたキーの集計行を WorkoutRecord から再計算する。
+    最大値は差分では減らせないため、記録の更新・削除時はこちらを使う。
+    再計算の対象はその日・その種目の記録だけなので、コストは小さい。
+    呼び出し側のトランザクション内で実行され、コミットは呼び出し側が行う。
+    """
+    unique_keys = list(set(keys))
+    if not unique_keys:
+        return
+
+    rollup_table = WorkoutDailyRollup.__table__  # type: ignore[attr-defined]
+    await db.exec(  # type: ignore[call-overload]
+        delete(rollup_table).where(
+            tuple_(rollup_table.c.user_id, rollup_table.c.exercise_id, rollup_table.c.date).in_(unique_keys)
+        )
+    )
+    aggregate = _aggregate_select().where(
+        tuple_(col(WorkoutRecord.user_id), col(WorkoutRecord.exercise_id), col(WorkoutRecord.exercise_date)).in_(
+            unique_keys
+        )
+    )
+    await db.exec(insert(rollup_table).from_select(_ROLLUP_COLUMNS, aggregate))  # type: ignore[call-overload]
+    logger.debug('Refreshed %s rollup rows', len(unique_keys))
+
+
+async def rebuild(db: AsyncSession, user_id: Optional[int] = None) -> int:
+    """
+    集計テーブルを WorkoutRecord から作り直す (既存データのバックフィル用)。
+    user_id を指定するとそのユーザーの分だけを作り直す。作成した集計行の数を返す。
+    """
+    logger.info('Rebuilding workout daily rollup (user_id: %s)', user_id if user_id is not None else 'all')
+    rollup_table = WorkoutDailyRollup.__table__  # type: ignore[attr-defined]
+    delete_statement = delete(rollup_table)
+    aggregate = _aggregate_select()
+    if user_id is not None:
+        delete_statement = delete_statement.where(rollup_table.c.user_id == user_id)
+        aggregate = aggregate.where(WorkoutRecord.user_id == user_id)
+
+    await db.exec(delete_statement)  # type: ignore[call-overload]
+    await db.exec(insert(rollup_table).from_select(_ROLLUP_COLUMNS, aggregate))  # type: ignore[call-overload]
+    await db.commit()
+
+    count_statement = select(func.count()).select_from(rollup_table)
+    if user_id is not None:
+        count_statement = count_statement.where(rollup_table.c.user_id == user_id)
+    row_count = (await db.exec(count_statement)).one()
+    logger.info('Rebuilt workout daily rollup with %s rows', row_count)
+    return row_count
@@ -0,0 +1,128 @@
+# apps/backend/src/services/search_service.py
+
+import logging
+import re
+
+from sqlalchemy import column, desc, table, text
+from sqlmodel import col
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.logger import APP_LOGGER_NAME
+from src.models.exercise import EXERCISE_NAME_TSVECTOR_SQL
+from src.models.record import (
+    NOTES_SEARCH_SQL,
+    NOTES_TSVECTOR_SQL,
+    SEARCH_DOCUMENT_SQL,
+    SEARCH_FTS_TABLE,
+    SEARCH_TSVECTOR_SQL,
+    WorkoutRecord,
+)
+from src.schemas.record import RecordReadRow
+from src.services.record_service import select_record_rows, to_read_rows
+
+logger = logging.getLogger(APP_LOGGER_NAME)
+
+# 検索語として扱う最大の単語数 (長すぎるクエリで検索式が肥大化しないようにする)
+MAX_SEARCH_TERMS = 8
+
+_TERM_PATTERN = re.compile(r'\w+')
+
+_fts_table = table(SEARCH_FTS_TABLE, column('rowid'))
+
+
+def search_terms(query: str) -> list[str]:
+    """検索文字列を小文字の単語のリストに分割する。記号は区切りとして扱い、検索式には含めない。"""
+    return [term.lower() for term in _TERM_PATTERN.findall(query)][:MAX_SEARCH_TERMS]
+
+
+def _escape_like(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _postgres_statement(user_id: int, query: str, terms: list[str], limit: int):
+    """
+    PostgreSQL 用の検索クエリ。種目名 + メモの文書が
+    - tsvector: すべての単語を前方一致で含む記録 ("ben" -> "Bench Press")
+    - pg_trgm: 文字列の部分一致 (単語の途中や日本語) と、綴り間違いを許すあいまい一致
+    のいずれかに一致した記録を関連度順に返す。
+    結合した文書にはインデックスを張れないため、メモのインデックスと種目名のインデックス (GIN) で
+    いずれかの単語に一致する記録に候補を絞り込んでから、文書全体の条件を評価する。
+    """
+    params = {
+        'tsquery': ' & '.join(f'{term}:*' for term in terms),
+        'any_tsquery': ' | '.join(f'{term}:*' for term in terms),
+        'pattern': f'%{_escape_like(query.strip())}%',
+        'phrase': ' '.join(terms),
+    }
+    candidates = text(
+        f"({NOTES_TSVECTOR_SQL} @@ to_tsquery('simple', :any_tsquery) "
+        f'OR {NOTES_SEARCH_SQL} ILIKE :pattern '
+        f'OR :phrase <% {NOTES_SEARCH_SQL} '
+        'OR workoutrecord.exercise_id IN (SELECT id FROM exercise '
+        f"WHERE {EXERCISE_NAME_TSVECTOR_SQL} @@ to_tsquery('simple', :any_tsquery) "
+        'OR name ILIKE :pattern OR :phrase <% name))'
+    ).bindparams(any_tsquery=params['any_tsquery'], pattern=params['pattern'], phrase=params['phrase'])
+    condition = text(
+        f"({SEARCH_TSVECTOR_SQL} @@ to_tsquery('simple', :tsquery) "
+        f'OR {SEARCH_DOCUMENT_SQL} ILIKE :pattern '
+        f'OR :phrase <% {SEARCH_DOCUMENT_SQL})'
+    ).bindparams(tsquery=params['tsquery'], pattern=params['pattern'], phrase=params['phrase'])
+    rank = text(
+        f"ts_rank({SEARCH_TSVECTOR_SQL}, to_tsquery('simple', :tsquery)) "
+        f'+ word_similarity(:phrase, {SEARCH_DOCUMENT_SQL}) DESC'
+    ).bindparams(tsquery=params['tsquery'], phrase=params['phrase'])
+    return (
+        select_record_rows()
+        .where(
+            WorkoutRecord.user_id == user_id,
+            WorkoutRecord.deleted_at.is_(None),  # type: ignore[union-attr]
+            candidates,
+            condition,
+        )
+        .order_by(rank, desc(col(WorkoutRecord.exercise_date)), desc(col(WorkoutRecord.id)))
+        .limit(limit)
+    )
+
+
+def _sqlite_statement(user_id: int, terms: list[str], limit: int):
+    """
+    SQLite 用の検索クエリ。FTS5 の仮想テーブルで、すべての単語を前方一致で含む記録を bm25 の順に返す。
+    (SQLite にはトライグラムのあいまい検索がないため、前方一致のみ)
+    """
+    match = ' '.join(f'"{term}"*' for term in terms)
+    return (
+        select_record_rows()
+        .join(_fts_table, _fts_table.c.rowid == WorkoutRecord.id)
+        .where(
+            WorkoutRecord.user_id == user_id,
+            WorkoutRecord.deleted_at.is_(None),  # type: ignore[union-attr]
+            text(f'{SEARCH_FTS_TABLE} MATCH :match').bindparams(match=match),
+        )
+        .order_by(
+            text(f'bm25({SEARCH_FTS_TABLE})'), desc(col(WorkoutRecord.exercise_date)), desc(col(WorkoutRecord.id))
+        )
+        .limit(limit)
+    )
+
+
+async def search_records(db: AsyncSession, user_id: int, query: str, limit: int = 50) -> list[RecordReadRow]:
+    """
+    種目名とメモを全文検索し、ユーザーの記録を関連度の高い順に返す。
+    検索語を含まないクエリ (記号だけなど) の場合は空のリストを返す。
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+
+    dialect_name = db.get_bind().dialect.name
+    logger.debug('Searching records for user_id: %s with terms: %s (%s)', user_id, terms, dialect_name)
+    if dialect_name == 'postgresql':
+        statement = _postgres_statement(user_id, query, terms, limit)
+    else:
+        statement = _sqlite_statement(user_id, terms, limit)
+
+    result = await db.exec(statement)
+    rows = to_read_rows(result.all())
+
+    logger.debug('Found %s records matching %r for user_id: %s.', len(rows), query, user_id)
+    return rows
@@ -0,0 +1,157 @@
+# apps/backend/src/services/stats_service.py
+
+import datetime
+import logging
+from typing import Literal, Optional
+
+from sqlalchemy import Date, case, cast, func, literal_column
+from sqlalchemy.sql.elements import ColumnElement
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.logger import APP_LOGGER_NAME
+from src.models.exercise import Exercise
+from src.models.record import WorkoutRecord
+from src.models.rollup import WorkoutDailyRollup
+from src.schemas.record import RecordStatsBucket
+from src.services import exercise_service
+
+logger = logging.getLogger(APP_LOGGER_NAME)
+
+StatsPeriod = Literal['day', 'week', 'month']
+OneRepMaxFormula = Literal['epley', 'brzycki']
+
+# Brzycki の式は 37 レップ以上では発散するため、その場合は推定しない
+BRZYCKI_MAX_REPS = 36
+
+
+def estimate_1rm(weight: float, reps: int, formula: OneRepMaxFormula = 'epley') -> Optional[float]:
+    """
+    重量とレップ数から推定 1RM を計算する。1 レップの場合は重量そのものを返す。
+    推定できない場合 (Brzycki で 37 レップ以上など) は None を返す。
+    """
+    if reps <= 0:
+        return None
+    if reps == 1:
+        return weight
+    if formula == 'brzycki':
+        if reps > BRZYCKI_MAX_REPS:
+            return None
+        return weight * 36.0 / (37 - reps)
+    return weight * (1 + reps / 30.0)
+
+
+def estimate_1rm_expr(weight: ColumnElement, reps: ColumnElement, formula: OneRepMaxFormula = 'epley') -> ColumnElement:
+    """estimate_1rm と同じ計算を行う SQL 式を返す"""
+    if formula == 'brzycki':
+        return case(
+            (reps == 1, weight),
+            (reps.between(2, BRZYCKI_MAX_REPS), weight * 36.0 / (37 - reps)),
+            else_=None,
+        )
+    return case(
+        (reps == 1, weight),
+        (reps > 1, weight * (1 + reps / 30.0)),
+        else_=None,
+    )
+
+
+def period_start_expr(column: ColumnElement, period: StatsPeriod, dialect_name: str) -> ColumnElement:
+    """
+    日付カラムを集計期間の開始日 (日: その日、週: 月曜日、月: 1日) に丸める SQL 式を返す。
+    PostgreSQL では date_trunc、SQLite では date() の修飾子を使う。
+    """
+    if period == 'day':
+        return column
+    if dialect_name == 'postgresql':
+        return cast(func.date_trunc(period, column), Date)
+    if period == 'week':
+        # 'weekday 0' で次の日曜日 (日曜日ならその日) に進め、6 日戻すと月曜日になる
+        return func.date(column, 'weekday 0', '-6 days', type_=Date)
+    return func.date(column, 'start of month', type_=Date)
+
+
+async def get_record_stats(
+    db: AsyncSession,
+    user_id: int,
+    period: StatsPeriod = 'week',
+    exercise: Optional[str] = None,
+    date_from: Optional[datetime.date] = None,
+    date_to: Optional[datetime.date] = None,
+    formula: OneRepMaxFormula = 'epley',
+) -> list[RecordStatsBucket]:
+    """
+    ユーザーのトレーニング記録を種目・期間ごとに SQL の GROUP BY で集計する。
+    総ボリューム、最大重量、推定 1RM の最大値、セット数を期間の古い順に返す。
+
+    Epley の場合は日ごとの集計テーブル (workout_daily_rollup) を集計するため、
+    読み取る行数はセット数ではなく日数に比例する。集計テーブルは Epley の推定値だけを
+    保持しているので、Brzycki の場合は WorkoutRecord を直接集計する。
+    """
+    logger.debug(
+        'Aggregating workout stats for user_id: %s (period: %s, exercise: %s, from: %s, to: %s, formula: %s)',
+        user_id,
+        period,
+        exercise,
+        date_from,
+        date_to,
+        formula,
+    )
+    dialect_name = db.get_bind().dialect.name
+
+    if formula == 'epley':
+        exercise_id_column = WorkoutDailyRollup.exercise_id
+        date_column = WorkoutDailyRollup.date
+        user_column = WorkoutDailyRollup.user_id
+        aggregates = (
+            func.sum(WorkoutDailyRollup.volume).label('total_volume'),
+            func.max(WorkoutDailyRollup.max_weight).label('top_set_weight'),
+            func.max(WorkoutDailyRollup.est_1rm).label('estimated_1rm'),
+            func.sum(WorkoutDailyRollup.sets).label('set_count'),
+        )
+    else:
+        exercise_id_column = WorkoutRecord.exercise_id
+        date_column = WorkoutRecord.exercise_date
+        user_column = WorkoutRecord.user_id
+        aggregates = (
+            func.sum(WorkoutRecord.weight * WorkoutRecord.reps * WorkoutRecord.set_reps).label('total_volume'),
+            func.max(WorkoutRecord.weight).label('top_set_weight'),
+            func.max(estimate_1rm_expr(WorkoutRecord.weight, WorkoutRecord.reps, formula)).label('estimated_1rm'),  # type: ignore[arg-type]
+            func.sum(WorkoutRecord.set_reps).label('set_count'),
+        )
+    period_start = period_start_expr(date_column, period, dialect_name).label('period_start')  # type: ignore[arg-type]
+
+    # 種目は整数の ID で絞り込み・GROUP BY し、種目名は種目テーブルとの結合で取得する
+    statement = (
+        select(Exercise.name.label('exercise'), period_start, *aggregates)  # type: ignore[call-overload, attr-defined]
+        .join(Exercise, Exercise.id == exercise_id_column)
+        .where(user_column == user_id)
+        .group_by(exercise_id_column, Exercise.name, literal_column('period_start'))
+        .order_by(Exercise.name, literal_column('period_start'))
+    )
+    if formula != 'epley':
+        statement = statement.where(WorkoutRecord.deleted_at.is_(None))  # type: ignore[union-attr]
+    if exercise is not None:
+        exercise_id = await exercise_service.find_exercise_id(db, user_id, exercise)
+        if exercise_id is None:
+            return []
+        statement = statement.where(exercise_id_column == exercise_id)
+    if date_from is not None:
+        statement = statement.where(date_column >= date_from)
+    if date_to is not None:
+        statement = statement.where(date_column <= date_to)
+
+    result = await db.exec(statement)
+    buckets = [
+        RecordStatsBucket(
+            exercise=row.exercise,
+            period_start=row.period_start,
+            total_volume=row.total_volume or 0.0,
+            top_set_weight=row.top_set_weight or 0.0,
+            estimated_1rm=row.estimated_1rm or 0.0,
+            set_count=row.set_count or 0,
+        )
+        for row in result.all()
+    ]
+    logger.debug('Aggregated %s stats buckets for user_id: %s', len(buckets), user_id)
+    return buckets
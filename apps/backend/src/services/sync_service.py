@@ -0,0 +1,82 @@
+# apps/backend/src/services/sync_service.py
+
+import base64
+import datetime
+import logging
+from typing import Optional
+
+from sqlalchemy import tuple_
+from sqlmodel import col
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.logger import APP_LOGGER_NAME
+from src.models.record import WorkoutRecord
+from src.schemas.record import RecordChanges, RecordRead, RecordTombstone
+from src.services import record_service
+
+logger = logging.getLogger(APP_LOGGER_NAME)
+
+
+def encode_sync_token(updated_at: datetime.datetime, record_id: int) -> str:
+    """
+    最後に返した変更の (updated_at, id) からクライアントに返す不透明な同期トークンを生成する。
+    """
+    raw = f'{updated_at.isoformat()}|{record_id}'
+    return base64.urlsafe_b64encode(raw.encode('ascii')).decode('ascii').rstrip('=')
+
+
+def decode_sync_token(token: str) -> tuple[datetime.datetime, int]:
+    """
+    encode_sync_token で生成したトークンを (updated_at, id) に戻す。
+    形式が不正な場合は ValueError を発生させる。
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode('ascii')).decode('ascii')
+        updated_at_part, id_part = raw.split('|')
+        return datetime.datetime.fromisoformat(updated_at_part), int(id_part)
+    except (ValueError, UnicodeError) as exc:
+        raise ValueError(f'Invalid sync token: {token!r}') from exc
+
+
+async def get_changes(db: AsyncSession, user_id: int, since: Optional[str] = None, limit: int = 500) -> RecordChanges:
+    """
+    同期トークン since 以降に作成・更新・削除された記録を (updated_at, id) 順に最大 limit 件返す。
+    (user_id, updated_at, id) インデックスをトークンの位置からシークするため、
+    コストは履歴の長さではなく変更の件数で決まる。
+    since を省略した場合は最初の同期とみなし、全件を返す (削除済みの記録は deleted に含めないが、
+    next_since はそれらも含めた最後の行の位置になる)。
+    続きがある場合は has_more が True になり、next_since を since に渡して続きを取得する。
+    updated_at は変更カウンターの行ロックを取得してから付けるため、後からコミットされた変更が
+    トークンより前に並ぶことはない (record_version_service.bump_version を参照)。
+    """
+    statement = record_service.select_records().where(WorkoutRecord.user_id == user_id)
+    if since is not None:
+        after_updated_at, after_id = decode_sync_token(since)
+        statement = statement.where(
+            tuple_(col(WorkoutRecord.updated_at), col(WorkoutRecord.id)) > (after_updated_at, after_id)
+        )
+    # 続きの有無を判定するため 1 件多く取得する
+    statement = statement.order_by(col(WorkoutRecord.updated_at), col(WorkoutRecord.id)).limit(limit + 1)
+    rows = list((await db.exec(statement)).all())
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    changes = RecordChanges(
+        records=[RecordRead.model_validate(row) for row in rows if row.deleted_at is None],
+        deleted=[
+            RecordTombstone(id=row.id, deleted_at=row.deleted_at)  # type: ignore[arg-type]
+            for row in rows
+            if row.deleted_at is not None and since is not None
+        ],
+        next_since=encode_sync_token(rows[-1].updated_at, rows[-1].id) if rows else since,  # type: ignore[arg-type]
+        has_more=has_more,
+    )
+    logger.debug(
+        'Found %s changed and %s deleted records for user_id: %s (has_more: %s)',
+        len(changes.records),
+        len(changes.deleted),
+        user_id,
+        has_more,
+    )
+    return changes
@@ -0,0 +1,204 @@
+# apps/backend/src/services/token_service.py
+
+import datetime
+import hashlib
+import logging
+import secrets
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import delete, event, update
+from sqlalchemy.orm import Session
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.cache_backend import Cache, cache_backend
+from src.core.config import settings
+from src.core.logger import APP_LOGGER_NAME
+from src.core.metrics import registry
+from src.models.refresh_token import RefreshToken
+from src.models.user import User
+
+logger = logging.getLogger(APP_LOGGER_NAME)
+
+
+class RefreshTokenError(Exception):
+    """リフレッシュトークンが存在しない、期限切れ、または使用済みの場合の例外"""
+
+
+@dataclass(frozen=True)
+class _IssuedRefreshToken:
+    """キャッシュに保持する未使用のリフレッシュトークンの情報"""
+
+    id: int
+    user_id: int
+    family_id: str
+    expires_at: datetime.datetime
+
+
+# トークンのダイジェスト -> 発行済みで未使用のリフレッシュトークン
+# ヒットした場合はトークンを探す SELECT を省き、主キーを指定した UPDATE だけで使用済みにできる。
+# 使用済みかどうかは常に UPDATE の条件 (revoked_at IS NULL) で判定するため、キャッシュが古くても安全。
+refresh_token_cache: Cache[_IssuedRefreshToken] = cache_backend.namespace(
+    'refresh_token',
+    _IssuedRefreshToken,
+    max_size=settings.REFRESH_TOKEN_CACHE_MAX_SIZE,
+    ttl=settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60,
+)
+
+registry.counter(
+    'refresh_token_cache_hits_total', 'Refresh token cache hits.', callback=lambda: refresh_token_cache.hits
+)
+registry.counter(
+    'refresh_token_cache_misses_total', 'Refresh token cache misses.', callback=lambda: refresh_token_cache.misses
+)
+
+
+# トランザクション内で発行したトークンは、コミットされるまでキャッシュに入れずに Session.info に保持する。
+# ロールバックされた場合に、DBに存在しないトークンがキャッシュに残らないようにするため
+_PENDING_KEY = 'pending_refresh_tokens'
+
+
+@event.listens_for(Session, 'after_commit')
+def _cache_committed_refresh_tokens(session: Session) -> None:
+    for token_hash, (issued, ttl) in session.info.pop(_PENDING_KEY, {}).items():
+        refresh_token_cache.set_nowait(token_hash, issued, ttl=ttl)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending_refresh_tokens(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _utcnow() -> datetime.datetime:
+    # SQLite ではタイムゾーン情報が失われるため、UTC のタイムゾーンなしの日時で統一する
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+
+def hash_refresh_token(token: str) -> str:
+    """リフレッシュトークンを保存・検索するためのダイジェストを返す"""
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+async def _add_refresh_token(db: AsyncSession, user_id: int, family_id: str) -> str:
+    """新しいリフレッシュトークンを追加し、コミットされたらキャッシュに入れる。コミットは呼び出し側が行う。"""
+    token = secrets.token_urlsafe(32)
+    token_hash = hash_refresh_token(token)
+    now = _utcnow()
+    lifetime = datetime.timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    db_token = RefreshToken(
+        token_hash=token_hash, user_id=user_id, family_id=family_id, created_at=now, expires_at=now + lifetime
+    )
+    db.add(db_token)
+    await db.flush()
+
+    issued = _IssuedRefreshToken(
+        id=db_token.id,  # type: ignore[arg-type]
+        user_id=user_id,
+        family_id=family_id,
+        expires_at=db_token.expires_at,
+    )
+    db.sync_session.info.setdefault(_PENDING_KEY, {})[token_hash] = (issued, lifetime.total_seconds())
+    return token
+
+
+async def issue_refresh_token(db: AsyncSession, user_id: int) -> str:
+    """
+    ログイン時に新しいリフレッシュトークン (新しい family) を発行する。
+    返すトークンはDBに保存されず、ダイジェストだけが保存される。
+    """
+    token = await _add_refresh_token(db, user_id=user_id, family_id=uuid.uuid4().hex)
+    await db.commit()
+    logger.info('Issued refresh token for user_id: %s', user_id)
+    return token
+
+
+async def _revoke_family(db: AsyncSession, family_id: str, now: datetime.datetime) -> None:
+    await db.exec(  # type: ignore[call-overload]
+        update(RefreshToken)
+        .where(col(RefreshToken.family_id) == family_id, col(RefreshToken.revoked_at).is_(None))
+        .values(revoked_at=now)
+    )
+
+
+async def purge_expired_refresh_tokens(
+    db: AsyncSession, now: Optional[datetime.datetime] = None, family_id: Optional[str] = None
+) -> int:
+    """
+    期限切れのリフレッシュトークンを削除し、削除した行数を返す。family_id を指定するとその family だけを削除する。
+    使用済み (revoked_at あり) でも期限内のトークンは再利用の検出に使うため、期限が切れるまで残す。
+    コミットは呼び出し側が行う。
+    """
+    statement = delete(RefreshToken).where(col(RefreshToken.expires_at) <= (now or _utcnow()))
+    if family_id is not None:
+        statement = statement.where(col(RefreshToken.family_id) == family_id)
+    result = await db.exec(statement)  # type: ignore[call-overload]
+    return result.rowcount
+
+
+async def rotate_refresh_token(db: AsyncSession, token: str) -> tuple[User, str]:
+    """
+    リフレッシュトークンを使用済みにし、同じ family の新しいリフレッシュトークンを発行する。
+    (ユーザー, 新しいリフレッシュトークン) を返す。
+
+    キャッシュにヒットした場合、トークンの無効化は主キーを指定した 1 つの UPDATE で済む。
+    ローテーションに成功した場合は、同じ family の期限切れのトークンを削除する。
+    使用済みのトークンが再び使われた場合は漏洩とみなし、同じ family のトークンをすべて無効にする。
+    トークンが無効な場合やユーザーが無効化されている場合は RefreshTokenError を発生させる。
+    """
+    token_hash = hash_refresh_token(token)
+    now = _utcnow()
+
+    issued: Optional[_IssuedRefreshToken] = await refresh_token_cache.get(token_hash)
+    # 成否に関わらず、一度提示されたトークンはキャッシュから外す
+    await refresh_token_cache.delete(token_hash)
+    already_revoked = False
+    if issued is None:
+        db_token = (await db.exec(select(RefreshToken).where(RefreshToken.token_hash == token_hash))).one_or_none()
+        if db_token is None:
+            logger.warning('Refresh failed: unknown refresh token.')
+            raise RefreshTokenError('Invalid refresh token')
+        issued = _IssuedRefreshToken(
+            id=db_token.id,  # type: ignore[arg-type]
+            user_id=db_token.user_id,
+            family_id=db_token.family_id,
+            expires_at=db_token.expires_at,
+        )
+        already_revoked = db_token.revoked_at is not None
+
+    if not already_revoked:
+        # revoked_at IS NULL の条件で、同じトークンが同時に使われても 1 回しか成功しないようにする
+        result = await db.exec(  # type: ignore[call-overload]
+            update(RefreshToken)
+            .where(col(RefreshToken.id) == issued.id, col(RefreshToken.revoked_at).is_(None))
+            .values(revoked_at=now)
+        )
+        already_revoked = result.rowcount == 0
+
+    if already_revoked:
+        logger.warning(
+            'Refresh token reuse detected for user_id: %s. Revoking token family %s.', issued.user_id, issued.family_id
+        )
+        await _revoke_family(db, issued.family_id, now)
+        await db.commit()
+        raise RefreshTokenError('Refresh token has already been used')
+
+    if issued.expires_at <= now:
+        await db.commit()
+        logger.warning('Refresh failed: refresh token expired for user_id: %s.', issued.user_id)
+        raise RefreshTokenError('Refresh token has expired')
+
+    user = await db.get(User, issued.user_id)
+    if user is None or not user.is_active:
+        await _revoke_family(db, issued.family_id, now)
+        await db.commit()
+        logger.warning('Refresh failed: user_id %s is missing or inactive.', issued.user_id)
+        raise RefreshTokenError('Inactive user')
+
+    # ローテーションのたびに使用済みのトークンが増えるため、同じ family の期限切れのトークンを削除する
+    await purge_expired_refresh_tokens(db, now=now, family_id=issued.family_id)
+    new_token = await _add_refresh_token(db, user_id=issued.user_id, family_id=issued.family_id)
+    await db.commit()
+    logger.info('Rotated refresh token for user_id: %s', issued.user_id)
+    return user, new_token
@@ -3,16 +3,34 @@
 import logging
 from typing import Optional
 
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.orm.attributes import get_history
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from src.core.cache_backend import Cache, cache_backend
+from src.core.config import settings
 from src.core.logger import APP_LOGGER_NAME
-from src.core.security import hash_password, verify_password
+from src.core.metrics import registry
+from src.core.security import hash_password_async, verify_password_async
 from src.models.user import User
-from src.schemas.user import UserCreate
+from src.schemas.user import CurrentUser, UserCreate
 
 logger = logging.getLogger(APP_LOGGER_NAME)
 
+# トークンの subject (メールアドレス) -> 認証済みユーザーのスナップショット
+# 認証が必要なリクエストごとに発生するユーザー検索のクエリを省くために使う
+user_cache: Cache[CurrentUser] = cache_backend.namespace(
+    'user', CurrentUser, max_size=settings.USER_CACHE_MAX_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS
+)
+
+registry.counter('user_cache_hits_total', 'Authenticated user cache hits.', callback=lambda: user_cache.hits)
+registry.counter('user_cache_misses_total', 'Authenticated user cache misses.', callback=lambda: user_cache.misses)
+registry.gauge(
+    'user_cache_entries', 'Entries currently held in the authenticated user cache.', callback=lambda: len(user_cache)
+)
+
 
 async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
     """メールアドレスでユーザーを検索する"""
@@ -21,6 +39,77 @@ async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
     return result.one_or_none()
 
 
+async def get_current_user_snapshot(db: AsyncSession, email: str) -> Optional[CurrentUser]:
+    """
+    メールアドレスに対応するユーザーのスナップショットを返す。
+    キャッシュにあればDBを参照せずに返し、なければDBから取得してキャッシュする。
+    ユーザーが存在しない場合は None を返す (存在しない結果はキャッシュしない)。
+    """
+    cached_user = await user_cache.get(email)
+    if cached_user is not None:
+        logger.debug('User cache hit for email: %s', email)
+        return cached_user
+
+    logger.debug('User cache miss for email: %s', email)
+    user = await get_user_by_email(db, email=email)
+    if user is None:
+        return None
+    snapshot = CurrentUser.model_validate(user)
+    await user_cache.set(email, snapshot)
+    return snapshot
+
+
+# 更新・削除されたユーザーのメールアドレスは、コミットされるまで Session.info に保持して
+# コミット後にキャッシュから削除する。フラッシュの時点で削除すると、コミットまでの間に
+# 他のリクエストが変更前のユーザーを読み直してキャッシュに戻してしまうため
+_PENDING_KEY = 'pending_invalidated_user_emails'
+
+
+def invalidate_cached_user(email: str) -> None:
+    """
+    指定されたメールアドレスのユーザーをキャッシュから削除する。
+    イベントフック (同期処理) から呼ばれるため、共有キャッシュからの削除は待たない。
+    """
+    user_cache.delete_nowait(email)
+
+
+def _defer_invalidation(target: User, *emails: Optional[str]) -> None:
+    session = object_session(target)
+    if session is None:
+        for email in emails:
+            if email:
+                invalidate_cached_user(email)
+        return
+    session.info.setdefault(_PENDING_KEY, set()).update(email for email in emails if email)
+
+
+@event.listens_for(User, 'after_update')
+def _invalidate_cached_user_on_update(mapper, connection, target: User) -> None:
+    """
+    ORM 経由でユーザーが更新されたとき (無効化・権限変更・メールアドレス変更など) に
+    コミット後のキャッシュの無効化を予約する。メールアドレスが変更された場合は変更前のキーも削除する。
+    """
+    email_history = get_history(target, 'email')
+    _defer_invalidation(target, *email_history.deleted, target.email)
+
+
+@event.listens_for(User, 'after_delete')
+def _invalidate_cached_user_on_delete(mapper, connection, target: User) -> None:
+    """ORM 経由でユーザーが削除されたときに、コミット後のキャッシュの無効化を予約する"""
+    _defer_invalidation(target, target.email)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_committed_users(session: Session) -> None:
+    for email in session.info.pop(_PENDING_KEY, set()):
+        invalidate_cached_user(email)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
 async def get_user_by_username(db: AsyncSession, username: str) -> Optional[User]:
     """ユーザー名でユーザーを検索する"""
     if not username:  # usernameがNoneまたは空文字列の場合
@@ -51,7 +140,7 @@ async def create_user(db: AsyncSession, user_in: UserCreate) -> Optional[User]:
             logger.warning('Username %s already registered.', user_in.username)
             return None
 
-    hashed_password_str = hash_password(user_in.password)
+    hashed_password_str = await hash_password_async(user_in.password)
 
     # SQLModelインスタンスを作成
     # UserCreate スキーマには hashed_password がないので、個別に設定
@@ -83,8 +172,9 @@ async def authenticate_user(db: AsyncSession, email: str, password: str) -> Opti
         logger.info('Authentication failed: User %s is inactive.', email)
         return None  # 非アクティブなユーザーは認証失敗
 
-    # 3. パスワードを検証 (core.security の verify_password を使用)
-    if not verify_password(password, user.hashed_password):
+    # 3. パスワードを検証 (core.security の verify_password_async を使用)
+    #    bcrypt の計算はワーカープールで行われ、イベントループをブロックしない
+    if not await verify_password_async(password, user.hashed_password):
         logger.info('Authentication failed: Invalid password for user %s', email)
         return None
 
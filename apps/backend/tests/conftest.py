@@ -5,12 +5,15 @@ import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.exc import OperationalError, ProgrammingError
-from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from src.core.database import get_session
+from src.core import security
+from src.core.config import settings
+from src.core.database import create_engine, create_session_maker, get_session, unit_test_profile
 from src.main import create_app
+from src.services import exercise_service, token_service, user_service
 
 # テスト用DB URLを確定 (SQLiteを強制使用)
 TEST_DATABASE_URL = 'sqlite+aiosqlite:///./test.db'
@@ -35,7 +38,7 @@ async def test_engine(event_loop) -> AsyncGenerator[AsyncEngine, None]:
     # event_loop フィクスチャがこのスコープで asyncio.set_event_loop() を
     # 呼び出していることを pytest-asyncio が期待します。
     # create_async_engine は現在のループを使用します。
-    engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+    engine = create_engine(TEST_DATABASE_URL, unit_test_profile(settings))
     yield engine
     await engine.dispose()
 
@@ -58,6 +61,12 @@ async def setup_tables(test_engine: AsyncEngine):
     async with test_engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
 
+    # テーブルを作り直すとユーザーIDやトークンのIDが再利用されるため、プロセス内のキャッシュも空にする
+    user_service.user_cache.clear()
+    security.token_cache.clear()
+    token_service.refresh_token_cache.clear()
+    exercise_service.exercise_id_cache.clear()
+
     yield
 
 
@@ -66,7 +75,7 @@ async def db_session(test_engine: AsyncEngine) -> AsyncGenerator[AsyncSession, N
     """
     各テスト用の非同期DBセッションを提供するフィクスチャ。
     """
-    session_maker = async_sessionmaker(bind=test_engine, class_=AsyncSession, expire_on_commit=False)
+    session_maker = create_session_maker(test_engine)
     async with session_maker() as session:
         yield session
 
@@ -0,0 +1,62 @@
+from src.core.cache import TTLCache
+
+
+class FakeTimer:
+    """テスト用に手動で進められる時計"""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_cache_get_set_and_counters():
+    """値の保存・取得ができ、ヒット/ミスが数えられることをテストする"""
+    cache: TTLCache[str, int] = TTLCache(max_size=10, ttl=60)
+
+    assert cache.get('a') is None
+    cache.set('a', 1)
+    assert cache.get('a') == 1
+
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'size': 1}
+
+
+def test_ttl_cache_expires_entries():
+    """有効期限を過ぎたエントリは返されず、削除されることをテストする"""
+    timer = FakeTimer()
+    cache: TTLCache[str, int] = TTLCache(max_size=10, ttl=30, timer=timer)
+    cache.set('a', 1)
+    cache.set('b', 2, ttl=120)
+
+    timer.now = 31
+    assert cache.get('a') is None
+    assert cache.get('b') == 2
+    assert len(cache) == 1
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """max_size を超えると最も長く参照されていないエントリが追い出されることをテストする"""
+    cache: TTLCache[str, int] = TTLCache(max_size=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')  # a を最近使ったことにする
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+
+
+def test_ttl_cache_delete_and_clear():
+    """delete / clear でエントリが削除されることをテストする"""
+    cache: TTLCache[str, int] = TTLCache(max_size=10, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+
+    cache.delete('a')
+    cache.delete('missing')
+    assert cache.get('a') is None
+
+    cache.clear()
+    assert len(cache) == 0
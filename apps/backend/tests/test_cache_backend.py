@@ -0,0 +1,163 @@
+import asyncio
+import datetime
+from dataclasses import dataclass
+
+import pytest
+
+from src.core.cache_backend import MemoryCacheBackend, RedisCacheBackend
+from src.schemas.user import CurrentUser
+
+pytestmark = pytest.mark.asyncio
+
+
+@dataclass(frozen=True)
+class _Token:
+    id: int
+    expires_at: datetime.datetime
+
+
+def _snapshot(user_id: int = 1) -> CurrentUser:
+    return CurrentUser(
+        id=user_id, email=f'user{user_id}@example.com', username=None, is_active=True, is_superuser=False
+    )
+
+
+async def _wait_for(predicate, timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, 'condition was not met in time'
+        await asyncio.sleep(0.01)
+
+
+async def test_memory_cache_get_set_delete():
+    """メモリのバックエンドは値をそのまま保持し、get_many・delete・統計に対応する"""
+    cache = MemoryCacheBackend().namespace('user', CurrentUser, max_size=2, ttl=60)
+    snapshot = _snapshot()
+
+    assert await cache.get('a') is None
+    await cache.set('a', snapshot)
+    assert await cache.get('a') is snapshot
+    await cache.set('b', _snapshot(2))
+    assert await cache.get_many(['a', 'b', 'missing']) == {'a': snapshot, 'b': _snapshot(2)}
+
+    await cache.delete('a', 'b')
+    assert await cache.get_many(['a', 'b']) == {}
+    assert cache.stats() == {'hits': 3, 'misses': 4, 'size': 0}
+
+
+async def test_memory_cache_evicts_and_expires():
+    cache = MemoryCacheBackend().namespace('numbers', int, max_size=2, ttl=60)
+    cache.set_nowait('1', 1)
+    cache.set_nowait('2', 2)
+    cache.set_nowait('3', 3)
+    assert len(cache) == 2
+    assert await cache.get('1') is None
+
+    await cache.set('short', 4, ttl=0)
+    assert await cache.get('short') is None
+
+
+async def test_namespace_names_are_unique():
+    backend = MemoryCacheBackend()
+    backend.namespace('user', CurrentUser, max_size=1, ttl=1)
+    with pytest.raises(ValueError):
+        backend.namespace('user', CurrentUser, max_size=1, ttl=1)
+
+
+@pytest.fixture
+def redis_server():
+    fakeredis = pytest.importorskip('fakeredis')
+    return fakeredis.FakeServer()
+
+
+def _redis_backend(server, local_ttl: float = 60.0) -> RedisCacheBackend:
+    import fakeredis
+
+    return RedisCacheBackend(client=fakeredis.FakeAsyncRedis(server=server), key_prefix='test', local_ttl=local_ttl)
+
+
+async def test_redis_cache_round_trips_values(redis_server):
+    """Redis のバックエンドは値を JSON で保存し、名前空間とバージョン付きのキーで TTL を設定する"""
+    backend = _redis_backend(redis_server)
+    users = backend.namespace('user', CurrentUser, max_size=10, ttl=60)
+    tokens = backend.namespace('token', _Token, max_size=10, ttl=60)
+    token = _Token(id=1, expires_at=datetime.datetime(2030, 1, 1, 12, 0))
+    try:
+        await users.set('a', _snapshot())
+        await tokens.set('a', token, ttl=30)
+        users.clear()
+        tokens.clear()
+
+        assert await users.get('a') == _snapshot()
+        assert await tokens.get_many(['a', 'missing']) == {'a': token}
+        assert 0 < await backend.client.pttl('test:token:v1:a') <= 30_000
+        assert await backend.client.exists('test:user:v1:a')
+        assert users.stats() == {'hits': 1, 'misses': 0, 'size': 1}
+    finally:
+        await backend.close()
+
+
+async def test_redis_cache_is_shared_and_invalidated_between_workers(redis_server):
+    """あるワーカーの書き込みは他のワーカーから読め、削除は pub/sub で他のワーカーの手元のコピーも消す"""
+    first, second = _redis_backend(redis_server), _redis_backend(redis_server)
+    first_users = first.namespace('user', CurrentUser, max_size=10, ttl=60)
+    second_users = second.namespace('user', CurrentUser, max_size=10, ttl=60)
+    await first.start()
+    await second.start()
+    try:
+        await first_users.set('a', _snapshot())
+        assert await second_users.get('a') == _snapshot()
+        assert len(second_users) == 1
+
+        first_users.delete_nowait('a')
+        assert len(first_users) == 0
+        await _wait_for(lambda: len(second_users) == 0)
+        assert await second_users.get('a') is None
+    finally:
+        await first.close()
+        await second.close()
+
+
+async def test_undecodable_values_are_treated_as_misses(redis_server):
+    """壊れた値や形式の異なる値はミスとして扱い、共有キャッシュから削除する"""
+    backend = _redis_backend(redis_server)
+    users = backend.namespace('user', CurrentUser, max_size=10, ttl=60)
+    try:
+        await users.set('a', _snapshot())
+        await backend.client.set('test:user:v1:b', b'{"id": "not a number"}')
+        await backend.client.set('test:user:v1:c', b'not json')
+        users.clear()
+
+        assert await users.get_many(['a', 'b', 'c']) == {'a': _snapshot()}
+        assert not await backend.client.exists('test:user:v1:b', 'test:user:v1:c')
+        assert users.stats() == {'hits': 1, 'misses': 2, 'size': 1}
+    finally:
+        await backend.close()
+
+
+async def test_namespace_version_is_part_of_the_key(redis_server):
+    """バージョンの異なる名前空間は、同じキーでも互いの値を読まない"""
+    old, new = _redis_backend(redis_server), _redis_backend(redis_server)
+    old_users = old.namespace('user', CurrentUser, max_size=10, ttl=60)
+    new_users = new.namespace('user', CurrentUser, max_size=10, ttl=60, version=2)
+    try:
+        await old_users.set('a', _snapshot())
+        assert await new_users.get('a') is None
+        assert await new.client.exists('test:user:v1:a')
+    finally:
+        await old.close()
+        await new.close()
+
+
+async def test_redis_errors_are_treated_as_misses(redis_server):
+    backend = _redis_backend(redis_server)
+    numbers = backend.namespace('numbers', int, max_size=10, ttl=60)
+    redis_server.connected = False
+    try:
+        await numbers.set('a', 1)
+        numbers.clear()
+        assert await numbers.get('a') is None
+        await numbers.delete('a')
+    finally:
+        redis_server.connected = True
+        await backend.close()
@@ -0,0 +1,109 @@
+import datetime
+
+import pytest
+from sqlalchemy import update
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.models.exercise import Exercise
+from src.schemas.record import RecordCreate, RecordUpdate
+from src.services import exercise_service, record_service, search_service
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_records_share_exercise_ids(db_session: AsyncSession):
+    """
+    同じユーザーの同じ種目名の記録は同じ種目ID を参照し、他のユーザーとは別の種目になることをテストする。
+    """
+    day = datetime.date(2025, 7, 1)
+    first = await record_service.create_record(
+        db=db_session,
+        record_in=RecordCreate(exercise_date=day, exercise='Squat', weight=100, reps=5, set_reps=3),
+        user_id=401,
+    )
+    bulk = await record_service.create_records_bulk(
+        db_session,
+        [
+            RecordCreate(exercise_date=day, exercise='Squat', weight=110, reps=3, set_reps=3),
+            RecordCreate(exercise_date=day, exercise='Bench Press', weight=80, reps=5, set_reps=3),
+        ],
+        user_id=401,
+    )
+    other = await record_service.create_record(
+        db=db_session,
+        record_in=RecordCreate(exercise_date=day, exercise='Squat', weight=60, reps=5, set_reps=3),
+        user_id=402,
+    )
+
+    assert bulk[0].exercise_id == first.exercise_id
+    assert bulk[1].exercise_id != first.exercise_id
+    assert other.exercise_id != first.exercise_id
+    exercises = (await db_session.exec(select(Exercise.user_id, Exercise.name).order_by(Exercise.id))).all()
+    assert [tuple(row) for row in exercises] == [(401, 'Squat'), (401, 'Bench Press'), (402, 'Squat')]
+
+    updated = await record_service.update_record(
+        db=db_session, record_id=first.id, record_update=RecordUpdate(exercise='Bench Press'), user_id=401
+    )
+    assert updated is not None
+    assert updated.exercise_id == bulk[1].exercise_id
+
+
+async def test_resolve_exercise_ids_prefers_user_then_global(db_session: AsyncSession):
+    """ユーザー固有の種目、グローバルな種目の順に解決し、どちらにもない種目だけを登録する"""
+    db_session.add(Exercise(user_id=None, name='Deadlift'))
+    db_session.add(Exercise(user_id=None, name='Row'))
+    db_session.add(Exercise(user_id=403, name='Row'))
+    await db_session.commit()
+    global_deadlift, global_row, own_row = (await db_session.exec(select(Exercise.id).order_by(Exercise.id))).all()
+
+    ids = await exercise_service.resolve_exercise_ids(db_session, 403, ['Deadlift', 'Row', 'Curl', 'Row'])
+    await db_session.commit()
+    assert ids['Deadlift'] == global_deadlift
+    assert ids['Row'] == own_row != global_row
+    assert await exercise_service.find_exercise_id(db_session, 403, 'Curl') == ids['Curl']
+    assert await exercise_service.find_exercise_id(db_session, 404, 'Curl') is None
+    assert await exercise_service.find_exercise_id(db_session, 404, 'Row') == global_row
+
+
+async def test_resolved_ids_are_cached_after_commit(db_session: AsyncSession):
+    """解決した種目ID はコミット後にキャッシュされ、ロールバックされた場合はキャッシュされない"""
+    key = exercise_service.exercise_cache_key(405, 'Lunge')
+    await exercise_service.resolve_exercise_ids(db_session, 405, ['Lunge'])
+    await db_session.rollback()
+    assert await exercise_service.exercise_id_cache.get(key) is None
+    assert await exercise_service.find_exercise_id(db_session, 405, 'Lunge') is None
+
+    ids = await exercise_service.resolve_exercise_ids(db_session, 405, ['Lunge'])
+    assert await exercise_service.exercise_id_cache.get(key) is None
+    await db_session.commit()
+    assert await exercise_service.exercise_id_cache.get(key) == ids['Lunge']
+
+
+async def test_record_exercise_name_follows_catalog(db_session: AsyncSession):
+    """
+    記録の種目名は種目ID の種目名を結合して読み込むため、
+    種目名が変わると記録の読み込みと検索にも反映されることをテストする。
+    """
+    day = datetime.date(2025, 7, 3)
+    record = await record_service.create_record(
+        db=db_session,
+        record_in=RecordCreate(exercise_date=day, exercise='Squat', weight=100, reps=5, set_reps=3),
+        user_id=403,
+    )
+    record_id, exercise_id = record.id, record.exercise_id
+
+    # 種目名に null を指定した場合は未指定として扱う
+    updated = await record_service.update_record(
+        db_session, record_id, RecordUpdate(exercise=None, reps=4), user_id=403
+    )
+    assert updated is not None
+    assert (updated.exercise, updated.exercise_id, updated.reps) == ('Squat', exercise_id, 4)
+
+    await db_session.exec(update(Exercise).where(col(Exercise.id) == exercise_id).values(name='Back Squat'))
+    await db_session.commit()
+    stored = await record_service.get_record(db_session, record_id=record_id, user_id=403)
+    assert stored is not None
+    assert stored.exercise == 'Back Squat'
+    found = await search_service.search_records(db_session, user_id=403, query='back')
+    assert [(row['id'], row['exercise']) for row in found] == [(record_id, 'Back Squat')]
@@ -0,0 +1,82 @@
+import csv
+import datetime
+import io
+import json
+
+import pytest
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.schemas.record import RecordCreate
+from src.services import export_service, record_service
+from tests.test_records import get_auth_headers
+
+pytestmark = pytest.mark.asyncio
+
+
+async def create_export_records(db_session: AsyncSession, user_id: int, count: int) -> None:
+    await record_service.create_records_bulk(
+        db=db_session,
+        records_in=[
+            RecordCreate(
+                exercise_date=datetime.date(2025, 6, 1) + datetime.timedelta(days=count - i),
+                exercise=f'Export {i}',
+                weight=50 + i,
+                reps=5,
+                set_reps=3,
+                notes='comma, "quoted"' if i == 0 else None,
+            )
+            for i in range(count)
+        ],
+        user_id=user_id,
+    )
+
+
+async def test_iter_records_export_batches(db_session: AsyncSession):
+    """
+    export_service.iter_records_export が batch_size 行ずつ NDJSON を出力することをテストする。
+    """
+    user_id = 401
+    await create_export_records(db_session, user_id, 5)
+    await create_export_records(db_session, user_id + 1, 1)  # 他ユーザーの記録は出力されない
+
+    chunks = [
+        chunk
+        async for chunk in export_service.iter_records_export(
+            db=db_session, user_id=user_id, export_format='ndjson', batch_size=2
+        )
+    ]
+
+    assert len(chunks) == 3
+    rows = [json.loads(line) for line in b''.join(chunks).decode('utf-8').splitlines()]
+    assert [row['exercise'] for row in rows] == ['Export 4', 'Export 3', 'Export 2', 'Export 1', 'Export 0']
+    assert rows[-1]['exercise_date'] == '2025-06-06'
+    assert rows[-1]['notes'] == 'comma, "quoted"'
+    assert rows[0]['notes'] is None
+
+
+async def test_export_records_api_csv(test_client: AsyncClient, db_session: AsyncSession):
+    """
+    GET /api/v1/records/export?format=csv が CSV をダウンロードとして返すことをテストする。
+    """
+    auth_headers = await get_auth_headers(test_client, db_session, 'export_user@example.com', 'password_export', 'ex')
+    me_response = await test_client.get('/api/v1/users/me', headers=auth_headers)
+    await create_export_records(db_session, me_response.json()['id'], 3)
+
+    response = await test_client.get('/api/v1/records/export?format=csv', headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/csv')
+    assert 'attachment' in response.headers['content-disposition']
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row['exercise'] for row in rows] == ['Export 2', 'Export 1', 'Export 0']
+    assert rows[2]['notes'] == 'comma, "quoted"'
+    assert rows[0]['weight'] == '52.0'
+
+    response = await test_client.get('/api/v1/records/export?format=ndjson', headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    assert len(response.text.splitlines()) == 3
+
+    response = await test_client.get('/api/v1/records/export?format=xml', headers=auth_headers)
+    assert response.status_code == 422
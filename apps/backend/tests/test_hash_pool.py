@@ -0,0 +1,75 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.core.hash_pool import BoundedThreadPool, PoolSaturatedError
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_bounded_thread_pool_runs_function_and_records_metrics():
+    """関数をワーカースレッドで実行し、処理件数と時間が記録されることをテストする"""
+    pool = BoundedThreadPool(max_workers=1, max_queue=1, name='test-pool')
+    try:
+        thread_names: list[str] = []
+
+        def work(value: int) -> int:
+            thread_names.append(threading.current_thread().name)
+            return value * 2
+
+        assert await pool.run(work, 21) == 42
+        assert thread_names[0].startswith('test-pool')
+        assert pool.metrics.completed == 1
+        assert pool.metrics.run_seconds_total >= 0
+        assert pool.pending == 0
+    finally:
+        pool.shutdown()
+
+
+async def test_bounded_thread_pool_rejects_when_saturated():
+    """実行中 + 待機中の処理が上限に達すると PoolSaturatedError が発生することをテストする"""
+    pool = BoundedThreadPool(max_workers=1, max_queue=1, name='test-pool-saturated')
+    release = threading.Event()
+    try:
+        running = [asyncio.create_task(pool.run(release.wait, 5)) for _ in range(2)]
+        await asyncio.sleep(0)
+        assert pool.pending == 2
+
+        with pytest.raises(PoolSaturatedError):
+            await pool.run(release.wait, 5)
+        assert pool.metrics.rejected == 1
+
+        release.set()
+        assert await asyncio.gather(*running) == [True, True]
+        assert pool.metrics.completed == 2
+        assert pool.metrics.queue_wait_seconds_max >= 0
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+async def test_bounded_thread_pool_counts_cancelled_calls_until_the_thread_finishes():
+    """呼び出し元がキャンセルされても、ワーカースレッドの処理が終わるまでは実行中として数える"""
+    pool = BoundedThreadPool(max_workers=1, max_queue=0, name='test-pool-cancelled')
+    release = threading.Event()
+    try:
+        task = asyncio.create_task(pool.run(release.wait, 5))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert pool.pending == 1
+        with pytest.raises(PoolSaturatedError):
+            await pool.run(release.wait, 5)
+
+        release.set()
+        for _ in range(100):
+            if pool.pending == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert pool.pending == 0
+        assert pool.metrics.completed == 1
+    finally:
+        release.set()
+        pool.shutdown()
@@ -0,0 +1,172 @@
+import datetime
+import io
+
+import pytest
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.services import import_service, personal_record_service, record_service, record_version_service
+from tests.test_records import get_auth_headers
+from tests.test_rollup import get_rollup_rows
+
+pytestmark = pytest.mark.asyncio
+
+CSV_CONTENT = (
+    'exercise_date,exercise,weight,reps,set_reps,notes\n'
+    '2025-05-01,Squat,100,5,3,\n'
+    '2025-05-01,Squat,not-a-number,5,3,\n'
+    '2025-05-02,Bench Press,80,8,3,"paused, felt good"\n'
+    '2025-05-03,Deadlift,140,5,1,\n'
+    ',Missing Date,10,1,1,\n'
+)
+
+
+async def test_import_records_csv_in_chunks(db_session: AsyncSession):
+    """
+    import_service.import_records が CSV をチャンク単位で取り込み、
+    検証エラーの行を行番号付きで報告することをテストする。
+    """
+    user_id = 501
+    result = await import_service.import_records(
+        db=db_session,
+        user_id=user_id,
+        file=io.BytesIO(CSV_CONTENT.encode('utf-8')),
+        import_format='csv',
+        chunk_size=2,
+    )
+
+    assert result.accepted == 3
+    assert result.rejected == 2
+    assert [error.row for error in result.errors] == [3, 6]
+    assert result.errors[0].errors[0]['loc'] == ('weight',)
+    assert result.errors_truncated is False
+
+    records = await record_service.get_records(db=db_session, user_id=user_id)
+    assert [(r.exercise, r.notes) for r in records] == [
+        ('Squat', None),
+        ('Bench Press', 'paused, felt good'),
+        ('Deadlift', None),
+    ]
+
+    rollup_rows = await get_rollup_rows(db_session, user_id)
+    assert {(r.exercise, r.date, r.sets) for r in rollup_rows} == {
+        ('Squat', datetime.date(2025, 5, 1), 3),
+        ('Bench Press', datetime.date(2025, 5, 2), 3),
+        ('Deadlift', datetime.date(2025, 5, 3), 1),
+    }
+
+    # 取り込んだ種目の自己ベストも作り直される
+    prs = await personal_record_service.get_personal_records(db_session, user_id, kind='max_weight')
+    assert {pr.exercise for pr in prs} == {'Squat', 'Bench Press', 'Deadlift'}
+
+    # チャンク (2 行 + 1 行) ごとにコミットし、変更カウンターもチャンクごとに進む
+    version, _ = await record_version_service.get_version(db_session, user_id)
+    assert version == 2
+
+
+async def test_import_records_keeps_committed_chunks_on_failure(db_session: AsyncSession, monkeypatch):
+    """途中のチャンクの書き込みに失敗しても、それまでにコミットしたチャンクと自己ベストは残る"""
+    user_id = 503
+    write_chunk = import_service._write_chunk
+    calls = 0
+
+    async def _fail_second_chunk(db, user_id, records, changed_at):
+        nonlocal calls
+        calls += 1
+        if calls == 2:
+            raise RuntimeError('database is down')
+        return await write_chunk(db, user_id, records, changed_at)
+
+    monkeypatch.setattr(import_service, '_write_chunk', _fail_second_chunk)
+    with pytest.raises(RuntimeError):
+        await import_service.import_records(
+            db=db_session,
+            user_id=user_id,
+            file=io.BytesIO(CSV_CONTENT.encode('utf-8')),
+            import_format='csv',
+            chunk_size=2,
+        )
+
+    records = await record_service.get_records(db=db_session, user_id=user_id)
+    assert [r.exercise for r in records] == ['Squat', 'Bench Press']
+    prs = await personal_record_service.get_personal_records(db_session, user_id, kind='max_weight')
+    assert {pr.exercise for pr in prs} == {'Squat', 'Bench Press'}
+
+
+async def test_import_records_reports_committed_rows_when_file_breaks(db_session: AsyncSession):
+    """
+    途中でファイルを読めなくなった場合、ImportFileError がコミット済みの件数と
+    どの行までコミットしたかを伝え、その行までの記録だけが取り込まれていることをテストする。
+    """
+    user_id = 504
+    content = CSV_CONTENT.encode('utf-8') + b'2025-05-04,Row,60,10,3,\xff\xfe\n'
+    with pytest.raises(import_service.ImportFileError) as exc_info:
+        await import_service.import_records(
+            db=db_session, user_id=user_id, file=io.BytesIO(content), import_format='csv', chunk_size=2
+        )
+
+    # 2 行ずつのチャンクのうち、4 行目 (Bench Press) で埋まったチャンクまでがコミット済み
+    assert exc_info.value.line == 7
+    assert exc_info.value.committed_through_line == 4
+    assert exc_info.value.result.accepted == 2
+    records = await record_service.get_records(db=db_session, user_id=user_id)
+    assert [r.exercise for r in records] == ['Squat', 'Bench Press']
+
+
+async def test_import_records_ndjson_invalid_lines(db_session: AsyncSession):
+    """
+    NDJSON の取り込みで、JSON として読めない行や空行が正しく扱われることをテストする。
+    """
+    user_id = 502
+    content = (
+        '{"exercise_date": "2025-05-01", "exercise": "Row", "weight": 60, "reps": 10, "set_reps": 3}\n'
+        '\n'
+        '{"exercise_date": "2025-05-01", "exercise": \n'
+        '["not", "an", "object"]\n'
+    )
+    result = await import_service.import_records(
+        db=db_session, user_id=user_id, file=io.BytesIO(content.encode('utf-8')), import_format='ndjson'
+    )
+
+    assert result.accepted == 1
+    assert result.rejected == 2
+    assert [error.row for error in result.errors] == [3, 4]
+    assert result.errors[0].errors[0]['msg'].startswith('Invalid JSON')
+
+
+async def test_import_records_api(test_client: AsyncClient, db_session: AsyncSession):
+    """
+    POST /api/v1/records/import でファイルをアップロードして取り込めることをテストする。
+    """
+    auth_headers = await get_auth_headers(test_client, db_session, 'import_user@example.com', 'password_imp', 'imp')
+
+    response = await test_client.post(
+        '/api/v1/records/import',
+        files={'file': ('history.csv', CSV_CONTENT.encode('utf-8'), 'text/csv')},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    assert response.json()['accepted'] == 3
+    assert response.json()['rejected'] == 2
+
+    list_response = await test_client.get('/api/v1/records/', headers=auth_headers)
+    assert len(list_response.json()) == 3
+
+    # 拡張子から形式を判定できない場合は format の指定が必要
+    response = await test_client.post(
+        '/api/v1/records/import',
+        files={'file': ('history.txt', CSV_CONTENT.encode('utf-8'), 'text/plain')},
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+
+    response = await test_client.post(
+        '/api/v1/records/import?format=csv',
+        files={'file': ('history.txt', b'\xff\xfe\x00broken', 'text/plain')},
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+    detail = response.json()['detail']
+    assert detail['line'] == 1
+    assert detail['committed_through_line'] is None
+    assert detail['result']['accepted'] == 0
@@ -0,0 +1,90 @@
+import json
+import logging
+import queue
+
+from src.core import logger as logger_module
+from src.core.logger import APP_LOGGER_NAME, DroppingQueueHandler, JsonFormatter, setup_logger, stop_logging
+
+
+def _make_record(message: str, *args) -> logging.LogRecord:
+    return logging.LogRecord('test', logging.INFO, __file__, 10, message, args, None, func='create_record')
+
+
+def test_dropping_queue_handler_drops_when_full():
+    """
+    待ち行列が一杯の場合、DroppingQueueHandler がブロックせずにログを破棄して数えることをテストする。
+    """
+    log_queue: queue.Queue = queue.Queue(maxsize=1)
+    handler = DroppingQueueHandler(log_queue)
+    dropped_before = logger_module.log_records_dropped_total.value()
+
+    for index in range(3):
+        handler.handle(_make_record('message %s', index))
+
+    assert log_queue.qsize() == 1
+    assert log_queue.get_nowait().getMessage() == 'message 0'
+    assert handler.dropped == 2
+    assert logger_module.log_records_dropped_total.value() == dropped_before + 2
+
+
+def test_json_formatter():
+    """
+    JsonFormatter がログを 1 行の JSON に変換することをテストする。
+    """
+    line = JsonFormatter().format(_make_record('Created record %s', 42))
+
+    payload = json.loads(line)
+    assert payload['message'] == 'Created record 42'
+    assert payload['level'] == 'INFO'
+    assert payload['function'] == 'create_record'
+    assert payload['line'] == 10
+    assert 'timestamp' in payload
+
+
+def test_setup_logger_async_json(monkeypatch, capsys):
+    """
+    非同期モードではログが QueueListener のスレッドから書き込まれ、
+    stop_logging で待ち行列に残ったログが書き出されることをテストする。
+    """
+    monkeypatch.setattr(logger_module.settings, 'LOG_ASYNC', True)
+    monkeypatch.setattr(logger_module.settings, 'LOG_FORMAT', 'json')
+    app_logger = logging.getLogger(APP_LOGGER_NAME)
+    try:
+        setup_logger()
+        assert [type(handler) for handler in app_logger.handlers] == [DroppingQueueHandler]
+
+        app_logger.info('Queued message for user_id: %s', 7)
+        stop_logging()
+
+        lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert lines[-1]['message'] == 'Queued message for user_id: 7'
+        assert lines[-1]['logger'] == APP_LOGGER_NAME
+    finally:
+        # capsys の出力先に紐づいたハンドラを残さない
+        stop_logging()
+        app_logger.handlers.clear()
+
+
+def test_setup_logger_async_json_keeps_exception(monkeypatch, capsys):
+    """
+    非同期モードの JSON 出力でも、例外のトレースバックはメッセージに結合せずに exception に出力することをテストする。
+    """
+    monkeypatch.setattr(logger_module.settings, 'LOG_ASYNC', True)
+    monkeypatch.setattr(logger_module.settings, 'LOG_FORMAT', 'json')
+    app_logger = logging.getLogger(APP_LOGGER_NAME)
+    try:
+        setup_logger()
+        try:
+            raise ValueError('bad weight')
+        except ValueError:
+            app_logger.exception('Failed to create record for user_id: %s', 7)
+        stop_logging()
+
+        payload = json.loads(capsys.readouterr().out.splitlines()[-1])
+        assert payload['message'] == 'Failed to create record for user_id: 7'
+        assert payload['level'] == 'ERROR'
+        assert payload['exception'].startswith('Traceback (most recent call last):')
+        assert payload['exception'].endswith('ValueError: bad weight')
+    finally:
+        stop_logging()
+        app_logger.handlers.clear()
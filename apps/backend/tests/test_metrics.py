@@ -0,0 +1,91 @@
+import pytest
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core import metrics
+from src.core.metrics import MetricsRegistry
+from tests.test_records import get_auth_headers
+
+
+def test_registry_render_prometheus_text():
+    """
+    MetricsRegistry がカウンター・ゲージ・ヒストグラムを Prometheus のテキスト形式で出力することをテストする。
+    """
+    registry = MetricsRegistry()
+    requests = registry.counter('requests_total', 'Requests.', ('route',))
+    in_flight = registry.gauge('in_flight', 'In flight.', callback=lambda: 3)
+    latency = registry.histogram('latency_seconds', 'Latency.', ('route',), buckets=(0.1, 1.0))
+
+    requests.inc('/a/{id}')
+    requests.inc('/a/{id}', amount=2)
+    requests.inc('say "hi"')
+    latency.observe(0.05, '/a/{id}')
+    latency.observe(0.5, '/a/{id}')
+    latency.observe(5.0, '/a/{id}')
+
+    assert requests.value('/a/{id}') == 3
+    assert in_flight.value() == 3
+    assert latency.count('/a/{id}') == 3
+    assert registry.render().splitlines() == [
+        '# HELP requests_total Requests.',
+        '# TYPE requests_total counter',
+        'requests_total{route="/a/{id}"} 3',
+        'requests_total{route="say \\"hi\\""} 1',
+        '# HELP in_flight In flight.',
+        '# TYPE in_flight gauge',
+        'in_flight 3',
+        '# HELP latency_seconds Latency.',
+        '# TYPE latency_seconds histogram',
+        'latency_seconds_bucket{route="/a/{id}",le="0.1"} 1',
+        'latency_seconds_bucket{route="/a/{id}",le="1"} 2',
+        'latency_seconds_bucket{route="/a/{id}",le="+Inf"} 3',
+        'latency_seconds_sum{route="/a/{id}"} 5.55',
+        'latency_seconds_count{route="/a/{id}"} 3',
+    ]
+
+    with pytest.raises(ValueError):
+        requests.inc()
+    with pytest.raises(ValueError):
+        registry.counter('requests_total', 'Duplicate.')
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_records_route_templates_and_db_queries(
+    test_client: AsyncClient, db_session: AsyncSession
+):
+    """
+    ミドルウェアがルートのテンプレートをラベルにしてレイテンシとDBクエリ数を記録し、
+    /metrics で公開することをテストする。
+    """
+    auth_headers = await get_auth_headers(test_client, db_session, 'metrics_user@example.com', 'password_m', 'm')
+    create_response = await test_client.post(
+        '/api/v1/records/',
+        json={'exercise_date': '2025-06-01', 'exercise': 'Squat', 'weight': 100, 'reps': 5, 'set_reps': 3},
+        headers=auth_headers,
+    )
+    record_id = create_response.json()['id']
+
+    route = '/api/v1/records/{record_id}'
+    requests_before = metrics.http_requests_total.value('GET', route, '200')
+    queries_before = metrics.http_request_db_queries.sum('GET', route)
+
+    response = await test_client.get(f'/api/v1/records/{record_id}', headers=auth_headers)
+    assert response.status_code == 200
+    await test_client.get('/no/such/path')
+
+    assert metrics.http_requests_total.value('GET', route, '200') == requests_before + 1
+    assert metrics.http_request_db_queries.sum('GET', route) > queries_before
+    assert metrics.http_requests_in_progress.value('GET') == 0
+    assert metrics.http_requests_total.value('GET', metrics.UNMATCHED_ROUTE, '404') >= 1
+
+    metrics_response = await test_client.get('/metrics')
+    assert metrics_response.status_code == 200
+    assert metrics_response.headers['content-type'].startswith('text/plain; version=0.0.4')
+    body = metrics_response.text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/api/v1/records/{record_id}",le="0.005"}' in body
+    assert '# TYPE db_query_duration_seconds histogram' in body
+    assert '# TYPE user_cache_hits_total counter' in body
+    assert 'password_hash_pool_pending ' in body
+    assert '# TYPE password_hash_pool_run_seconds_total counter' in body
+    assert '# TYPE password_hash_pool_run_seconds_max gauge' in body
+    assert f'/api/v1/records/{record_id}"' not in body
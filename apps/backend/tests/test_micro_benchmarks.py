@@ -0,0 +1,41 @@
+import json
+
+from benchmarks.micro import compare_results, main
+
+
+def _results(**medians: float) -> dict:
+    return {'meta': {}, 'benchmarks': {name: {'median_us': median} for name, median in medians.items()}}
+
+
+def test_compare_results_flags_regressions():
+    """
+    中央値が閾値を超えて遅くなったベンチマークを回帰として判定することをテストする。
+    """
+    baseline = _results(fast=100.0, slow=100.0, better=100.0)
+    current = _results(fast=105.0, slow=125.0, better=50.0, added=10.0)
+
+    rows = {row['name']: row for row in compare_results(baseline, current, threshold=0.1)}
+
+    assert rows['fast']['status'] == 'ok'
+    assert rows['slow']['status'] == 'regression'
+    assert rows['slow']['change'] == 0.25
+    assert rows['better']['status'] == 'improved'
+    assert rows['added']['status'] == 'new'
+
+
+def test_compare_command_exit_code(tmp_path):
+    """
+    compare コマンドが回帰を検出した場合に 0 以外の終了コードを返すことをテストする。
+    """
+    baseline_path = tmp_path / 'baseline.json'
+    current_path = tmp_path / 'current.json'
+    baseline_path.write_text(json.dumps(_results(get_records=100.0)))
+
+    current_path.write_text(json.dumps(_results(get_records=109.0)))
+    assert main(['compare', '--baseline', str(baseline_path), '--current', str(current_path)]) == 0
+
+    current_path.write_text(json.dumps(_results(get_records=130.0)))
+    assert main(['compare', '--baseline', str(baseline_path), '--current', str(current_path)]) == 1
+    assert (
+        main(['compare', '--baseline', str(baseline_path), '--current', str(current_path), '--threshold', '0.5']) == 0
+    )
@@ -0,0 +1,120 @@
+import datetime
+
+import pytest
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.schemas.record import RecordCreate, RecordUpdate
+from src.services import personal_record_service, record_service
+from tests.test_records import get_auth_headers
+
+pytestmark = pytest.mark.asyncio
+
+
+def squat(day: int, weight: float, reps: int, set_reps: int = 1) -> RecordCreate:
+    return RecordCreate(
+        exercise_date=datetime.date(2025, 8, day), exercise='Squat', weight=weight, reps=reps, set_reps=set_reps
+    )
+
+
+async def get_bests(db_session: AsyncSession, user_id: int) -> dict[tuple[str, float | None], tuple[float, int | None]]:
+    """{(kind, weight): (value, record_id)} の形で自己ベストを返す"""
+    return {
+        (pr.kind, pr.weight): (pr.value, pr.record_id)
+        for pr in await personal_record_service.get_personal_records(db_session, user_id)
+    }
+
+
+async def test_create_record_flags_personal_records(db_session: AsyncSession):
+    """
+    記録の作成時に、それまでの自己ベストを上回った種類だけが PR として返されることをテストする。
+    """
+    user_id = 501
+    first, prs = await record_service.create_record_with_personal_records(db_session, squat(1, 100, 5), user_id)
+    assert prs == []  # 初めての記録は比較対象がない
+
+    _, prs = await record_service.create_record_with_personal_records(db_session, squat(2, 90, 5), user_id)
+    assert prs == []
+
+    heavier, prs = await record_service.create_record_with_personal_records(db_session, squat(3, 110, 5), user_id)
+    assert {pr.kind: pr.previous_value for pr in prs} == {
+        'max_weight': 100,
+        'est_1rm': pytest.approx(100 * (1 + 5 / 30)),
+        'session_volume': 500,
+    }
+    assert all(pr.record_id in (heavier.id, None) for pr in prs)
+
+    _, prs = await record_service.create_record_with_personal_records(db_session, squat(4, 90, 6), user_id)
+    assert [(pr.kind, pr.weight, pr.value, pr.previous_value) for pr in prs] == [('reps_at_weight', 90, 6, 5)]
+
+    bests = await get_bests(db_session, user_id)
+    assert bests[('max_weight', None)] == (110, heavier.id)
+    assert bests[('reps_at_weight', 90)][0] == 6
+    assert bests[('reps_at_weight', 100)][0] == 5
+    assert first.id != heavier.id
+
+
+async def test_personal_bests_are_recomputed_on_update_and_delete(db_session: AsyncSession):
+    """自己ベストになっている記録を更新・削除すると、その種目の自己ベストが作り直されることをテストする"""
+    user_id = 502
+    light = await record_service.create_record(db_session, squat(1, 100, 5, set_reps=3), user_id)
+    heavy = await record_service.create_record(db_session, squat(2, 120, 1), user_id)
+    assert (await get_bests(db_session, user_id))[('max_weight', None)] == (120, heavy.id)
+
+    await record_service.update_record(db_session, heavy.id, RecordUpdate(weight=90), user_id)
+    bests = await get_bests(db_session, user_id)
+    assert bests[('max_weight', None)] == (100, light.id)
+    assert ('reps_at_weight', 120) not in bests
+    assert bests[('reps_at_weight', 90)] == (1, heavy.id)
+
+    await record_service.update_record(db_session, heavy.id, RecordUpdate(weight=130), user_id)
+    assert (await get_bests(db_session, user_id))[('max_weight', None)] == (130, heavy.id)
+
+    await record_service.delete_record(db_session, light.id, user_id)
+    bests = await get_bests(db_session, user_id)
+    assert bests[('session_volume', None)] == (130, None)
+    assert ('reps_at_weight', 100) not in bests
+
+    await record_service.delete_record(db_session, heavy.id, user_id)
+    assert await get_bests(db_session, user_id) == {}
+
+
+async def test_incremental_bests_match_recompute(db_session: AsyncSession):
+    """差分更新した自己ベストが、履歴から作り直した自己ベストと一致することをテストする"""
+    user_id = 503
+    await record_service.create_records_bulk(
+        db_session, [squat(1, 100, 5, 3), squat(1, 105, 3, 2), squat(2, 100, 7, 1)], user_id
+    )
+    for record_in in (squat(3, 110, 2), squat(3, 80, 12, 4), squat(4, 105, 4)):
+        await record_service.create_record(db_session, record_in, user_id)
+    incremental = await get_bests(db_session, user_id)
+
+    records = await record_service.get_records(db_session, user_id)
+    await personal_record_service.recompute(db_session, user_id, {records[0].exercise_id})
+    await db_session.commit()
+    assert await get_bests(db_session, user_id) == incremental
+
+
+async def test_personal_records_api(test_client: AsyncClient, db_session: AsyncSession):
+    """POST /api/v1/records/ が更新した PR を返し、GET /api/v1/records/prs で自己ベストを取得できる"""
+    auth_headers = await get_auth_headers(test_client, db_session, 'prs@example.com', 'password_prs', 'prs')
+    for weight in (100, 110):
+        response = await test_client.post(
+            '/api/v1/records/', json=squat(1, weight, 1).model_dump(mode='json'), headers=auth_headers
+        )
+        assert response.status_code == 201
+    assert {pr['kind'] for pr in response.json()['personal_records']} == {'max_weight', 'est_1rm', 'session_volume'}
+
+    await test_client.post(
+        '/api/v1/records/',
+        json={'exercise_date': '2025-08-01', 'exercise': 'Bench Press', 'weight': 80, 'reps': 5, 'set_reps': 3},
+        headers=auth_headers,
+    )
+    response = await test_client.get('/api/v1/records/prs', params={'kind': 'max_weight'}, headers=auth_headers)
+    assert response.status_code == 200
+    assert [(pr['exercise'], pr['value']) for pr in response.json()] == [('Bench Press', 80), ('Squat', 110)]
+
+    response = await test_client.get('/api/v1/records/prs', params={'exercise': 'Squat'}, headers=auth_headers)
+    assert {pr['kind'] for pr in response.json()} == {'max_weight', 'est_1rm', 'reps_at_weight', 'session_volume'}
+    response = await test_client.get('/api/v1/records/prs', params={'exercise': 'Row'}, headers=auth_headers)
+    assert response.json() == []
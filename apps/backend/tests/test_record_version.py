@@ -0,0 +1,114 @@
+import datetime
+
+import pytest
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.schemas.record import RecordCreate, RecordUpdate
+from src.services import record_service, record_version_service
+from tests.test_records import _StatementRecorder, get_auth_headers
+
+pytestmark = pytest.mark.asyncio
+
+
+def _record_in(exercise: str = 'Squat') -> RecordCreate:
+    return RecordCreate(exercise_date=datetime.date(2025, 12, 1), exercise=exercise, weight=80, reps=5, set_reps=3)
+
+
+async def test_record_version_bumped_by_writes(db_session: AsyncSession):
+    """記録の作成・一括作成・更新・削除のたびに、そのユーザーの変更カウンターだけが増えることをテストする"""
+    user_id = 401
+    assert await record_version_service.get_version(db_session, user_id) == (0, None)
+
+    record = await record_service.create_record(db=db_session, record_in=_record_in(), user_id=user_id)
+    version, updated_at = await record_version_service.get_version(db_session, user_id)
+    assert version == 1
+    assert updated_at is not None
+
+    await record_service.create_records_bulk(db=db_session, records_in=[_record_in(), _record_in()], user_id=user_id)
+    assert (await record_version_service.get_version(db_session, user_id))[0] == 2
+
+    await record_service.update_record(
+        db=db_session, record_id=record.id, record_update=RecordUpdate(notes='note'), user_id=user_id
+    )
+    assert (await record_version_service.get_version(db_session, user_id))[0] == 3
+
+    # 他のユーザーは記録を削除できず、記録の所有者のカウンターも変わらない
+    assert await record_service.delete_record(db=db_session, record_id=record.id, user_id=user_id + 1) is None
+    assert (await record_version_service.get_version(db_session, user_id))[0] == 3
+
+    await record_service.delete_record(db=db_session, record_id=record.id, user_id=user_id)
+    assert (await record_version_service.get_version(db_session, user_id))[0] == 4
+
+
+async def test_bump_version_is_monotonic_when_clock_goes_back(db_session: AsyncSession, monkeypatch):
+    """時計が戻っても、変更日時は前回の変更日時より後になる"""
+    user_id = 402
+    first = await record_version_service.bump_version(db_session, user_id)
+    monkeypatch.setattr(record_version_service, '_utcnow', lambda: first - datetime.timedelta(hours=1))
+
+    second = await record_version_service.bump_version(db_session, user_id)
+    third = await record_version_service.bump_version(db_session, user_id)
+
+    assert first < second < third
+    assert await record_version_service.get_version(db_session, user_id) == (3, third)
+
+
+async def test_read_records_list_api_conditional_get(test_client: AsyncClient, db_session: AsyncSession):
+    """
+    一覧 API が ETag / Last-Modified を返し、If-None-Match が一致する場合は
+    一覧を取得せずに 304 を返すこと、記録が変わると新しい ETag になることをテストする。
+    """
+    auth_headers = await get_auth_headers(test_client, db_session, 'etag@example.com', 'password_etag', 'etag')
+    user_id = (await test_client.get('/api/v1/users/me', headers=auth_headers)).json()['id']
+    await record_service.create_record(db=db_session, record_in=_record_in(), user_id=user_id)
+
+    response = await test_client.get('/api/v1/records/?limit=10', headers=auth_headers)
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+    assert etag.startswith('"') and etag.endswith('"')
+    assert response.headers['Last-Modified'].endswith('GMT')
+    assert response.headers['Cache-Control'] == 'private, no-cache'
+
+    with _StatementRecorder(db_session.bind) as recorder:
+        response = await test_client.get(
+            '/api/v1/records/?limit=10', headers={**auth_headers, 'If-None-Match': f'"other", W/{etag}'}
+        )
+    assert response.status_code == 304
+    assert response.content == b''
+    assert response.headers['ETag'] == etag
+    # 変更カウンターを読む 1 文だけで応答する
+    assert recorder.statements == ['SELECT']
+
+    # クエリパラメータが異なれば ETag も異なる
+    response = await test_client.get('/api/v1/records/?limit=5', headers={**auth_headers, 'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+    await record_service.create_record(db=db_session, record_in=_record_in('Bench Press'), user_id=user_id)
+    response = await test_client.get('/api/v1/records/?limit=10', headers={**auth_headers, 'If-None-Match': etag})
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    assert response.headers['ETag'] != etag
+
+
+async def test_read_record_api_conditional_get(test_client: AsyncClient, db_session: AsyncSession):
+    """詳細 API も ETag を返し、記録が変わるまでは 304 を返すことをテストする"""
+    auth_headers = await get_auth_headers(test_client, db_session, 'etag1@example.com', 'password_etag', 'etag1')
+    user_id = (await test_client.get('/api/v1/users/me', headers=auth_headers)).json()['id']
+    record = await record_service.create_record(db=db_session, record_in=_record_in(), user_id=user_id)
+
+    response = await test_client.get(f'/api/v1/records/{record.id}', headers=auth_headers)
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+    assert 'Last-Modified' in response.headers
+
+    response = await test_client.get(f'/api/v1/records/{record.id}', headers={**auth_headers, 'If-None-Match': etag})
+    assert response.status_code == 304
+
+    response = await test_client.put(f'/api/v1/records/{record.id}', json={'weight': 85}, headers=auth_headers)
+    assert response.status_code == 200
+    response = await test_client.get(f'/api/v1/records/{record.id}', headers={**auth_headers, 'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.json()['weight'] == 85
+    assert response.headers['ETag'] != etag
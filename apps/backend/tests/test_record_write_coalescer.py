@@ -0,0 +1,177 @@
+import asyncio
+import datetime
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.config import settings
+from src.core.database import create_session_maker
+from src.schemas.record import RecordCreate
+from src.services import record_service, record_version_service
+from src.services.record_write_coalescer import RecordWriteCoalescer
+from tests.test_records import _StatementRecorder, get_auth_headers
+
+pytestmark = pytest.mark.asyncio
+
+
+def _record(weight: float, day: int = 1, exercise: str = 'Bench Press') -> RecordCreate:
+    return RecordCreate(exercise_date=datetime.date(2025, 6, day), exercise=exercise, weight=weight, reps=5, set_reps=1)
+
+
+def _coalescer(test_engine: AsyncEngine, max_delay: float = 0.01, max_batch: int = 32) -> RecordWriteCoalescer:
+    return RecordWriteCoalescer(
+        session_factory=create_session_maker(test_engine), max_delay=max_delay, max_batch=max_batch
+    )
+
+
+async def test_coalesced_records_are_written_in_one_insert(test_engine: AsyncEngine, db_session: AsyncSession):
+    """同時に作成された記録は 1 つのトランザクションにまとめられ、各呼び出し元には自分の記録が返る"""
+    coalescer = _coalescer(test_engine)
+    records_in = [_record(60.0 + index) for index in range(5)]
+
+    with _StatementRecorder(test_engine) as recorder:
+        results = await asyncio.gather(*(coalescer.create_record(record_in, user_id=1) for record_in in records_in))
+
+    ids = [record.id for record, _ in results]
+    assert ids == sorted(ids) and len(set(ids)) == 5
+    assert [record.weight for record, _ in results] == [record_in.weight for record_in in records_in]
+    # 変更カウンター・種目・記録・日ごとの集計・自己ベストの INSERT が 1 回ずつ (記録の件数によらない)。
+    # SQLite は RETURNING の行順を入力の順に揃えられないため、記録だけは 1 行ずつの INSERT になる
+    record_inserts = 5 if test_engine.dialect.name == 'sqlite' else 1
+    assert recorder.statements.count('INSERT') == 4 + record_inserts
+    assert coalescer.metrics.batches == 1
+    assert coalescer.metrics.records == 5
+    assert coalescer.pending == 0
+
+    stored = await record_service.get_records(db_session, user_id=1)
+    assert sorted(record.id for record in stored) == ids
+    assert len({record.updated_at for record in stored}) == 1
+    version, _ = await record_version_service.get_version(db_session, 1)
+    assert version == 1
+
+
+async def test_batches_are_bounded_by_size_and_per_user(test_engine: AsyncEngine):
+    """max_batch 件に達したバッチはすぐに書き込まれ、ユーザーごとに別のバッチになる"""
+    coalescer = _coalescer(test_engine, max_delay=0.05, max_batch=2)
+
+    results = await asyncio.gather(
+        *(coalescer.create_record(_record(50.0 + index), user_id=1) for index in range(5)),
+        coalescer.create_record(_record(40.0), user_id=2),
+    )
+
+    assert coalescer.metrics.batches == 4
+    assert [record.user_id for record, _ in results] == [1, 1, 1, 1, 1, 2]
+    user_ids = [record.id for record, _ in results[:5]]
+    assert user_ids == sorted(user_ids)
+
+
+async def test_personal_records_are_returned_to_their_own_caller(test_engine: AsyncEngine):
+    """バッチで更新した自己ベストは、その記録を作成した呼び出し元にだけ返る"""
+    coalescer = _coalescer(test_engine)
+    await coalescer.create_record(_record(100.0, day=1), user_id=1)
+
+    (light, light_prs), (heavy, heavy_prs) = await asyncio.gather(
+        coalescer.create_record(_record(80.0, day=2), user_id=1),
+        coalescer.create_record(_record(110.0, day=2), user_id=1),
+    )
+
+    assert light_prs == []
+    assert {(pr.kind, pr.record_id) for pr in heavy_prs} == {
+        ('max_weight', heavy.id),
+        ('est_1rm', heavy.id),
+        ('session_volume', None),
+    }
+
+
+async def test_each_caller_gets_its_own_record(test_engine: AsyncEngine):
+    """同じバッチで種目と重量の異なる記録を同時に作成しても、各呼び出し元には自分の記録が返る"""
+    coalescer = _coalescer(test_engine)
+    records_in = [
+        _record(weight, day=2, exercise=exercise)
+        for weight, exercise in ((100.0, 'Squat'), (60.0, 'Bench Press'), (140.0, 'Deadlift'), (40.0, 'Overhead Press'))
+    ]
+    # 初めて記録した種目は PR にならないため、先に軽い記録を作成しておく
+    for record_in in records_in:
+        await coalescer.create_record(_record(10.0, exercise=record_in.exercise), user_id=1)
+
+    results = await asyncio.gather(*(coalescer.create_record(record_in, user_id=1) for record_in in records_in))
+
+    assert coalescer.metrics.batches == 5
+    assert [(record.exercise, record.weight) for record, _ in results] == [
+        (record_in.exercise, record_in.weight) for record_in in records_in
+    ]
+    for record, personal_records in results:
+        assert {pr.exercise for pr in personal_records} == {record.exercise}
+        assert all(pr.record_id in (record.id, None) for pr in personal_records)
+
+
+async def test_mismatched_batch_result_raises_for_every_caller(test_engine: AsyncEngine, monkeypatch):
+    """書き込んだ記録の件数が呼び出し元の数と合わない場合は、どの呼び出し元にも記録を返さない"""
+    coalescer = _coalescer(test_engine)
+    create_bulk = record_service.create_records_bulk_with_personal_records
+
+    async def _drop_last(db, records_in, user_id):
+        records, personal_records = await create_bulk(db, records_in, user_id)
+        return records[:-1], personal_records
+
+    monkeypatch.setattr(record_service, 'create_records_bulk_with_personal_records', _drop_last)
+    results = await asyncio.gather(
+        coalescer.create_record(_record(60.0), user_id=1),
+        coalescer.create_record(_record(70.0), user_id=1),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert coalescer.metrics.failed_batches == 1
+
+
+async def test_failed_batch_raises_for_every_caller(test_engine: AsyncEngine, monkeypatch):
+    coalescer = _coalescer(test_engine)
+
+    async def _fail(db, records_in, user_id):
+        raise RuntimeError('database is down')
+
+    monkeypatch.setattr(record_service, 'create_records_bulk_with_personal_records', _fail)
+    results = await asyncio.gather(
+        coalescer.create_record(_record(60.0), user_id=1),
+        coalescer.create_record(_record(70.0), user_id=1),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert coalescer.metrics.failed_batches == 1
+
+
+async def test_bounds_are_validated(test_engine: AsyncEngine):
+    session_factory = create_session_maker(test_engine)
+    for max_delay, max_batch in ((0, 10), (1.0, 10), (0.01, 0), (0.01, 5000)):
+        with pytest.raises(ValueError):
+            RecordWriteCoalescer(session_factory=session_factory, max_delay=max_delay, max_batch=max_batch)
+
+
+async def test_create_record_endpoint_uses_coalescer(
+    test_client: AsyncClient, db_session: AsyncSession, test_engine: AsyncEngine, monkeypatch
+):
+    """RECORD_WRITE_COALESCING が有効な場合、POST /records/ はまとめて書き込んだ記録を返す"""
+    from src.api.v1 import records as records_api
+
+    # 3 件のリクエストの認証が終わるまで待てるよう、待機時間は上限にする
+    coalescer = _coalescer(test_engine, max_delay=0.05)
+    monkeypatch.setattr(settings, 'RECORD_WRITE_COALESCING', True)
+    monkeypatch.setattr(records_api, 'record_write_coalescer', coalescer)
+    headers = await get_auth_headers(test_client, db_session, 'coalesce@example.com', 'password_coalesce')
+
+    payloads = [
+        {'exercise_date': '2025-06-01', 'exercise': 'Squat', 'weight': 100 + index, 'reps': 5, 'set_reps': 1}
+        for index in range(3)
+    ]
+    responses = await asyncio.gather(
+        *(test_client.post('/api/v1/records/', json=payload, headers=headers) for payload in payloads)
+    )
+
+    assert [response.status_code for response in responses] == [201, 201, 201]
+    assert [response.json()['weight'] for response in responses] == [100, 101, 102]
+    assert len({response.json()['id'] for response in responses}) == 3
+    assert coalescer.metrics.batches == 1
@@ -4,10 +4,12 @@ from typing import Optional
 
 import pytest
 from httpx import AsyncClient
+from pydantic import TypeAdapter
+from sqlalchemy import event
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.core.logger import APP_LOGGER_NAME
-from src.schemas.record import RecordCreate, RecordUpdate
+from src.schemas.record import RecordCreate, RecordRead, RecordUpdate
 from src.schemas.user import UserCreate
 from src.services import record_service, user_service
 
@@ -778,3 +780,389 @@ async def test_update_record_api_record_not_found_for_owner(test_client: AsyncCl
     )
 
     assert response.status_code == 404
+
+
+async def test_get_records_by_cursor_service(db_session: AsyncSession):
+    """
+    record_service.get_records_by_cursor が (exercise_date, id) 順にページングし、
+    最後のページでは次のカーソルが None になることをテストする。
+    """
+    user_id_cursor = 104
+    # 日付が ID 順と一致しないように作成する (同じ日付の記録も含める)
+    dates = [datetime.date(2025, 8, 3), datetime.date(2025, 8, 1), datetime.date(2025, 8, 2), datetime.date(2025, 8, 1)]
+    for i, exercise_date in enumerate(dates):
+        await record_service.create_record(
+            db=db_session,
+            record_in=RecordCreate(
+                exercise_date=exercise_date, exercise=f'Cursor Record {i + 1}', weight=10, reps=1, set_reps=1
+            ),
+            user_id=user_id_cursor,
+        )
+    await record_service.create_record(
+        db=db_session,
+        record_in=RecordCreate(
+            exercise_date=datetime.date(2025, 8, 1), exercise='Other User Cursor Record', weight=10, reps=1, set_reps=1
+        ),
+        user_id=user_id_cursor + 1,
+    )
+
+    page1, cursor1 = await record_service.get_records_by_cursor(db=db_session, user_id=user_id_cursor, limit=2)
+    assert [r.exercise for r in page1] == ['Cursor Record 2', 'Cursor Record 4']
+    assert cursor1 is not None
+
+    page2, cursor2 = await record_service.get_records_by_cursor(
+        db=db_session, user_id=user_id_cursor, cursor=cursor1, limit=2
+    )
+    assert [r.exercise for r in page2] == ['Cursor Record 3', 'Cursor Record 1']
+    assert cursor2 is None
+
+
+async def test_get_records_by_cursor_service_invalid_cursor(db_session: AsyncSession):
+    """不正なカーソルを渡すと ValueError が発生する"""
+    with pytest.raises(ValueError):
+        await record_service.get_records_by_cursor(db=db_session, user_id=1, cursor='not-a-cursor', limit=2)
+
+
+async def test_read_records_list_api_cursor_pagination(test_client: AsyncClient, db_session: AsyncSession):
+    """
+    pagination=cursor で記録一覧を取得すると X-Next-Cursor ヘッダーで次のページを辿れる。
+    """
+    user_email = 'cursor_user@example.com'
+    user_password = 'password_cursor'
+    auth_headers = await get_auth_headers(test_client, db_session, user_email, user_password, 'cursorUser')
+    me_response = await test_client.get('/api/v1/users/me', headers=auth_headers)
+    user_id = me_response.json()['id']
+
+    for i in range(3):
+        await record_service.create_record(
+            db=db_session,
+            record_in=RecordCreate(
+                exercise_date=datetime.date(2025, 9, 3 - i),
+                exercise=f'Cursor API {i + 1}',
+                weight=10,
+                reps=1,
+                set_reps=1,
+            ),
+            user_id=user_id,
+        )
+
+    response1 = await test_client.get('/api/v1/records/?pagination=cursor&limit=2', headers=auth_headers)
+    assert response1.status_code == 200
+    assert [r['exercise'] for r in response1.json()] == ['Cursor API 3', 'Cursor API 2']
+    next_cursor = response1.headers.get('X-Next-Cursor')
+    assert next_cursor
+
+    response2 = await test_client.get(f'/api/v1/records/?cursor={next_cursor}&limit=2', headers=auth_headers)
+    assert response2.status_code == 200
+    assert [r['exercise'] for r in response2.json()] == ['Cursor API 1']
+    assert 'X-Next-Cursor' not in response2.headers
+
+    response_invalid = await test_client.get('/api/v1/records/?cursor=%%%&limit=2', headers=auth_headers)
+    assert response_invalid.status_code == 400
+
+
+@pytest.mark.parametrize(
+    'query',
+    [
+        'limit=0',
+        'limit=-1',
+        'limit=1001',
+        'skip=-1',
+        'pagination=cursor&limit=0',
+        'pagination=cursor&limit=-1',
+    ],
+)
+async def test_read_records_list_api_rejects_invalid_paging(
+    test_client: AsyncClient, db_session: AsyncSession, query: str
+):
+    """limit / skip が範囲外の場合は 422 を返す (0 件や全件の取得、500 エラーにならない)"""
+    auth_headers = await get_auth_headers(test_client, db_session, 'paging_user@example.com', 'password_paging')
+    response = await test_client.get(f'/api/v1/records/?{query}', headers=auth_headers)
+    assert response.status_code == 422
+
+
+async def test_create_records_bulk_service(db_session: AsyncSession):
+    """
+    record_service.create_records_bulk が複数の記録を入力順に作成し、ID を採番することをテストする。
+    """
+    user_id_bulk = 105
+    records_in = [
+        RecordCreate(exercise_date=datetime.date(2025, 9, 1), exercise=f'Bulk {i}', weight=50 + i, reps=5, set_reps=1)
+        for i in range(3)
+    ]
+
+    created_records = await record_service.create_records_bulk(
+        db=db_session, records_in=records_in, user_id=user_id_bulk
+    )
+
+    assert [r.exercise for r in created_records] == ['Bulk 0', 'Bulk 1', 'Bulk 2']
+    assert all(r.id is not None and r.user_id == user_id_bulk for r in created_records)
+    stored_records = await record_service.get_records(db=db_session, user_id=user_id_bulk)
+    assert [r.id for r in stored_records] == [r.id for r in created_records]
+
+    assert await record_service.create_records_bulk(db=db_session, records_in=[], user_id=user_id_bulk) == []
+
+
+async def test_create_records_bulk_api_partial_errors(test_client: AsyncClient, db_session: AsyncSession):
+    """
+    POST /api/v1/records/bulk は有効な要素だけを作成し、無効な要素はインデックス付きで errors に返す。
+    """
+    auth_headers = await get_auth_headers(test_client, db_session, 'bulk_user@example.com', 'password_bulk', 'bulkUser')
+
+    payload = [
+        {'exercise_date': '2025-09-10', 'exercise': 'Squat', 'weight': 100, 'reps': 5, 'set_reps': 1},
+        {'exercise_date': 'not-a-date', 'exercise': 'Squat', 'weight': 100, 'reps': 5, 'set_reps': 1},
+        {'exercise_date': '2025-09-10', 'exercise': 'Bench Press', 'weight': 80, 'reps': 5, 'set_reps': 1},
+        'not an object',
+    ]
+    response = await test_client.post('/api/v1/records/bulk', json=payload, headers=auth_headers)
+
+    assert response.status_code == 201
+    data = response.json()
+    assert [r['exercise'] for r in data['created']] == ['Squat', 'Bench Press']
+    assert [e['index'] for e in data['errors']] == [1, 3]
+    assert data['errors'][0]['errors'][0]['loc'] == ['exercise_date']
+
+    list_response = await test_client.get('/api/v1/records/', headers=auth_headers)
+    assert len(list_response.json()) == 2
+
+
+async def test_create_records_bulk_api_too_many(test_client: AsyncClient, db_session: AsyncSession):
+    """上限を超える件数を一括作成しようとすると 413 が返る"""
+    auth_headers = await get_auth_headers(test_client, db_session, 'bulk_max@example.com', 'password_bulk', 'bulkMax')
+
+    payload = [{'exercise_date': '2025-09-10', 'exercise': 'Squat', 'weight': 100, 'reps': 5, 'set_reps': 1}] * 1001
+    response = await test_client.post('/api/v1/records/bulk', json=payload, headers=auth_headers)
+
+    assert response.status_code == 413
+
+
+class _StatementRecorder:
+    """テスト中にエンジンで実行された SQL 文を記録する"""
+
+    def __init__(self, engine):
+        self.sync_engine = engine.sync_engine
+        self.statements: list[str] = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement.split()[0].upper())
+
+    def __enter__(self):
+        event.listen(self.sync_engine, 'before_cursor_execute', self._record)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.sync_engine, 'before_cursor_execute', self._record)
+
+
+async def test_update_record_service_single_statement(db_session: AsyncSession):
+    """
+    update_record が所有者の条件付きの UPDATE ... RETURNING 1 文で更新し、
+    他のユーザーの記録は更新しないことをテストする。
+    """
+    created = await record_service.create_record(
+        db=db_session,
+        record_in=RecordCreate(
+            exercise_date=datetime.date(2025, 6, 1), exercise='Squat', weight=100, reps=5, set_reps=3
+        ),
+        user_id=1,
+    )
+
+    with _StatementRecorder(db_session.bind) as recorder:
+        updated = await record_service.update_record(
+            db=db_session, record_id=created.id, record_update=RecordUpdate(notes='felt heavy'), user_id=1
+        )
+    assert updated is not None
+    assert updated.notes == 'felt heavy'
+    # notes だけの更新では集計行を再計算しない (変更カウンターの更新だけが先に加わる)。
+    # SQLite は変更カウンターの変更日時を別の UPDATE で書き込む
+    version_statements = ['INSERT', 'UPDATE'] if db_session.bind.dialect.name == 'sqlite' else ['INSERT']
+    assert recorder.statements == [*version_statements, 'UPDATE']
+
+    not_updated = await record_service.update_record(
+        db=db_session, record_id=created.id, record_update=RecordUpdate(notes='hijacked'), user_id=2
+    )
+    assert not_updated is None
+    assert (await record_service.get_record(db=db_session, record_id=created.id, user_id=1)).notes == 'felt heavy'
+
+
+async def test_update_and_delete_record_service_without_returning(db_session: AsyncSession, monkeypatch):
+    """
+    RETURNING に対応していないDBでも update_record / delete_record が動作することをテストする。
+    """
+    dialect = db_session.bind.dialect
+    monkeypatch.setattr(dialect, 'update_returning', False)
+    monkeypatch.setattr(dialect, 'delete_returning', False)
+    created = await record_service.create_record(
+        db=db_session,
+        record_in=RecordCreate(exercise_date=datetime.date(2025, 6, 1), exercise='Row', weight=60, reps=10, set_reps=3),
+        user_id=1,
+    )
+
+    updated = await record_service.update_record(
+        db=db_session, record_id=created.id, record_update=RecordUpdate(weight=65), user_id=1
+    )
+    assert updated is not None
+    assert updated.weight == 65
+    assert (
+        await record_service.update_record(
+            db=db_session, record_id=created.id, record_update=RecordUpdate(weight=70), user_id=2
+        )
+        is None
+    )
+
+    assert await record_service.delete_record(db=db_session, record_id=created.id, user_id=2) is None
+    deleted = await record_service.delete_record(db=db_session, record_id=created.id, user_id=1)
+    assert deleted is not None
+    assert deleted.weight == 65
+    assert await record_service.get_record(db=db_session, record_id=created.id, user_id=1) is None
+
+
+async def test_read_records_list_api_matches_record_read(test_client: AsyncClient, db_session: AsyncSession):
+    """
+    列の値から直接組み立てた一覧の JSON が、RecordRead で検証・変換した場合と同じになることをテストする。
+    """
+    auth_headers = await get_auth_headers(test_client, db_session, 'fast_list@example.com', 'password_fast', 'fast')
+    user_id = (await test_client.get('/api/v1/users/me', headers=auth_headers)).json()['id']
+    for i, notes in enumerate(['メモ', None, 'with "quotes"']):
+        await record_service.create_record(
+            db=db_session,
+            record_in=RecordCreate(
+                exercise_date=datetime.date(2025, 10, 3 - i),
+                exercise=f'Fast {i + 1}',
+                weight=60.5 + i,
+                reps=8,
+                set_reps=3,
+                notes=notes,
+            ),
+            user_id=user_id,
+        )
+
+    records = await record_service.get_records(db=db_session, user_id=user_id)
+    expected = TypeAdapter(list[RecordRead]).dump_json([RecordRead.model_validate(r) for r in records])
+
+    response = await test_client.get('/api/v1/records/', headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/json'
+    assert response.content == expected
+
+    rows, _ = await record_service.get_record_rows_by_cursor(db=db_session, user_id=user_id, limit=10)
+    assert [row['exercise'] for row in rows] == ['Fast 3', 'Fast 2', 'Fast 1']
+    assert list(rows[0]) == list(RecordRead.model_fields)
+
+
+async def test_create_records_bulk_openapi_schema(test_client: AsyncClient):
+    """一括作成のリクエストボディのスキーマが RecordCreate の配列として公開されることをテストする"""
+    response = await test_client.get('/openapi.json')
+    body = response.json()['paths']['/api/v1/records/bulk']['post']['requestBody']['content']['application/json']
+    assert body['schema']['type'] == 'array'
+    assert body['schema']['items'] == {'$ref': '#/components/schemas/RecordCreate'}
+
+
+async def test_read_records_list_openapi_schema(test_client: AsyncClient):
+    """一覧エンドポイントの OpenAPI スキーマが RecordRead の配列のままであることをテストする"""
+    response = await test_client.get('/openapi.json')
+    schema = response.json()['paths']['/api/v1/records/']['get']['responses']['200']['content']['application/json']
+    assert schema['schema'] == {
+        'type': 'array',
+        'items': {'$ref': '#/components/schemas/RecordRead'},
+        'title': 'Response Read Records Endpoint Api V1 Records  Get',
+    }
+    assert 'RecordReadRow' not in response.json()['components']['schemas']
+
+
+async def _create_filter_records(db_session: AsyncSession, user_id: int) -> list[int]:
+    # (種目, 日付) の組。ID の順序と日付の順序が一致しないように作成する
+    rows = [
+        ('Squat', datetime.date(2025, 11, 3)),
+        ('Bench Press', datetime.date(2025, 11, 1)),
+        ('Squat', datetime.date(2025, 11, 1)),
+        ('Squat', datetime.date(2025, 11, 5)),
+        ('Squat', datetime.date(2025, 11, 2)),
+    ]
+    ids = []
+    for exercise, exercise_date in rows:
+        record = await record_service.create_record(
+            db=db_session,
+            record_in=RecordCreate(exercise_date=exercise_date, exercise=exercise, weight=50, reps=5, set_reps=3),
+            user_id=user_id,
+        )
+        ids.append(record.id)
+    return ids
+
+
+async def test_get_records_service_filters_and_sort(db_session: AsyncSession):
+    """種目・日付範囲の絞り込みと並び順が SQL で適用されることをテストする"""
+    user_id = 105
+    ids = await _create_filter_records(db_session, user_id)
+    await _create_filter_records(db_session, user_id + 1)
+
+    filters = record_service.RecordFilters(
+        exercise='Squat', date_from=datetime.date(2025, 11, 2), date_to=datetime.date(2025, 11, 5)
+    )
+    records = await record_service.get_records(db=db_session, user_id=user_id, filters=filters)
+    assert [r.id for r in records] == [ids[0], ids[3], ids[4]]
+
+    records = await record_service.get_records(db=db_session, user_id=user_id, filters=filters, sort='-exercise_date')
+    assert [r.id for r in records] == [ids[3], ids[0], ids[4]]
+
+    records = await record_service.get_records(db=db_session, user_id=user_id, sort='exercise_date')
+    assert [r.id for r in records] == [ids[1], ids[2], ids[4], ids[0], ids[3]]
+
+    records = await record_service.get_records(db=db_session, user_id=user_id, sort='-id', skip=1, limit=2)
+    assert [r.id for r in records] == [ids[3], ids[2]]
+
+    unknown = record_service.RecordFilters(exercise='Unknown Exercise')
+    assert await record_service.get_records(db=db_session, user_id=user_id, filters=unknown) == []
+    assert await record_service.get_records_by_cursor(db=db_session, user_id=user_id, filters=unknown) == ([], None)
+
+
+async def test_get_records_by_cursor_service_filters_and_sort(db_session: AsyncSession):
+    """降順・ID 順でもカーソルで全件を重複なく辿れることをテストする"""
+    user_id = 107
+    ids = await _create_filter_records(db_session, user_id)
+    filters = record_service.RecordFilters(exercise='Squat')
+
+    for sort, expected in (
+        ('-exercise_date', [ids[3], ids[0], ids[4], ids[2]]),
+        ('id', [ids[0], ids[2], ids[3], ids[4]]),
+        ('-id', [ids[4], ids[3], ids[2], ids[0]]),
+    ):
+        seen: list[int] = []
+        cursor: Optional[str] = None
+        while True:
+            page, cursor = await record_service.get_records_by_cursor(
+                db=db_session, user_id=user_id, cursor=cursor, limit=3, filters=filters, sort=sort
+            )
+            seen.extend(r.id for r in page)
+            if cursor is None:
+                break
+        assert seen == expected, sort
+
+
+async def test_read_records_list_api_filters(test_client: AsyncClient, db_session: AsyncSession):
+    """一覧 API の exercise / date_from / date_to / sort パラメータをテストする"""
+    auth_headers = await get_auth_headers(test_client, db_session, 'filter@example.com', 'password_filter', 'filter')
+    user_id = (await test_client.get('/api/v1/users/me', headers=auth_headers)).json()['id']
+    ids = await _create_filter_records(db_session, user_id)
+
+    response = await test_client.get(
+        '/api/v1/records/?exercise=Squat&date_from=2025-11-02&sort=-exercise_date', headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert [r['id'] for r in response.json()] == [ids[3], ids[0], ids[4]]
+
+    response = await test_client.get(
+        '/api/v1/records/?pagination=cursor&date_to=2025-11-02&limit=2', headers=auth_headers
+    )
+    assert [r['id'] for r in response.json()] == [ids[1], ids[2]]
+    next_cursor = response.headers['X-Next-Cursor']
+    response = await test_client.get(
+        f'/api/v1/records/?cursor={next_cursor}&date_to=2025-11-02&limit=2', headers=auth_headers
+    )
+    assert [r['id'] for r in response.json()] == [ids[4]]
+
+    response = await test_client.get('/api/v1/records/?sort=weight', headers=auth_headers)
+    assert response.status_code == 422
+    response = await test_client.get('/api/v1/records/?date_from=2025-11-05&date_to=2025-11-01', headers=auth_headers)
+    assert response.status_code == 400
@@ -0,0 +1,143 @@
+import datetime
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import update
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.models.refresh_token import RefreshToken
+from src.schemas.user import UserCreate
+from src.services import token_service, user_service
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _login(test_client: AsyncClient, db_session: AsyncSession, email: str, password: str) -> dict:
+    await user_service.create_user(db=db_session, user_in=UserCreate(email=email, password=password))
+    response = await test_client.post('/api/v1/auth/token', data={'username': email, 'password': password})
+    assert response.status_code == 200
+    return response.json()
+
+
+async def test_refresh_rotates_token(test_client: AsyncClient, db_session: AsyncSession, monkeypatch):
+    """
+    POST /auth/refresh でパスワードを検証せずに新しいトークンが発行され、
+    リフレッシュトークンがローテーションされることをテストする。
+    """
+    tokens = await _login(test_client, db_session, 'refresh_user@example.com', 'password_refresh')
+    assert tokens['refresh_token']
+
+    async def fail_verify(*args, **kwargs):
+        raise AssertionError('refresh must not verify the password')
+
+    monkeypatch.setattr(user_service, 'verify_password_async', fail_verify)
+    response = await test_client.post('/api/v1/auth/refresh', json={'refresh_token': tokens['refresh_token']})
+    assert response.status_code == 200
+    refreshed = response.json()
+    assert refreshed['refresh_token'] != tokens['refresh_token']
+
+    me_response = await test_client.get(
+        '/api/v1/users/me', headers={'Authorization': f'Bearer {refreshed["access_token"]}'}
+    )
+    assert me_response.status_code == 200
+    assert me_response.json()['email'] == 'refresh_user@example.com'
+
+    # ダイジェストだけが保存され、トークン自体は保存されない
+    rows = (await db_session.exec(select(RefreshToken))).all()
+    assert len(rows) == 2
+    assert {row.token_hash for row in rows} == {
+        token_service.hash_refresh_token(tokens['refresh_token']),
+        token_service.hash_refresh_token(refreshed['refresh_token']),
+    }
+    assert len({row.family_id for row in rows}) == 1
+
+
+async def test_refresh_reuse_revokes_family(test_client: AsyncClient, db_session: AsyncSession):
+    """
+    使用済みのリフレッシュトークンが再び使われた場合、同じ family のトークンがすべて無効になることをテストする。
+    """
+    tokens = await _login(test_client, db_session, 'reuse_user@example.com', 'password_reuse')
+    first = await test_client.post('/api/v1/auth/refresh', json={'refresh_token': tokens['refresh_token']})
+    assert first.status_code == 200
+
+    # キャッシュを経由しない (プロセスの再起動後などの) 経路でも再利用を検出する
+    token_service.refresh_token_cache.clear()
+    reused = await test_client.post('/api/v1/auth/refresh', json={'refresh_token': tokens['refresh_token']})
+    assert reused.status_code == 401
+
+    latest = await test_client.post('/api/v1/auth/refresh', json={'refresh_token': first.json()['refresh_token']})
+    assert latest.status_code == 401
+
+    unknown = await test_client.post('/api/v1/auth/refresh', json={'refresh_token': 'not-a-token'})
+    assert unknown.status_code == 401
+
+
+async def test_rotate_refresh_token_expired_and_inactive(db_session: AsyncSession, monkeypatch):
+    """
+    期限切れのトークンや無効化されたユーザーのトークンではアクセストークンを再発行しないことをテストする。
+    """
+    user = await user_service.create_user(
+        db=db_session, user_in=UserCreate(email='expired_refresh@example.com', password='password_exp')
+    )
+    token = await token_service.issue_refresh_token(db_session, user_id=user.id)
+    rotated_user, new_token = await token_service.rotate_refresh_token(db_session, token)
+    assert rotated_user.id == user.id
+
+    future = token_service._utcnow() + datetime.timedelta(days=365)
+    monkeypatch.setattr(token_service, '_utcnow', lambda: future)
+    with pytest.raises(token_service.RefreshTokenError, match='expired'):
+        await token_service.rotate_refresh_token(db_session, new_token)
+
+    monkeypatch.undo()
+    token = await token_service.issue_refresh_token(db_session, user_id=user.id)
+    user.is_active = False
+    db_session.add(user)
+    await db_session.commit()
+    with pytest.raises(token_service.RefreshTokenError, match='Inactive'):
+        await token_service.rotate_refresh_token(db_session, token)
+
+
+async def test_refresh_token_is_cached_only_after_commit(db_session: AsyncSession):
+    """発行したトークンはコミットされてからキャッシュに入り、ロールバックされた場合は入らない"""
+    user = await user_service.create_user(
+        db=db_session, user_in=UserCreate(email='cache_after_commit@example.com', password='password_cache')
+    )
+    user_id = user.id
+    token = await token_service._add_refresh_token(db_session, user_id=user_id, family_id='rolled-back')
+    assert await token_service.refresh_token_cache.get(token_service.hash_refresh_token(token)) is None
+    await db_session.rollback()
+    assert await token_service.refresh_token_cache.get(token_service.hash_refresh_token(token)) is None
+
+    token = await token_service.issue_refresh_token(db_session, user_id=user_id)
+    cached = await token_service.refresh_token_cache.get(token_service.hash_refresh_token(token))
+    assert cached is not None
+    assert cached.user_id == user_id
+
+
+async def test_expired_refresh_tokens_are_purged(db_session: AsyncSession):
+    """ローテーションでは同じ family の期限切れのトークンを、purge_expired_refresh_tokens ではすべてを削除する"""
+    user = await user_service.create_user(
+        db=db_session, user_in=UserCreate(email='purge_refresh@example.com', password='password_purge')
+    )
+    first = await token_service.issue_refresh_token(db_session, user_id=user.id)
+    other_family = await token_service.issue_refresh_token(db_session, user_id=user.id)
+    _, second = await token_service.rotate_refresh_token(db_session, first)
+
+    expired_hashes = [token_service.hash_refresh_token(token) for token in (first, other_family)]
+    await db_session.exec(
+        update(RefreshToken)
+        .where(col(RefreshToken.token_hash).in_(expired_hashes))
+        .values(expires_at=datetime.datetime(2000, 1, 1))
+    )
+    await db_session.commit()
+
+    _, third = await token_service.rotate_refresh_token(db_session, second)
+    hashes = set((await db_session.exec(select(RefreshToken.token_hash))).all())
+    # 同じ family の期限切れのトークンだけが削除され、使用済みでも期限内のトークンは再利用の検出のために残る
+    assert hashes == {token_service.hash_refresh_token(token) for token in (other_family, second, third)}
+
+    far_future = token_service._utcnow() + datetime.timedelta(days=365)
+    assert await token_service.purge_expired_refresh_tokens(db_session, now=far_future) == 3
+    await db_session.commit()
+    assert (await db_session.exec(select(RefreshToken))).all() == []
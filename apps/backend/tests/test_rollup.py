@@ -0,0 +1,119 @@
+import datetime
+
+import pytest
+from sqlalchemy import Row, delete
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.models.exercise import Exercise
+from src.models.rollup import WorkoutDailyRollup
+from src.schemas.record import RecordCreate, RecordUpdate
+from src.services import record_service, rollup_service
+
+pytestmark = pytest.mark.asyncio
+
+
+async def get_rollup_rows(db_session: AsyncSession, user_id: int) -> list[Row]:
+    """集計行を種目名付きで取得する (r.exercise で種目名を参照できる)"""
+    statement = (
+        select(
+            Exercise.name.label('exercise'),  # type: ignore[attr-defined]
+            WorkoutDailyRollup.date,
+            WorkoutDailyRollup.volume,
+            WorkoutDailyRollup.max_weight,
+            WorkoutDailyRollup.est_1rm,
+            WorkoutDailyRollup.sets,
+        )
+        .join(Exercise, Exercise.id == WorkoutDailyRollup.exercise_id)
+        .where(WorkoutDailyRollup.user_id == user_id)
+        .order_by(Exercise.name, WorkoutDailyRollup.date)
+    )
+    result = await db_session.exec(statement)
+    return list(result.all())
+
+
+async def test_rollup_is_updated_on_create(db_session: AsyncSession):
+    """
+    create_record / create_records_bulk で日ごとの集計行が差分更新されることをテストする。
+    """
+    user_id = 301
+    day = datetime.date(2025, 6, 2)
+    await record_service.create_record(
+        db=db_session,
+        record_in=RecordCreate(exercise_date=day, exercise='Squat', weight=100, reps=5, set_reps=3),
+        user_id=user_id,
+    )
+    await record_service.create_records_bulk(
+        db=db_session,
+        records_in=[
+            RecordCreate(exercise_date=day, exercise='Squat', weight=120, reps=1, set_reps=1),
+            RecordCreate(exercise_date=day, exercise='Squat', weight=90, reps=8, set_reps=2),
+            RecordCreate(exercise_date=day, exercise='Bench Press', weight=80, reps=5, set_reps=3),
+        ],
+        user_id=user_id,
+    )
+
+    rows = await get_rollup_rows(db_session, user_id)
+    assert [(r.exercise, r.date) for r in rows] == [('Bench Press', day), ('Squat', day)]
+    squat = rows[1]
+    assert squat.volume == pytest.approx(100 * 5 * 3 + 120 + 90 * 8 * 2)
+    assert squat.max_weight == 120
+    assert squat.est_1rm == 120  # 1 レップの記録は重量がそのまま推定 1RM になる
+    assert squat.sets == 6
+
+
+async def test_rollup_is_recomputed_on_update_and_delete(db_session: AsyncSession):
+    """
+    update_record / delete_record で影響する集計行が再計算されることをテストする。
+    """
+    user_id = 302
+    day1 = datetime.date(2025, 6, 2)
+    day2 = datetime.date(2025, 6, 3)
+    heavy = await record_service.create_record(
+        db=db_session,
+        record_in=RecordCreate(exercise_date=day1, exercise='Deadlift', weight=200, reps=1, set_reps=1),
+        user_id=user_id,
+    )
+    light = await record_service.create_record(
+        db=db_session,
+        record_in=RecordCreate(exercise_date=day1, exercise='Deadlift', weight=150, reps=5, set_reps=1),
+        user_id=user_id,
+    )
+
+    # 最大重量の記録を別の日に移すと、元の日の最大重量が下がる
+    await record_service.update_record(
+        db=db_session, record_id=heavy.id, record_update=RecordUpdate(exercise_date=day2), user_id=user_id
+    )
+    rows = await get_rollup_rows(db_session, user_id)
+    assert [(r.date, r.max_weight, r.sets) for r in rows] == [(day1, 150, 1), (day2, 200, 1)]
+
+    # 記録を削除すると、その日の集計行もなくなる
+    await record_service.delete_record(db=db_session, record_id=light.id, user_id=user_id)
+    rows = await get_rollup_rows(db_session, user_id)
+    assert [(r.date, r.max_weight) for r in rows] == [(day2, 200)]
+
+
+async def test_rollup_rebuild(db_session: AsyncSession):
+    """
+    rollup_service.rebuild が集計テーブルを記録から作り直すことをテストする。
+    """
+    user_id = 303
+    day = datetime.date(2025, 6, 4)
+    for weight in (60, 70):
+        await record_service.create_record(
+            db=db_session,
+            record_in=RecordCreate(exercise_date=day, exercise='Row', weight=weight, reps=10, set_reps=2),
+            user_id=user_id,
+        )
+    expected = [
+        (r.exercise, r.date, r.volume, r.max_weight, r.sets) for r in await get_rollup_rows(db_session, user_id)
+    ]
+
+    # 集計テーブルを壊してから作り直す
+    await db_session.exec(delete(WorkoutDailyRollup).where(WorkoutDailyRollup.user_id == user_id))
+    await db_session.commit()
+    assert await get_rollup_rows(db_session, user_id) == []
+
+    assert await rollup_service.rebuild(db_session, user_id=user_id) == 1
+    rebuilt = [(r.exercise, r.date, r.volume, r.max_weight, r.sets) for r in await get_rollup_rows(db_session, user_id)]
+    assert rebuilt == expected == [('Row', day, 2600.0, 70.0, 4)]
@@ -0,0 +1,100 @@
+import datetime
+
+import pytest
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.schemas.record import RecordCreate, RecordUpdate
+from src.services import record_service, search_service
+from tests.test_records import get_auth_headers
+
+
+async def create_search_records(db_session: AsyncSession, user_id: int) -> list[int]:
+    """検索テスト用の記録を作成し、ID のリストを返す"""
+    samples = [
+        ('Bench Press', 'paused reps'),
+        ('Incline Bench Press', None),
+        ('Squat', 'left shoulder felt tight'),
+        ('Deadlift', None),
+    ]
+    ids = []
+    for i, (exercise, notes) in enumerate(samples):
+        record = await record_service.create_record(
+            db=db_session,
+            record_in=RecordCreate(
+                exercise_date=datetime.date(2025, 7, 1 + i),
+                exercise=exercise,
+                weight=50,
+                reps=5,
+                set_reps=3,
+                notes=notes,
+            ),
+            user_id=user_id,
+        )
+        ids.append(record.id)
+    return ids
+
+
+def test_search_terms():
+    """検索文字列から記号を除いた小文字の単語を取り出す"""
+    assert search_service.search_terms('Bench "press"*') == ['bench', 'press']
+    assert search_service.search_terms('  -- ') == []
+
+
+@pytest.mark.asyncio
+async def test_search_records_service(db_session: AsyncSession):
+    """
+    search_service.search_records が種目名とメモを前方一致で検索し、他のユーザーの記録を含めないことをテストする。
+    """
+    user_id = 301
+    bench, incline, squat, _ = await create_search_records(db_session, user_id)
+    await create_search_records(db_session, user_id + 1)
+
+    rows = await search_service.search_records(db=db_session, user_id=user_id, query='bench')
+    assert sorted(row['id'] for row in rows) == [bench, incline]
+    assert all(row['user_id'] == user_id for row in rows)
+
+    rows = await search_service.search_records(db=db_session, user_id=user_id, query='ben pre')
+    assert sorted(row['id'] for row in rows) == [bench, incline]
+
+    rows = await search_service.search_records(db=db_session, user_id=user_id, query='shoulder')
+    assert [row['id'] for row in rows] == [squat]
+
+    assert await search_service.search_records(db=db_session, user_id=user_id, query='"*') == []
+
+
+@pytest.mark.asyncio
+async def test_search_records_follows_updates_and_deletes(db_session: AsyncSession):
+    """記録の更新・削除が検索用の索引に反映されることをテストする"""
+    user_id = 302
+    bench, _, squat, _ = await create_search_records(db_session, user_id)
+
+    await record_service.update_record(
+        db=db_session, record_id=squat, record_update=RecordUpdate(notes='paused at the bottom'), user_id=user_id
+    )
+    await record_service.delete_record(db=db_session, record_id=bench, user_id=user_id)
+
+    rows = await search_service.search_records(db=db_session, user_id=user_id, query='paused')
+    assert [row['id'] for row in rows] == [squat]
+    assert await search_service.search_records(db=db_session, user_id=user_id, query='shoulder') == []
+
+
+@pytest.mark.asyncio
+async def test_search_records_api(test_client: AsyncClient, db_session: AsyncSession):
+    """GET /api/v1/records/search が一致した記録を返すことをテストする"""
+    auth_headers = await get_auth_headers(test_client, db_session, 'search@example.com', 'password_search', 'search')
+    user_id = (await test_client.get('/api/v1/users/me', headers=auth_headers)).json()['id']
+    await create_search_records(db_session, user_id)
+
+    response = await test_client.get('/api/v1/records/search', params={'q': 'dead'}, headers=auth_headers)
+    assert response.status_code == 200
+    assert [record['exercise'] for record in response.json()] == ['Deadlift']
+
+    response = await test_client.get('/api/v1/records/search', params={'q': 'bench', 'limit': 1}, headers=auth_headers)
+    assert len(response.json()) == 1
+
+    response = await test_client.get('/api/v1/records/search', params={'q': ''}, headers=auth_headers)
+    assert response.status_code == 422
+
+    response = await test_client.get('/api/v1/records/search', params={'q': 'bench'})
+    assert response.status_code == 401
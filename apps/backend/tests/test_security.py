@@ -0,0 +1,100 @@
+import time
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core import security
+from src.core.config import settings
+from src.schemas.user import UserCreate
+from src.services import user_service
+
+
+def test_decode_access_token_uses_cache(monkeypatch):
+    """
+    2 回目以降の検証では jwt.decode を呼ばずにキャッシュのクレームを返すことをテストする。
+    """
+    token = security.create_access_token({'sub': 'cached@example.com'}, expires_delta=timedelta(minutes=5))
+    calls = []
+    original_decode = security.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(1)
+        return original_decode(*args, **kwargs)
+
+    monkeypatch.setattr(security.jwt, 'decode', counting_decode)
+
+    assert security.decode_access_token(token) == 'cached@example.com'
+    assert security.decode_access_token(token) == 'cached@example.com'
+    assert len(calls) == 1
+
+    # 不正なトークンはキャッシュされない
+    with pytest.raises(HTTPException):
+        security.decode_access_token(token + 'x')
+    with pytest.raises(HTTPException):
+        security.decode_access_token(token + 'x')
+    assert len(calls) == 3
+
+
+def test_decode_access_token_cache_honors_exp(monkeypatch):
+    """
+    キャッシュから返す場合もトークンの exp を過ぎていれば期限切れとして扱うことをテストする。
+    """
+    token = security.create_access_token({'sub': 'expiring@example.com'}, expires_delta=timedelta(seconds=30))
+    claims = security.decode_access_token_claims(token)
+    assert claims.exp is not None
+
+    monkeypatch.setattr(security.time, 'time', lambda: claims.exp + 0.001)
+    # TTLCache 側の有効期限より前でも、exp を過ぎたら拒否する
+    monkeypatch.setattr(security.token_cache, '_timer', lambda: 0.0)
+    with pytest.raises(HTTPException) as exc_info:
+        security.decode_access_token(token)
+    assert exc_info.value is security.EXPIRED_TOKEN_EXCEPTION
+    assert len(security.token_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_readonly_endpoint_uses_embedded_claims(test_client: AsyncClient, db_session: AsyncSession, monkeypatch):
+    """
+    TOKEN_EMBED_USER_CLAIMS が有効な場合、読み取り専用のエンドポイントは
+    ユーザーキャッシュもDBも参照せずにトークンのクレームからユーザーを特定することをテストする。
+    """
+    monkeypatch.setattr(settings, 'TOKEN_EMBED_USER_CLAIMS', True)
+    email, password = 'claims_user@example.com', 'password_claims'
+    user = await user_service.create_user(
+        db=db_session, user_in=UserCreate(email=email, password=password, username='claims')
+    )
+    login_response = await test_client.post('/api/v1/auth/token', data={'username': email, 'password': password})
+    token = login_response.json()['access_token']
+    claims = security.decode_access_token_claims(token)
+    assert (claims.uid, claims.username, claims.active, claims.su) == (user.id, 'claims', True, False)
+
+    user_service.user_cache.clear()
+    misses_before = user_service.user_cache.misses
+    response = await test_client.get('/api/v1/records/', headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == 200
+    assert user_service.user_cache.misses == misses_before
+
+    # 書き込みを行うエンドポイントは従来どおりユーザーキャッシュ (DB) を参照する
+    response = await test_client.post(
+        '/api/v1/records/',
+        json={'exercise_date': '2025-06-01', 'exercise': 'Squat', 'weight': 100, 'reps': 5, 'set_reps': 3},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+    assert response.status_code == 201
+    assert user_service.user_cache.misses == misses_before + 1
+
+
+def test_token_cache_ttl_follows_exp():
+    """
+    キャッシュのエントリがトークンの残り有効期間で期限切れになることをテストする。
+    """
+    token = security.create_access_token({'sub': 'ttl@example.com'}, expires_delta=timedelta(seconds=2))
+    security.decode_access_token(token)
+    digest = security._token_digest(token)
+    expires_at, _ = security.token_cache._data[digest]
+    assert expires_at - security.token_cache._timer() <= 2.0 + 0.01
+    assert expires_at - security.token_cache._timer() > 0.5
+    assert time.time() < security.token_cache.get(digest).exp
@@ -0,0 +1,117 @@
+import datetime
+
+import pytest
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.schemas.record import RecordCreate
+from src.services import record_service, stats_service
+from tests.test_records import get_auth_headers
+
+
+async def create_sample_records(db_session: AsyncSession, user_id: int) -> None:
+    """集計テスト用の記録を作成する (2025-06-02 は月曜日)"""
+    samples = [
+        (datetime.date(2025, 6, 2), 'Squat', 100.0, 5, 3),
+        (datetime.date(2025, 6, 4), 'Squat', 110.0, 3, 2),
+        (datetime.date(2025, 6, 9), 'Squat', 120.0, 1, 1),
+        (datetime.date(2025, 6, 4), 'Bench Press', 80.0, 8, 3),
+    ]
+    for exercise_date, exercise, weight, reps, set_reps in samples:
+        await record_service.create_record(
+            db=db_session,
+            record_in=RecordCreate(
+                exercise_date=exercise_date, exercise=exercise, weight=weight, reps=reps, set_reps=set_reps
+            ),
+            user_id=user_id,
+        )
+
+
+def test_estimate_1rm():
+    """推定 1RM の計算式をテストする"""
+    assert stats_service.estimate_1rm(100, 1) == 100
+    assert stats_service.estimate_1rm(100, 5) == pytest.approx(100 * (1 + 5 / 30))
+    assert stats_service.estimate_1rm(100, 5, 'brzycki') == pytest.approx(100 * 36 / 32)
+    assert stats_service.estimate_1rm(100, 40, 'brzycki') is None
+    assert stats_service.estimate_1rm(100, 0) is None
+
+
+@pytest.mark.asyncio
+async def test_get_record_stats_weekly(db_session: AsyncSession):
+    """
+    stats_service.get_record_stats が種目・週ごとに集計できることをテストする。
+    """
+    user_id = 201
+    await create_sample_records(db_session, user_id)
+    await create_sample_records(db_session, user_id + 1)  # 他ユーザーの記録は集計されない
+
+    buckets = await stats_service.get_record_stats(db=db_session, user_id=user_id, period='week')
+
+    assert [(b.exercise, b.period_start) for b in buckets] == [
+        ('Bench Press', datetime.date(2025, 6, 2)),
+        ('Squat', datetime.date(2025, 6, 2)),
+        ('Squat', datetime.date(2025, 6, 9)),
+    ]
+    squat_week1 = buckets[1]
+    assert squat_week1.total_volume == pytest.approx(100 * 5 * 3 + 110 * 3 * 2)
+    assert squat_week1.top_set_weight == 110.0
+    assert squat_week1.estimated_1rm == pytest.approx(110 * (1 + 3 / 30))
+    assert squat_week1.set_count == 5
+    assert buckets[2].estimated_1rm == 120.0
+
+
+@pytest.mark.asyncio
+async def test_get_record_stats_monthly_with_filters(db_session: AsyncSession):
+    """
+    月単位の集計と、exercise / date_from / date_to / formula の指定をテストする。
+    """
+    user_id = 203
+    await create_sample_records(db_session, user_id)
+
+    monthly = await stats_service.get_record_stats(db=db_session, user_id=user_id, period='month', exercise='Squat')
+    assert len(monthly) == 1
+    assert monthly[0].period_start == datetime.date(2025, 6, 1)
+    assert monthly[0].set_count == 6
+
+    daily = await stats_service.get_record_stats(
+        db=db_session,
+        user_id=user_id,
+        period='day',
+        date_from=datetime.date(2025, 6, 3),
+        date_to=datetime.date(2025, 6, 8),
+        formula='brzycki',
+    )
+    assert [(b.exercise, b.period_start) for b in daily] == [
+        ('Bench Press', datetime.date(2025, 6, 4)),
+        ('Squat', datetime.date(2025, 6, 4)),
+    ]
+    assert daily[0].estimated_1rm == pytest.approx(80 * 36 / 29)
+
+
+@pytest.mark.asyncio
+async def test_read_record_stats_api(test_client: AsyncClient, db_session: AsyncSession):
+    """
+    GET /api/v1/records/stats が認証ユーザーの集計を返すことをテストする。
+    """
+    response = await test_client.get('/api/v1/records/stats')
+    assert response.status_code == 401
+
+    auth_headers = await get_auth_headers(test_client, db_session, 'stats_user@example.com', 'password_stats', 'stats')
+    me_response = await test_client.get('/api/v1/users/me', headers=auth_headers)
+    await create_sample_records(db_session, me_response.json()['id'])
+
+    response = await test_client.get('/api/v1/records/stats?period=month&exercise=Bench%20Press', headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json() == [
+        {
+            'exercise': 'Bench Press',
+            'period_start': '2025-06-01',
+            'total_volume': 1920.0,
+            'top_set_weight': 80.0,
+            'estimated_1rm': pytest.approx(80 * (1 + 8 / 30)),
+            'set_count': 3,
+        }
+    ]
+
+    response = await test_client.get('/api/v1/records/stats?period=year', headers=auth_headers)
+    assert response.status_code == 422
@@ -0,0 +1,140 @@
+import datetime
+from typing import Optional
+
+import pytest
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.models.record import WorkoutRecord
+from src.schemas.record import RecordCreate, RecordUpdate
+from src.services import record_service, rollup_service, search_service, stats_service, sync_service
+from tests.test_records import get_auth_headers
+
+pytestmark = pytest.mark.asyncio
+
+
+def _record_in(exercise: str, day: int, weight: float = 60) -> RecordCreate:
+    return RecordCreate(
+        exercise_date=datetime.date(2025, 5, day), exercise=exercise, weight=weight, reps=5, set_reps=3, notes='sync'
+    )
+
+
+async def test_delete_record_is_soft_delete(db_session: AsyncSession):
+    """
+    削除した記録は行として残り (deleted_at が設定される)、一覧・検索・集計・自己ベストからは除外されることをテストする。
+    """
+    user_id = 501
+    kept = await record_service.create_record(db=db_session, record_in=_record_in('Squat', 1), user_id=user_id)
+    deleted = await record_service.create_record(
+        db=db_session, record_in=_record_in('Squat', 1, weight=100), user_id=user_id
+    )
+
+    result = await record_service.delete_record(db=db_session, record_id=deleted.id, user_id=user_id)
+    assert result is not None
+    assert result.deleted_at is not None
+    assert result.updated_at == result.deleted_at
+
+    row = await db_session.get(WorkoutRecord, deleted.id)
+    assert row is not None and row.deleted_at is not None
+
+    assert await record_service.get_record(db=db_session, record_id=deleted.id, user_id=user_id) is None
+    assert [r.id for r in await record_service.get_records(db=db_session, user_id=user_id)] == [kept.id]
+    rows = await search_service.search_records(db=db_session, user_id=user_id, query='squat')
+    assert [r['id'] for r in rows] == [kept.id]
+    for formula in ('epley', 'brzycki'):
+        stats = await stats_service.get_record_stats(db=db_session, user_id=user_id, period='day', formula=formula)
+        assert [bucket.top_set_weight for bucket in stats] == [60]
+    # 集計テーブルを作り直しても削除済みの記録は含まれない
+    await rollup_service.rebuild(db_session, user_id=user_id)
+    stats = await stats_service.get_record_stats(db=db_session, user_id=user_id, period='day')
+    assert [bucket.set_count for bucket in stats] == [3]
+
+    # 削除済みの記録は更新・再削除できない
+    assert (
+        await record_service.update_record(
+            db=db_session, record_id=deleted.id, record_update=RecordUpdate(weight=10), user_id=user_id
+        )
+        is None
+    )
+    assert await record_service.delete_record(db=db_session, record_id=deleted.id, user_id=user_id) is None
+
+
+async def test_get_changes_service(db_session: AsyncSession):
+    """同期トークン以降の作成・更新・削除だけが (updated_at, id) 順に返ることをテストする"""
+    user_id = 502
+    first = await record_service.create_record(db=db_session, record_in=_record_in('Squat', 1), user_id=user_id)
+    second = await record_service.create_record(db=db_session, record_in=_record_in('Bench', 2), user_id=user_id)
+    await record_service.delete_record(db=db_session, record_id=second.id, user_id=user_id)
+    await record_service.create_record(db=db_session, record_in=_record_in('Squat', 3), user_id=user_id + 1)
+
+    # 最初の同期では削除済みの記録は返さない
+    initial = await sync_service.get_changes(db=db_session, user_id=user_id)
+    assert [r.id for r in initial.records] == [first.id]
+    assert initial.deleted == []
+    assert initial.has_more is False
+    assert initial.next_since is not None
+
+    # 変更がなければトークンはそのまま
+    unchanged = await sync_service.get_changes(db=db_session, user_id=user_id, since=initial.next_since)
+    assert (unchanged.records, unchanged.deleted, unchanged.next_since) == ([], [], initial.next_since)
+
+    third = await record_service.create_record(db=db_session, record_in=_record_in('Deadlift', 4), user_id=user_id)
+    await record_service.update_record(
+        db=db_session, record_id=first.id, record_update=RecordUpdate(notes='updated'), user_id=user_id
+    )
+    await record_service.delete_record(db=db_session, record_id=third.id, user_id=user_id)
+
+    changes = await sync_service.get_changes(db=db_session, user_id=user_id, since=initial.next_since)
+    assert [(r.id, r.notes) for r in changes.records] == [(first.id, 'updated')]
+    assert [t.id for t in changes.deleted] == [third.id]
+
+
+async def test_get_changes_service_paging(db_session: AsyncSession):
+    """limit を超える変更は has_more と next_since で重複なく辿れることをテストする"""
+    user_id = 503
+    created = await record_service.create_records_bulk(
+        db=db_session, records_in=[_record_in('Squat', day) for day in range(1, 6)], user_id=user_id
+    )
+
+    seen: list[int] = []
+    since: Optional[str] = None
+    while True:
+        changes = await sync_service.get_changes(db=db_session, user_id=user_id, since=since, limit=2)
+        seen.extend(r.id for r in changes.records)
+        since = changes.next_since
+        if not changes.has_more:
+            break
+    # 一括作成した記録は同じ updated_at を持つため、id 順に並ぶ
+    assert seen == [r.id for r in created]
+
+    with pytest.raises(ValueError):
+        await sync_service.get_changes(db=db_session, user_id=user_id, since='not-a-token')
+
+
+async def test_read_record_changes_api(test_client: AsyncClient, db_session: AsyncSession):
+    """GET /records/changes で前回の同期以降の変更を取得できることをテストする"""
+    auth_headers = await get_auth_headers(test_client, db_session, 'sync@example.com', 'password_sync', 'sync')
+
+    response = await test_client.post(
+        '/api/v1/records/', json=_record_in('Squat', 1).model_dump(mode='json'), headers=auth_headers
+    )
+    assert response.status_code == 201
+    record_id = response.json()['id']
+    assert response.json()['updated_at']
+
+    response = await test_client.get('/api/v1/records/changes', headers=auth_headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert [r['id'] for r in body['records']] == [record_id]
+    since = body['next_since']
+
+    response = await test_client.delete(f'/api/v1/records/{record_id}', headers=auth_headers)
+    assert response.status_code == 200
+    response = await test_client.get('/api/v1/records/changes', params={'since': since}, headers=auth_headers)
+    body = response.json()
+    assert body['records'] == []
+    assert [t['id'] for t in body['deleted']] == [record_id]
+    assert body['has_more'] is False
+
+    response = await test_client.get('/api/v1/records/changes?since=%%%', headers=auth_headers)
+    assert response.status_code == 400
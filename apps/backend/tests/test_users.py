@@ -4,7 +4,9 @@ from jose import jwt
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from src.core import security
 from src.core.config import settings
+from src.core.hash_pool import BoundedThreadPool
 from src.core.security import hash_password, verify_password
 from src.models.user import User
 from src.schemas.user import UserCreate
@@ -283,3 +285,108 @@ async def test_read_current_user_invalid_token(test_client: AsyncClient):
     response = await test_client.get('/api/v1/users/me', headers=headers)
 
     assert response.status_code == 401
+
+
+async def test_get_current_user_snapshot_uses_cache(db_session: AsyncSession):
+    """
+    user_service.get_current_user_snapshot が2回目以降はキャッシュから
+    スナップショットを返すことをテストする。
+    """
+    email = 'cached_user@example.com'
+    created_user = await user_service.create_user(
+        db=db_session, user_in=UserCreate(email=email, username='cached_user', password='password123')
+    )
+    assert created_user is not None
+    stats_before = user_service.user_cache.stats()
+
+    first = await user_service.get_current_user_snapshot(db=db_session, email=email)
+    second = await user_service.get_current_user_snapshot(db=db_session, email=email)
+
+    assert first is not None
+    assert first.id == created_user.id
+    assert second is first
+    stats_after = user_service.user_cache.stats()
+    assert stats_after['misses'] == stats_before['misses'] + 1
+    assert stats_after['hits'] == stats_before['hits'] + 1
+
+    # 存在しないユーザーは None (キャッシュされない)
+    assert await user_service.get_current_user_snapshot(db=db_session, email='nobody@example.com') is None
+    assert await user_service.user_cache.get('nobody@example.com') is None
+
+
+async def test_read_current_user_deactivated_user_invalidates_cache(test_client: AsyncClient, db_session: AsyncSession):
+    """
+    キャッシュ済みのユーザーが無効化されると、次のリクエストで 400 Inactive user が返ることをテストする。
+    """
+    email = 'deactivated_user@example.com'
+    password = 'password_deactivate'
+    created_user = await user_service.create_user(
+        db=db_session, user_in=UserCreate(email=email, username='deactivated_user', password=password)
+    )
+    assert created_user is not None
+
+    login_response = await test_client.post('/api/v1/auth/token', data={'username': email, 'password': password})
+    headers = {'Authorization': f'Bearer {login_response.json()["access_token"]}'}
+
+    # 1回目のアクセスでキャッシュされる
+    response = await test_client.get('/api/v1/users/me', headers=headers)
+    assert response.status_code == 200
+    assert await user_service.user_cache.get(email) is not None
+
+    # ユーザーを無効化するとキャッシュが破棄される
+    created_user.is_active = False
+    db_session.add(created_user)
+    await db_session.commit()
+    assert await user_service.user_cache.get(email) is None
+
+    response = await test_client.get('/api/v1/users/me', headers=headers)
+    assert response.status_code == 400
+    assert response.json()['detail'] == 'Inactive user'
+
+
+async def test_login_for_access_token_pool_saturated(
+    test_client: AsyncClient, db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+):
+    """
+    パスワード検証のワーカープールが混雑していると、ログインが 503 と Retry-After を返すことをテストする。
+    """
+    email = 'busy_login@example.com'
+    password = 'busy_password'
+    await user_service.create_user(
+        db=db_session, user_in=UserCreate(email=email, username='busy_login', password=password)
+    )
+
+    saturated_pool = BoundedThreadPool(max_workers=1, max_queue=0, name='test-saturated')
+    saturated_pool._pending = 1  # 実行中の処理で埋まっている状態にする
+    monkeypatch.setattr(security, 'password_hash_pool', saturated_pool)
+    try:
+        response = await test_client.post('/api/v1/auth/token', data={'username': email, 'password': password})
+    finally:
+        saturated_pool.shutdown()
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)
+
+
+async def test_cached_user_is_invalidated_only_after_commit(db_session: AsyncSession):
+    """ユーザーの変更はコミットされた時点でキャッシュから削除され、ロールバックされた変更では削除されない"""
+    email = 'invalidate_after_commit@example.com'
+    created_user = await user_service.create_user(
+        db=db_session, user_in=UserCreate(email=email, username='invalidate_after_commit', password='password123')
+    )
+    assert created_user is not None
+    await user_service.get_current_user_snapshot(db=db_session, email=email)
+
+    created_user.is_superuser = True
+    db_session.add(created_user)
+    await db_session.flush()
+    assert await user_service.user_cache.get(email) is not None
+    await db_session.rollback()
+    assert await user_service.user_cache.get(email) is not None
+
+    created_user.is_active = False
+    db_session.add(created_user)
+    await db_session.flush()
+    assert await user_service.user_cache.get(email) is not None
+    await db_session.commit()
+    assert await user_service.user_cache.get(email) is None